@@ -0,0 +1,80 @@
+"""
+scripts/bench_decode.py — Single-core decode throughput: json + parse() vs typed fast path.
+
+Encodes synthetic producer events exactly as they arrive off Kafka (UTF-8 JSON
+bytes), then times consumer.decode_messages() on poll-sized chunks with each
+decoder and checks both produce identical rows.
+
+Usage:
+  python scripts/bench_decode.py --messages 200000 --poll 500
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from streaming import decode
+from streaming.consumer import decode_messages
+from streaming.producer import make_txn_event, make_log_event, make_user_event
+
+
+def make_messages(n: int) -> list:
+    values = []
+    for _ in range(n):
+        roll = random.random()
+        if roll < 0.70:
+            event = make_txn_event()
+        elif roll < 0.95:
+            event = make_log_event()
+        else:
+            event = make_user_event()
+        values.append(json.dumps(event).encode("utf-8"))
+    return values
+
+
+def run(values: list, poll: int, decoder: str, repeat: int):
+    best, rows = float("inf"), None
+    for _ in range(repeat):
+        txn, log, user = [], [], []
+        start = time.perf_counter()
+        for i in range(0, len(values), poll):
+            decode_messages(values[i:i + poll], txn, log, user, decoder=decoder)
+        best = min(best, time.perf_counter() - start)
+        rows = (txn, log, user)
+    return best, rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--poll",     type=int, default=500, help="Messages per poll() batch")
+    parser.add_argument("--repeat",   type=int, default=3,   help="Best-of-N timing")
+    args = parser.parse_args()
+
+    print(f"[bench] Generating {args.messages:,} messages...")
+    values = make_messages(args.messages)
+    avg_bytes = sum(map(len, values)) / len(values)
+
+    decoders = ["json"] + (["fast"] if decode.AVAILABLE else [])
+    if not decode.AVAILABLE:
+        print("[bench] ⚠️  msgspec not installed — fast path skipped")
+
+    results = {}
+    for decoder in decoders:
+        secs, rows = run(values, args.poll, decoder, args.repeat)
+        results[decoder] = (secs, rows)
+        print(f"[bench] {decoder:<5} {secs:6.2f}s  {args.messages / secs:>12,.0f} msgs/s/core  "
+              f"({args.messages * avg_bytes / secs / 1e6:,.1f} MB/s)")
+
+    if "fast" in results:
+        same = results["fast"][1] == results["json"][1]
+        print(f"[bench] Speed-up: {results['json'][0] / results['fast'][0]:.2f}x — "
+              f"rows identical: {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+scripts/bench_flush.py — Compare consumer flush modes (INSERT vs stage-and-COPY).
+
+Builds synthetic TXN / LOG / USER rows with the producer's event generators,
+then times consumer.write_table() for each mode and batch size against scratch
+copies of the raw tables in a transient INGEST_BENCH schema (dropped
+afterwards). Each table batch is written and committed on its own, as the
+consumer's writers do.
+
+Usage:
+  python scripts/bench_flush.py --rows 50000 --batch 500 5000 --modes insert copy merge
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+from itertools import zip_longest
+
+import snowflake.connector
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.core.config import get_snowflake_connection_params
+from streaming import bulk_load
+from streaming.consumer import write_table, parse, COLUMNS, FLUSH_WRITERS, TXN_TABLE, LOG_TABLE, USER_TABLE
+from streaming.producer import make_txn_event, make_log_event, make_user_event
+
+BENCH_SCHEMA = "INGEST_BENCH"
+TABLES       = [TXN_TABLE, LOG_TABLE, USER_TABLE]
+
+
+def make_rows(n: int):
+    txn_rows, log_rows, user_rows = [], [], []
+    for _ in range(n):
+        roll = random.random()
+        if roll < 0.70:
+            event = make_txn_event()
+        elif roll < 0.95:
+            event = make_log_event()
+        else:
+            event = make_user_event()
+        parse(event, txn_rows, log_rows, user_rows)
+    return txn_rows, log_rows, user_rows
+
+
+def chunks(rows: list, size: int):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def bench(conn, mode: str, batch: int, txn_rows, log_rows, user_rows) -> float:
+    cur = conn.cursor()
+    for table in TABLES:
+        cur.execute(f"TRUNCATE TABLE {table}")
+
+    total = len(txn_rows) + len(log_rows) + len(user_rows)
+    # Keep the 70/25/5 mix inside each flush, as the consumer would see it
+    n_batches = max(1, -(-total // batch))
+    t_size = max(1, -(-len(txn_rows)  // n_batches))
+    l_size = max(1, -(-len(log_rows)  // n_batches))
+    u_size = max(1, -(-len(user_rows) // n_batches))
+
+    start = time.perf_counter()
+    for t, l, u in zip_longest(chunks(txn_rows, t_size), chunks(log_rows, l_size),
+                               chunks(user_rows, u_size), fillvalue=[]):
+        for table, rows in zip(TABLES, (t, l, u)):
+            if rows:
+                write_table(conn, table, COLUMNS[table], rows, mode)
+                conn.commit()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows",  type=int, default=50_000, help="Synthetic events to load per run")
+    parser.add_argument("--batch", type=int, nargs="+", default=[500, 5_000], help="Rows per flush")
+    parser.add_argument("--modes", nargs="+", default=list(FLUSH_WRITERS), choices=list(FLUSH_WRITERS))
+    args = parser.parse_args()
+
+    print(f"[bench] Generating {args.rows:,} synthetic events...")
+    txn_rows, log_rows, user_rows = make_rows(args.rows)
+    total = len(txn_rows) + len(log_rows) + len(user_rows)
+
+    params = get_snowflake_connection_params()
+    conn   = snowflake.connector.connect(**params)
+    cur    = conn.cursor()
+    cur.execute(f"CREATE OR REPLACE TRANSIENT SCHEMA {BENCH_SCHEMA}")
+    for table in TABLES:
+        cur.execute(f"CREATE TABLE {BENCH_SCHEMA}.{table} LIKE {params['schema']}.{table}")
+    cur.execute(f"USE SCHEMA {BENCH_SCHEMA}")
+    bulk_load.prepare(conn)
+
+    results = []
+    try:
+        for batch in args.batch:
+            for mode in args.modes:
+                secs = bench(conn, mode, batch, txn_rows, log_rows, user_rows)
+                results.append((mode, batch, secs))
+                print(f"[bench] {mode:<6} batch={batch:>6,}  {secs:7.2f}s  {total / secs:>10,.0f} rows/s")
+    finally:
+        cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA}")
+        conn.close()
+
+    print("\n  mode    batch      seconds      rows/s")
+    for mode, batch, secs in results:
+        print(f"  {mode:<6} {batch:>7,}   {secs:9.2f}   {total / secs:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+scripts/bench_wire.py — Bytes per event and encode / decode cost per wire format and codec.
+
+Generates events with the producer's EventBatchGenerator, encodes them with
+each wire format, compresses them in Kafka-sized record batches with each
+available codec (kafka.codec, the functions kafka-python itself uses), and
+times the consumer's decode path. Codecs whose package is not installed are
+skipped.
+
+Usage:
+  python scripts/bench_wire.py --events 100000 --batch 500
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from kafka import codec
+from streaming import wire
+from streaming.producer import EventBatchGenerator
+from streaming.consumer import decode_records
+
+COMPRESSORS = {
+    "none":   (lambda b: b,          lambda b: b),
+    "gzip":   (codec.gzip_encode,    codec.gzip_decode),
+    "snappy": (codec.snappy_encode,  codec.snappy_decode),
+    "lz4":    (codec.lz4_encode,     codec.lz4_decode),
+    "zstd":   (codec.zstd_encode,    codec.zstd_decode),
+}
+
+
+class Record:
+    """The slice of kafka-python's ConsumerRecord that decode_records() reads."""
+    __slots__ = ("value", "headers")
+
+    def __init__(self, value, headers):
+        self.value   = value
+        self.headers = headers
+
+
+def timed(fn, repeat: int) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--batch",  type=int, default=500, help="Messages per Kafka record batch / poll")
+    parser.add_argument("--repeat", type=int, default=3,   help="Best-of-N timing")
+    args = parser.parse_args()
+
+    events = EventBatchGenerator().generate(args.events)
+    n      = len(events)
+    codecs = [c for c in COMPRESSORS if wire.CODECS[c]()]
+    skipped = sorted(set(COMPRESSORS) - set(codecs))
+    if skipped:
+        print(f"[bench] Skipping codecs without their package installed: {', '.join(skipped)}")
+
+    print(f"\n{'format':<9}{'codec':<8}{'B/event':>9}{'encode µs':>11}{'compress µs':>13}"
+          f"{'decompress µs':>15}{'decode µs':>11}")
+    reference = None
+    for fmt in wire.FORMATS:
+        encoder = wire.Encoder(fmt)
+        t_enc, values = timed(lambda: [encoder.encode(e) for e in events], args.repeat)
+        batches = [values[i:i + args.batch] for i in range(0, n, args.batch)]
+
+        def decode():
+            txn, log, user = [], [], []
+            for chunk in batches:
+                decode_records([Record(v, encoder.headers) for v in chunk], txn, log, user)
+            return txn, log, user
+
+        t_dec, rows = timed(decode, args.repeat)
+        if reference is None:
+            reference = rows
+        elif rows != reference:
+            print(f"[bench] ⚠️  {fmt} rows differ from {wire.FORMATS[0]}")
+
+        for name in codecs:
+            compress, decompress = COMPRESSORS[name]
+            # Kafka compresses the concatenated values of a record batch as one blob
+            blobs = [b"".join(chunk) for chunk in batches]
+            t_comp, packed = timed(lambda: [compress(b) for b in blobs], args.repeat)
+            t_decomp, _    = timed(lambda: [decompress(p) for p in packed], args.repeat)
+            size = sum(map(len, packed)) / n
+            print(f"{fmt:<9}{name:<8}{size:>9.1f}{t_enc / n * 1e6:>11.2f}{t_comp / n * 1e6:>13.2f}"
+                  f"{t_decomp / n * 1e6:>15.2f}{t_dec / n * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
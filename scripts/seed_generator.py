@@ -0,0 +1,233 @@
+"""
+scripts/seed_generator.py — Vectorized synthetic rows for setup.py seeding.
+
+Each table's generator draws a whole chunk column by column with NumPy —
+categorical codes, amounts, dates and foreign keys are single array draws —
+and zips the columns into row tuples at the end. Per-row Faker calls are
+replaced by pools built once per process from Faker seeded with SEED: first
+names, last names and companies are picked from the pools by index.
+
+Emails are unique by construction: <first>.<last>.<row index>@<domain>,
+where the row index is the row's position in the whole table, not the chunk.
+
+IDs are a bijection of the row index too: row i of a table gets
+  <prefix><low + (i · ID_MULTIPLIER + offset) mod size>
+over the table's IdSpace, an affine permutation (ID_MULTIPLIER is prime, so
+coprime with every size here). IDs never collide, and a foreign key into a
+parent of N rows is just row_ids(parent, uniform index < N): no parent IDs
+are queried back or held in memory. The customer subsets referenced by app
+logs and support cases are the first share·N positions of a second
+permutation of the customer indexes, so they are arithmetic as well.
+
+Output depends only on (SEED, table, chunk index, as_of) and the parent
+tables' row counts:
+  rng    — chunk_rng(table, index), a SeedSequence of those three numbers
+           (counter-based: no stream is shared between chunks), so any chunk
+           can be generated alone, in any process, in any order
+  as_of  — the reference date; dates are drawn backwards from its midnight
+           (UTC), so a rerun on the same day reproduces the same rows
+"""
+
+import math
+import zlib
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+from faker import Faker
+
+SEED      = 42
+POOL_SIZE = 5_000
+DOMAINS   = ["example.com", "example.net", "example.org", "mail.com", "inbox.com"]
+
+SEGMENTS  = ["Young Professional", "Student", "Established", "High Net Worth"]
+PRODUCTS  = ["CHK", "SAV", "MMA", "CC"]
+TX_TYPES  = ["DEBIT_CARD_POS","ACH_CREDIT","ACH_DEBIT","WIRE_OUT","ATM_WITHDRAWAL","CHECK_DEPOSIT","FEE_OD","FEE_MONTHLY"]
+TX_CHANNELS = ["MOBILE_APP","WEB_BANKING","BRANCH","ATM","PHONE"]
+LOG_EVENTS  = ["LOGIN","VIEW_BALANCE","TRANSFER","ERROR","LOGOUT"]
+OSES        = ["iOS","Android","Web"]
+CASE_CHANNELS   = ["PHONE","EMAIL","CHAT"]
+CASE_CATEGORIES = ["BILLING","TECHNICAL","FRAUD","GENERAL"]
+TRANSCRIPT      = "Customer contacted support regarding account issue."
+
+# share of customers that app logs and support cases reference, at every scale
+LOG_CUSTOMER_SHARE     = 0.5
+SUPPORT_CUSTOMER_SHARE = 0.2
+
+DEBIT_TYPES   = np.array(["DEBIT" in t for t in TX_TYPES])
+AMOUNT_RANGES = np.array([(1000, 20000) if "WIRE" in t else (5, 35) if "FEE" in t else (5, 500)
+                          for t in TX_TYPES], dtype=float)
+
+IdSpace = namedtuple("IdSpace", "prefix low size")
+
+ID_MULTIPLIER = 2_654_435_761   # prime; coprime with every 9·10^k size
+ID_SPACES = {
+    "DIM_CUSTOMERS":           IdSpace("C",  10_000_000,  90_000_000),
+    "DIM_ACCOUNTS":            IdSpace("A",  10_000_000,  90_000_000),
+    "FACT_TRANSACTION_LEDGER": IdSpace("TX", 100_000_000, 900_000_000),
+    "APP_ACTIVITY_LOGS":       IdSpace("LG", 10_000_000,  90_000_000),
+    "SUPPORT_CASES":           IdSpace("CS", 1_000_000,   9_000_000),
+}
+
+_pools = None
+
+
+def pools() -> dict:
+    """First-name, last-name and company pools, built once per process."""
+    global _pools
+    if _pools is None:
+        faker = Faker()
+        faker.seed_instance(SEED)
+        firsts = [faker.first_name() for _ in range(POOL_SIZE)]
+        lasts  = [faker.last_name() for _ in range(POOL_SIZE)]
+        _pools = {
+            "firsts":    firsts,
+            "lasts":     lasts,
+            "companies": [faker.company()[:100] for _ in range(POOL_SIZE)],
+            # email local parts, same positions as the name pools
+            "first_locals": [_local(f) for f in firsts],
+            "last_locals":  [_local(l) for l in lasts],
+        }
+    return _pools
+
+
+def _local(name: str) -> str:
+    return "".join(c for c in name.lower() if c.isalnum())
+
+
+def table_key(table: str) -> int:
+    return zlib.crc32(table.encode())
+
+
+def chunk_rng(table: str, index: int, seed: int = SEED) -> np.random.Generator:
+    return np.random.default_rng(np.random.SeedSequence([seed, table_key(table), index]))
+
+
+def _pick(values: list, n: int, rng) -> list:
+    return [values[i] for i in rng.integers(0, len(values), n).tolist()]
+
+
+def id_offset(table: str) -> int:
+    return table_key(table) % ID_SPACES[table].size
+
+
+def id_numbers(table: str, index: np.ndarray) -> np.ndarray:
+    """The numeric part of the IDs of rows `index` (int64 is enough: both
+    factors are below 10^9)."""
+    space = ID_SPACES[table]
+    return space.low + (index * (ID_MULTIPLIER % space.size) + id_offset(table)) % space.size
+
+
+def row_ids(table: str, index) -> list:
+    prefix = ID_SPACES[table].prefix
+    return [f"{prefix}{v}" for v in id_numbers(table, np.asarray(index, dtype=np.int64)).tolist()]
+
+
+def subset_step(key: str, rows: int) -> int:
+    """Multiplier of the permutation of range(rows) that picks a subset for key."""
+    step = (ID_MULTIPLIER + table_key(key)) % rows or 1
+    while math.gcd(step, rows) != 1:
+        step += 1
+    return step
+
+
+def subset_size(rows: int, share: float) -> int:
+    return max(1, round(rows * share))
+
+
+def subset_index(key: str, rows: int, j: np.ndarray) -> np.ndarray:
+    """Positions j < subset_size of a fixed subset of range(rows), as row indexes."""
+    return (j * subset_step(key, rows) + table_key(key)) % rows
+
+
+def _dates(as_of: date, max_days: int, n: int, rng) -> list:
+    days = np.datetime64(as_of, "D") - rng.integers(0, max_days, n, endpoint=True)
+    return days.astype(str).tolist()
+
+
+def _timestamps(as_of: date, max_days: int, n: int, rng) -> list:
+    secs = np.datetime64(as_of, "s") - rng.integers(0, max_days * 86_400, n)
+    return np.datetime_as_string(secs, unit="s").tolist()
+
+
+def _fk(parent: str, rows: int, n: int, rng, subset: tuple = None) -> list:
+    """n foreign keys into the parent's rows, or into a fixed subset (key, share) of them."""
+    if subset is None:
+        return row_ids(parent, rng.integers(0, rows, n))
+    key, share = subset
+    return row_ids(parent, subset_index(key, rows, rng.integers(0, subset_size(rows, share), n)))
+
+
+# ── Tables: fn(n, start, rng, as_of, sizes) → list of row tuples ──
+# sizes[table] is a parent table's row count; row index start + k is the k-th row
+
+def customers(n: int, start: int, rng, as_of: date, sizes) -> list:
+    p = pools()
+    first = rng.integers(0, POOL_SIZE, n).tolist()
+    last  = rng.integers(0, POOL_SIZE, n).tolist()
+    names  = [f"{p['firsts'][f]} {p['lasts'][l]}" for f, l in zip(first, last)]
+    emails = [f"{p['first_locals'][f]}.{p['last_locals'][l]}.{i}@{d}"
+              for f, l, i, d in zip(first, last, range(start, start + n), _pick(DOMAINS, n, rng))]
+    return list(zip(
+        row_ids("DIM_CUSTOMERS", np.arange(start, start + n)),
+        names,
+        emails,
+        _pick(SEGMENTS, n, rng),
+        _dates(as_of, 5 * 365, n, rng),
+        np.round(rng.uniform(0, 1, n), 2).tolist(),
+    ))
+
+
+def accounts(n: int, start: int, rng, as_of: date, sizes) -> list:
+    return list(zip(
+        row_ids("DIM_ACCOUNTS", np.arange(start, start + n)),
+        _fk("DIM_CUSTOMERS", sizes["DIM_CUSTOMERS"], n, rng),
+        _pick(PRODUCTS, n, rng),
+        np.round(rng.uniform(0, 50_000, n), 2).tolist(),
+        ["ACTIVE"] * n,
+        _dates(as_of, 5 * 365, n, rng),
+    ))
+
+
+def transactions(n: int, start: int, rng, as_of: date, sizes) -> list:
+    tx_idx  = rng.integers(0, len(TX_TYPES), n)
+    lo, hi  = AMOUNT_RANGES[tx_idx].T
+    amounts = np.round(rng.uniform(lo, hi), 2).tolist()
+    debit   = DEBIT_TYPES[tx_idx].tolist()
+    companies = _pick(pools()["companies"], n, rng)
+    mccs    = rng.integers(1000, 9999, n, endpoint=True).tolist()
+    return list(zip(
+        row_ids("FACT_TRANSACTION_LEDGER", np.arange(start, start + n)),
+        _fk("DIM_ACCOUNTS", sizes["DIM_ACCOUNTS"], n, rng),
+        _timestamps(as_of, 90, n, rng),
+        [TX_TYPES[t] for t in tx_idx.tolist()],
+        amounts,
+        [c if d else None for c, d in zip(companies, debit)],
+        [f"MCC{m}" if d else None for m, d in zip(mccs, debit)],
+        _pick(TX_CHANNELS, n, rng),
+    ))
+
+
+def app_logs(n: int, start: int, rng, as_of: date, sizes) -> list:
+    events = _pick(LOG_EVENTS, n, rng)
+    return list(zip(
+        row_ids("APP_ACTIVITY_LOGS", np.arange(start, start + n)),
+        _fk("DIM_CUSTOMERS", sizes["DIM_CUSTOMERS"], n, rng, ("APP_ACTIVITY_LOGS", LOG_CUSTOMER_SHARE)),
+        events,
+        _timestamps(as_of, 90, n, rng),
+        _pick(OSES, n, rng),
+        ["/home"] * n,
+        ["ERR_500" if e == "ERROR" else None for e in events],
+    ))
+
+
+def support_cases(n: int, start: int, rng, as_of: date, sizes) -> list:
+    return list(zip(
+        row_ids("SUPPORT_CASES", np.arange(start, start + n)),
+        _fk("DIM_CUSTOMERS", sizes["DIM_CUSTOMERS"], n, rng, ("SUPPORT_CASES", SUPPORT_CUSTOMER_SHARE)),
+        _timestamps(as_of, 90, n, rng),
+        _pick(CASE_CHANNELS, n, rng),
+        _pick(CASE_CATEGORIES, n, rng),
+        np.round(rng.uniform(0, 1, n), 2).tolist(),
+        [TRANSCRIPT] * n,
+    ))
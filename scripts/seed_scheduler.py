@@ -0,0 +1,163 @@
+"""
+scripts/seed_scheduler.py — Dependency-aware task scheduler for setup.py seeding.
+
+A seed run is a DAG of tasks (generate + stage one chunk, COPY one table, …).
+run() executes it on a process pool: a task is submitted as soon as all of
+its dependencies have finished, and when more tasks are ready than there are
+free workers, the one with the most work still behind it (its own cost plus
+the costliest chain of dependents) goes first. Each worker process runs the
+pool initializer once, so it can hold its own Snowflake connection. A task
+with no fn is a barrier: it completes in the parent as soon as it is ready,
+so N tasks that depend on M others can share one barrier (N + M edges, not
+N × M).
+
+Every task is timed inside the worker with the wall clock. critical_path()
+walks back from the last task to finish, at each step following the
+dependency that finished last, which is the chain that set the total run
+time; wait is the time a task sat ready but queued for a worker.
+"""
+
+import heapq
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import multiprocessing as mp
+
+
+class Task:
+    def __init__(self, name: str, fn, args: tuple = (), deps=(), cost: float = 1.0):
+        self.name = name
+        self.fn   = fn
+        self.args = args
+        self.deps = tuple(deps)
+        self.cost = cost
+
+
+Timing = namedtuple("Timing", "start end pid")
+Step   = namedtuple("Step", "name start secs wait")
+
+
+def _run_task(fn, args):
+    start = time.time()
+    result = fn(*args)
+    return result, Timing(start, time.time(), os.getpid())
+
+
+def _dependents(tasks: dict) -> dict:
+    """{name: [names of the tasks that depend on it]}."""
+    dependents = {name: [] for name in tasks}
+    for task in tasks.values():
+        for dep in set(task.deps):
+            dependents[dep].append(task.name)
+    return dependents
+
+
+def _priorities(tasks: dict, dependents: dict) -> dict:
+    """Cost of each task plus its costliest chain of dependents."""
+    prio = {}
+
+    def visit(name):
+        if name not in prio:
+            prio[name] = tasks[name].cost + max((visit(d) for d in dependents[name]), default=0.0)
+        return prio[name]
+
+    for name in tasks:
+        visit(name)
+    return prio
+
+
+def check(tasks: list) -> dict:
+    """{name: task}, raising ValueError on duplicate names, unknown deps or cycles."""
+    by_name = {}
+    for task in tasks:
+        if task.name in by_name:
+            raise ValueError(f"duplicate task {task.name}")
+        by_name[task.name] = task
+    for task in tasks:
+        unknown = [d for d in task.deps if d not in by_name]
+        if unknown:
+            raise ValueError(f"task {task.name} depends on unknown {unknown}")
+    state = {}
+
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"dependency cycle: {' → '.join(path + [name])}")
+        state[name] = "visiting"
+        for dep in by_name[name].deps:
+            visit(dep, path + [name])
+        state[name] = "done"
+
+    for name in by_name:
+        visit(name, [])
+    return by_name
+
+
+def run(tasks: list, workers: int, initializer=None, initargs: tuple = (), on_done=None):
+    """Run the DAG. Returns ({name: result}, {name: Timing}, wall-clock start).
+
+    on_done(name, result, timing) is called in the parent as tasks finish.
+    The first task to raise cancels everything not yet started and re-raises.
+    """
+    by_name    = check(tasks)
+    dependents = _dependents(by_name)
+    prio       = _priorities(by_name, dependents)
+    unmet      = {name: len(set(t.deps)) for name, t in by_name.items()}
+    ready      = [(-prio[name], name) for name, n in unmet.items() if n == 0]   # heap, highest priority first
+    heapq.heapify(ready)
+    results, timings, running = {}, {}, {}
+    started    = time.time()
+
+    def finish(name, result, timing):
+        results[name], timings[name] = result, timing
+        for d in dependents[name]:   # only the tasks waiting on this one
+            unmet[d] -= 1
+            if unmet[d] == 0:
+                heapq.heappush(ready, (-prio[d], d))
+        if on_done is not None:
+            on_done(name, result, timing)
+
+    ctx = mp.get_context("spawn")   # workers open their own connections; nothing inherited
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=initializer, initargs=initargs) as pool:
+        while ready or running:
+            while ready and (len(running) < workers or by_name[ready[0][1]].fn is None):
+                task = by_name[heapq.heappop(ready)[1]]
+                if task.fn is None:   # barrier
+                    now = time.time()
+                    finish(task.name, None, Timing(now, now, os.getpid()))
+                else:
+                    running[pool.submit(_run_task, task.fn, task.args)] = task.name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result, timing = future.result()
+                except BaseException:
+                    for f in running:
+                        f.cancel()
+                    raise
+                finish(name, result, timing)
+    return results, timings, started
+
+
+def critical_path(tasks: list, timings: dict, started: float) -> list:
+    """[Step] from the first task to the last one to finish, along the
+    dependencies that finished last."""
+    if not timings:
+        return []
+    by_name = {t.name: t for t in tasks}
+    name    = max(timings, key=lambda n: timings[n].end)
+    path    = []
+    while name is not None:
+        t    = timings[name]
+        deps = [d for d in by_name[name].deps if d in timings]
+        prev = max(deps, key=lambda d: timings[d].end) if deps else None
+        ready_at = timings[prev].end if prev else started
+        path.append(Step(name, t.start - started, t.end - t.start, max(0.0, t.start - ready_at)))
+        name = prev
+    return path[::-1]
@@ -0,0 +1,218 @@
+"""
+scripts/seed_server.py — Generate seed rows inside Snowflake (setup.py --seed-mode server).
+
+Each table is seeded by one INSERT … SELECT over TABLE(GENERATOR(ROWCOUNT => n)),
+so no rows cross the wire and a 10x or 100x dataset costs the same single
+statement per table. The SQL mirrors scripts/seed_generator.py:
+
+  categorical values  — ARRAY_CONSTRUCT lookup arrays indexed by UNIFORM(0, k-1, …)
+  names / companies   — the generator's Faker pools, all seed_generator.POOL_SIZE
+                        entries inlined as lookup arrays (about 200 KB of SQL
+                        for customers, well under Snowflake's statement limit),
+                        so names and companies have the same cardinality as
+                        copy / insert mode
+  row index           — ROW_NUMBER() over SEQ8() (SEQ8 alone may have gaps),
+                        numbered in an inner subquery that every draw reads
+  IDs                 — the generator's affine permutation of the row index
+  emails              — first.last.<row index>@domain, unique by construction
+  dates / timestamps  — counted back from the run's reference day (as_of)
+  foreign keys        — the parent's ID of a UNIFORM row index, computed the
+                        same way; the customer subsets for app logs and
+                        support cases use the generator's subset permutation,
+                        so no parent table is read
+
+Every draw is UNIFORM over HASH(row index, column seed) rather than RANDOM():
+a row's values depend only on its index, never on which statement or run
+generated it, so a resumed or topped-up seed produces exactly the rows a
+clean one would. Column seeds derive from seed_generator.SEED, the table and
+the column position, so no two columns are correlated.
+"""
+
+from datetime import date
+
+from scripts import seed_generator as gen
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def _array(values) -> str:
+    return "ARRAY_CONSTRUCT(" + ", ".join(_literal(v) for v in values) + ")"
+
+
+class _Randoms:
+    """Per-row generator expressions for UNIFORM, a distinct seed per column of one table."""
+
+    def __init__(self, table: str, index: str = "s.i"):
+        self.base  = (gen.SEED * 1_000_003 + gen.table_key(table)) % (2 ** 31)
+        self.index = index
+        self.n     = 0
+
+    def __call__(self) -> str:
+        self.n += 1
+        return f"HASH({self.index}, {self.base + self.n})"
+
+
+def _pick(values, r: _Randoms) -> str:
+    return f"{_array(values)}[UNIFORM(0, {len(values) - 1}, {r()})]::STRING"
+
+
+def _date(as_of: date, max_days: int, r: _Randoms) -> str:
+    return f"DATEADD('day', -UNIFORM(0, {max_days}, {r()}), '{as_of.isoformat()}'::DATE)"
+
+
+def _timestamp(as_of: date, max_days: int, r: _Randoms) -> str:
+    return (f"DATEADD('second', -UNIFORM(0, {max_days * 86_400 - 1}, {r()}), "
+            f"'{as_of.isoformat()}'::TIMESTAMP_NTZ)")
+
+
+def _row_id(table: str, index: str) -> str:
+    """SQL for seed_generator.row_ids(table, index)."""
+    space = gen.ID_SPACES[table]
+    return (f"'{space.prefix}' || ({space.low} + MOD({index} * {gen.ID_MULTIPLIER % space.size} "
+            f"+ {gen.id_offset(table)}, {space.size}))")
+
+
+def _fk(parent: str, rows: int, r: _Randoms, subset: tuple = None) -> str:
+    """SQL for seed_generator._fk: a parent ID drawn by row index."""
+    if subset is None:
+        return _row_id(parent, f"UNIFORM(0, {rows - 1}, {r()})")
+    key, share = subset
+    j = f"UNIFORM(0, {gen.subset_size(rows, share) - 1}, {r()})"
+    return _row_id(parent, f"MOD({j} * {gen.subset_step(key, rows)} + {gen.table_key(key)}, {rows})")
+
+
+def _rows(n: int, start: int) -> str:
+    """Row indexes start … start + n - 1 as column i."""
+    return f"(SELECT ROW_NUMBER() OVER (ORDER BY SEQ8()) - 1 + {start} AS i FROM TABLE(GENERATOR(ROWCOUNT => {n}))) s"
+
+
+def chunk_ids(table: str, n: int, start: int) -> str:
+    """SELECT of the IDs of rows start … start + n - 1 (to delete a chunk's rows)."""
+    return f"SELECT {_row_id(table, 's.i')} FROM {_rows(n, start)}"
+
+
+# ── Tables: fn(n, start, as_of, sizes) → INSERT statement ──
+# sizes[table] is a parent table's row count (UNIFORM bounds must be constants)
+
+def customers(n: int, start: int, as_of: date, sizes) -> str:
+    r = _Randoms("DIM_CUSTOMERS")
+    p = gen.pools()
+    firsts, lasts = p["firsts"], p["lasts"]
+    locals_f, locals_l = p["first_locals"], p["last_locals"]
+    return f"""
+        INSERT INTO DIM_CUSTOMERS (CUSTOMER_ID, FULL_NAME, EMAIL, SEGMENT, JOIN_DATE, RISK_PROFILE_SCORE)
+        SELECT
+            {_row_id("DIM_CUSTOMERS", "g.i")},
+            {_array(firsts)}[g.f]::STRING || ' ' || {_array(lasts)}[g.l]::STRING,
+            {_array(locals_f)}[g.f]::STRING || '.' || {_array(locals_l)}[g.l]::STRING
+                || '.' || g.i || '@' || g.domain,
+            g.segment, g.joined, g.risk
+        FROM (
+            SELECT
+                s.i,
+                UNIFORM(0, {len(firsts) - 1}, {r()})             AS f,
+                UNIFORM(0, {len(lasts) - 1}, {r()})              AS l,
+                {_pick(gen.DOMAINS, r)}                          AS domain,
+                {_pick(gen.SEGMENTS, r)}                         AS segment,
+                {_date(as_of, 5 * 365, r)}                       AS joined,
+                ROUND(UNIFORM(0::FLOAT, 1::FLOAT, {r()}), 2)     AS risk
+            FROM {_rows(n, start)}
+        ) g
+    """
+
+
+def accounts(n: int, start: int, as_of: date, sizes) -> str:
+    r = _Randoms("DIM_ACCOUNTS")
+    return f"""
+        INSERT INTO DIM_ACCOUNTS (ACCOUNT_ID, CUSTOMER_ID, PRODUCT_CODE, AVAILABLE_BALANCE, ACCOUNT_STATUS, OPENED_DATE)
+        SELECT {_row_id("DIM_ACCOUNTS", "g.i")}, g.customer_id, g.product, g.balance, 'ACTIVE', g.opened
+        FROM (
+            SELECT
+                s.i,
+                {_fk("DIM_CUSTOMERS", sizes["DIM_CUSTOMERS"], r)}        AS customer_id,
+                {_pick(gen.PRODUCTS, r)}                                 AS product,
+                ROUND(UNIFORM(0::FLOAT, 50000::FLOAT, {r()}), 2)         AS balance,
+                {_date(as_of, 5 * 365, r)}                               AS opened
+            FROM {_rows(n, start)}
+        ) g
+    """
+
+
+def transactions(n: int, start: int, as_of: date, sizes) -> str:
+    r = _Randoms("FACT_TRANSACTION_LEDGER")
+    lo = " ".join(f"WHEN {i} THEN {a:g}" for i, (a, _) in enumerate(gen.AMOUNT_RANGES))
+    hi = " ".join(f"WHEN {i} THEN {b:g}" for i, (_, b) in enumerate(gen.AMOUNT_RANGES))
+    debit = ", ".join(str(i) for i, d in enumerate(gen.DEBIT_TYPES) if d)
+    companies = gen.pools()["companies"]
+    return f"""
+        INSERT INTO FACT_TRANSACTION_LEDGER (TRANSACTION_REF, ACCOUNT_ID, POSTING_DATE, TRANSACTION_CODE, AMOUNT,
+                                             MERCHANT_DESCRIPTION, MERCHANT_CATEGORY_CODE, CHANNEL_ID)
+        SELECT
+            {_row_id("FACT_TRANSACTION_LEDGER", "g.i")}, g.account_id, g.posted,
+            {_array(gen.TX_TYPES)}[g.tx]::STRING,
+            ROUND(CASE g.tx {lo} END + g.u * (CASE g.tx {hi} END - CASE g.tx {lo} END), 2),
+            IFF(g.tx IN ({debit}), {_array(companies)}[g.company]::STRING, NULL),
+            IFF(g.tx IN ({debit}), 'MCC' || g.mcc, NULL),
+            g.channel
+        FROM (
+            SELECT
+                s.i,
+                {_fk("DIM_ACCOUNTS", sizes["DIM_ACCOUNTS"], r)}        AS account_id,
+                {_timestamp(as_of, 90, r)}                             AS posted,
+                UNIFORM(0, {len(gen.TX_TYPES) - 1}, {r()})             AS tx,
+                UNIFORM(0::FLOAT, 1::FLOAT, {r()})                     AS u,
+                UNIFORM(0, {len(companies) - 1}, {r()})                AS company,
+                UNIFORM(1000, 9999, {r()})                             AS mcc,
+                {_pick(gen.TX_CHANNELS, r)}                            AS channel
+            FROM {_rows(n, start)}
+        ) g
+    """
+
+
+def app_logs(n: int, start: int, as_of: date, sizes) -> str:
+    r = _Randoms("APP_ACTIVITY_LOGS")
+    subset = ("APP_ACTIVITY_LOGS", gen.LOG_CUSTOMER_SHARE)
+    return f"""
+        INSERT INTO APP_ACTIVITY_LOGS (LOG_ID, CUSTOMER_ID, EVENT_TYPE, EVENT_TIMESTAMP, DEVICE_OS, PAGE_URL, ERROR_CODE)
+        SELECT {_row_id("APP_ACTIVITY_LOGS", "g.i")}, g.customer_id, g.evt, g.ts, g.os, '/home',
+               IFF(g.evt = 'ERROR', 'ERR_500', NULL)
+        FROM (
+            SELECT
+                s.i,
+                {_fk("DIM_CUSTOMERS", sizes["DIM_CUSTOMERS"], r, subset)}    AS customer_id,
+                {_pick(gen.LOG_EVENTS, r)}                 AS evt,
+                {_timestamp(as_of, 90, r)}                 AS ts,
+                {_pick(gen.OSES, r)}                       AS os
+            FROM {_rows(n, start)}
+        ) g
+    """
+
+
+def support_cases(n: int, start: int, as_of: date, sizes) -> str:
+    r = _Randoms("SUPPORT_CASES")
+    subset = ("SUPPORT_CASES", gen.SUPPORT_CUSTOMER_SHARE)
+    return f"""
+        INSERT INTO SUPPORT_CASES (CASE_ID, CUSTOMER_ID, OPEN_TIMESTAMP, CHANNEL, CATEGORY, SENTIMENT_SCORE, TRANSCRIPT_TEXT)
+        SELECT {_row_id("SUPPORT_CASES", "g.i")}, g.customer_id, g.opened, g.channel, g.category, g.sentiment,
+               {_literal(gen.TRANSCRIPT)}
+        FROM (
+            SELECT
+                s.i,
+                {_fk("DIM_CUSTOMERS", sizes["DIM_CUSTOMERS"], r, subset)}    AS customer_id,
+                {_timestamp(as_of, 90, r)}                         AS opened,
+                {_pick(gen.CASE_CHANNELS, r)}                      AS channel,
+                {_pick(gen.CASE_CATEGORIES, r)}                    AS category,
+                ROUND(UNIFORM(0::FLOAT, 1::FLOAT, {r()}), 2)       AS sentiment
+            FROM {_rows(n, start)}
+        ) g
+    """
+
+
+STATEMENTS = {
+    "DIM_CUSTOMERS":           customers,
+    "DIM_ACCOUNTS":            accounts,
+    "FACT_TRANSACTION_LEDGER": transactions,
+    "APP_ACTIVITY_LOGS":       app_logs,
+    "SUPPORT_CASES":           support_cases,
+}
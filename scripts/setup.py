@@ -4,33 +4,52 @@ scripts/setup.py — One-shot Snowflake bootstrap.
 Runs once at docker-compose up. Idempotent (safe to re-run).
 
 Order:
-  1. DROP + CREATE database CHURN_DEMO
+  1. DROP + CREATE database CHURN_DEMO (default --deploy full), or keep it
+     (--deploy incremental)
   2. Create all raw tables
   3. Create dynamic tables (DYN_CUSTOMER_FEATURES, DYN_CHURN_PREDICTIONS)
   4. Create stream on DYN_CHURN_PREDICTIONS
   5. Create stored procedure PROC_GENERATE_RETENTION_EMAILS
   6. Create task TASK_GENERATE_EMAILS (fires only when stream has data)
+     Steps 2–6 are declared as SchemaObjects; --deploy incremental applies
+     only objects whose DDL hash differs from DEPLOYED_OBJECTS, plus dynamic
+     tables / streams built on them, in dependency order
   7. Seed base data: DIM_CUSTOMERS → DIM_ACCOUNTS → FACT_TRANSACTION_LEDGER
                      → APP_ACTIVITY_LOGS → SUPPORT_CASES
+     (--seed-mode copy: staged gzip CSV chunks + one COPY INTO per table;
+      --seed-mode insert: batched INSERTs;
+      --seed-mode server: generated in Snowflake, one INSERT … SELECT per table),
+     as a dependency-ordered task graph
+     on --seed-workers processes, with per-table and critical-path timings.
+     Loaded chunks are recorded in SEED_MANIFEST; --seed-only skips steps 1–6
+     and loads just the missing chunks (resume / extend). --scale-factor sizes
+     every table (1 = 100k customers, 500k transactions)
 """
 
 import sys
 import os
-import random
+import csv
+import gzip
 import time
+import argparse
+import hashlib
+import re
+import tempfile
+from collections import namedtuple
+from contextlib import contextmanager
 from datetime import datetime, timedelta, date
 
 import snowflake.connector
-from faker import Faker
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from src.core.config import get_snowflake_connection_params
-
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
+from streaming import bulk_load
+from scripts import seed_scheduler
+from scripts import seed_generator
+from scripts import seed_server
 
 # ── Seed targets ──────────────────────────────────────────────────────────────
+# row counts at --scale-factor 1 (the default); every table scales linearly
 N_CUSTOMERS    = 100_000
 N_ACCOUNTS     = 200_000
 N_TRANSACTIONS = 500_000
@@ -38,27 +57,72 @@ N_LOGS         = 200_000
 N_SUPPORT      = 50_000
 BATCH          = 10_000
 
+DEPLOYED_OBJECTS = "DEPLOYED_OBJECTS"
+SEED_MANIFEST    = "SEED_MANIFEST"
+
+DEPLOYED_OBJECTS_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {DEPLOYED_OBJECTS} (
+        OBJECT_NAME     VARCHAR(255)  PRIMARY KEY,
+        OBJECT_KIND     VARCHAR(30)   NOT NULL,
+        DDL_HASH        VARCHAR(64)   NOT NULL,
+        DEPLOYED_AT     TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+    )
+"""
+
+SEED_MANIFEST_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {SEED_MANIFEST} (
+        TABLE_NAME      VARCHAR(100)  NOT NULL,
+        CHUNK_INDEX     INTEGER       NOT NULL,
+        CHUNK_ROWS      INTEGER       NOT NULL,
+        AS_OF           DATE          NOT NULL,
+        LOADED_AT       TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+        PRIMARY KEY (TABLE_NAME, CHUNK_INDEX)
+    )
+"""
+
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
-def run(cur, sql: str, label: str = ""):
+def run(cur, sql: str, label: str = "") -> bool:
     try:
         cur.execute(sql)
         print(f"  ✅ {label or sql[:60].strip()}")
+        return True
     except Exception as e:
         print(f"  ❌ {label or sql[:60].strip()}\n     {e}")
+        return False
 
 
-def batch_insert(conn, table: str, columns: list[str], rows: list[tuple]):
+def batch_insert(conn, table: str, columns: list[str], rows: list[tuple], commit: bool = True):
     cur = conn.cursor()
     placeholders = ", ".join(["%s"] * len(columns))
     cols = ", ".join(columns)
     sql = f"INSERT INTO {table} ({cols}) VALUES ({placeholders})"
     cur.executemany(sql, rows)
+    if commit:
+        conn.commit()
+
+
+@contextmanager
+def transaction(conn):
+    """BEGIN … COMMIT around the block; ROLLBACK if it raises."""
+    cur = conn.cursor()
+    cur.execute("BEGIN")
+    try:
+        yield cur
+    except BaseException:
+        conn.rollback()
+        raise
     conn.commit()
 
 
 # ── Step 1: Database ──────────────────────────────────────────────────────────
-def create_database(cur):
+def create_database(cur, full: bool = True):
+    if not full:
+        print("\n[1/7] Using database CHURN_DEMO (incremental deploy)...")
+        run(cur, "CREATE DATABASE IF NOT EXISTS CHURN_DEMO", "Create CHURN_DEMO if missing")
+        run(cur, "USE DATABASE CHURN_DEMO",                  "Use CHURN_DEMO")
+        run(cur, "USE SCHEMA PUBLIC",                        "Use PUBLIC schema")
+        return
     print("\n[1/7] Creating database CHURN_DEMO...")
     run(cur, "DROP DATABASE IF EXISTS CHURN_DEMO", "Drop old CHURN_DEMO")
     run(cur, "CREATE DATABASE CHURN_DEMO",          "Create CHURN_DEMO")
@@ -66,11 +130,17 @@ def create_database(cur):
     run(cur, "USE SCHEMA PUBLIC",                   "Use PUBLIC schema")
 
 
-# ── Step 2: Raw tables ────────────────────────────────────────────────────────
-def create_raw_tables(cur):
-    print("\n[2/7] Creating raw tables...")
+# ── Schema objects ────────────────────────────────────────────────────────────
+# Every object steps 2–6 deploy, declared in dependency order: (name, kind,
+# depends, statements). deploy_schema() runs them; an object's DDL hash (its
+# statements, whitespace-normalised) is what DEPLOYED_OBJECTS records.
+SchemaObject = namedtuple("SchemaObject", "name kind depends statements")
+
 
-    run(cur, """
+# ── Step 2: Raw tables ────────────────────────────────────────────────────────
+RAW_TABLES = [
+    SchemaObject("DIM_CUSTOMERS", "TABLE", (), (
+        """
         CREATE OR REPLACE TABLE DIM_CUSTOMERS (
             CUSTOMER_ID         VARCHAR(20)  PRIMARY KEY,
             FULL_NAME           VARCHAR(100) NOT NULL,
@@ -80,9 +150,10 @@ def create_raw_tables(cur):
             RISK_PROFILE_SCORE  FLOAT,
             CREATED_AT          TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
         )
-    """, "DIM_CUSTOMERS")
-
-    run(cur, """
+        """,
+    )),
+    SchemaObject("DIM_ACCOUNTS", "TABLE", ("DIM_CUSTOMERS",), (
+        """
         CREATE OR REPLACE TABLE DIM_ACCOUNTS (
             ACCOUNT_ID          VARCHAR(20)  PRIMARY KEY,
             CUSTOMER_ID         VARCHAR(20)  NOT NULL REFERENCES DIM_CUSTOMERS(CUSTOMER_ID),
@@ -91,9 +162,10 @@ def create_raw_tables(cur):
             ACCOUNT_STATUS      VARCHAR(10)  DEFAULT 'ACTIVE',
             OPENED_DATE         DATE
         )
-    """, "DIM_ACCOUNTS")
-
-    run(cur, """
+        """,
+    )),
+    SchemaObject("FACT_TRANSACTION_LEDGER", "TABLE", ("DIM_ACCOUNTS",), (
+        """
         CREATE OR REPLACE TABLE FACT_TRANSACTION_LEDGER (
             TRANSACTION_REF         VARCHAR(20)  PRIMARY KEY,
             ACCOUNT_ID              VARCHAR(20)  NOT NULL REFERENCES DIM_ACCOUNTS(ACCOUNT_ID),
@@ -104,9 +176,10 @@ def create_raw_tables(cur):
             MERCHANT_CATEGORY_CODE  VARCHAR(10),
             CHANNEL_ID              VARCHAR(20)
         )
-    """, "FACT_TRANSACTION_LEDGER")
-
-    run(cur, """
+        """,
+    )),
+    SchemaObject("APP_ACTIVITY_LOGS", "TABLE", ("DIM_CUSTOMERS",), (
+        """
         CREATE OR REPLACE TABLE APP_ACTIVITY_LOGS (
             LOG_ID          VARCHAR(20)   PRIMARY KEY,
             CUSTOMER_ID     VARCHAR(20)   NOT NULL REFERENCES DIM_CUSTOMERS(CUSTOMER_ID),
@@ -116,9 +189,10 @@ def create_raw_tables(cur):
             PAGE_URL        VARCHAR(255),
             ERROR_CODE      VARCHAR(20)
         )
-    """, "APP_ACTIVITY_LOGS")
-
-    run(cur, """
+        """,
+    )),
+    SchemaObject("SUPPORT_CASES", "TABLE", ("DIM_CUSTOMERS",), (
+        """
         CREATE OR REPLACE TABLE SUPPORT_CASES (
             CASE_ID         VARCHAR(20)   PRIMARY KEY,
             CUSTOMER_ID     VARCHAR(20)   NOT NULL REFERENCES DIM_CUSTOMERS(CUSTOMER_ID),
@@ -128,9 +202,10 @@ def create_raw_tables(cur):
             SENTIMENT_SCORE FLOAT,
             TRANSCRIPT_TEXT TEXT
         )
-    """, "SUPPORT_CASES")
-
-    run(cur, """
+        """,
+    )),
+    SchemaObject("AGENT_INTERVENTION_LOG", "TABLE", ("DIM_CUSTOMERS",), (
+        """
         CREATE OR REPLACE TABLE AGENT_INTERVENTION_LOG (
             INTERVENTION_ID VARCHAR(36)   PRIMARY KEY,
             CUSTOMER_ID     VARCHAR(20)   NOT NULL REFERENCES DIM_CUSTOMERS(CUSTOMER_ID),
@@ -138,14 +213,18 @@ def create_raw_tables(cur):
             GENERATED_EMAIL TEXT,
             CREATED_AT      TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
         )
-    """, "AGENT_INTERVENTION_LOG")
+        """,
+    )),
+    SchemaObject("SEED_MANIFEST", "TABLE", (), (
+        SEED_MANIFEST_DDL,
+    )),
+]
 
 
 # ── Step 3: Dynamic tables ────────────────────────────────────────────────────
-def create_dynamic_tables(cur):
-    print("\n[3/7] Creating dynamic tables...")
-
-    run(cur, """
+DYNAMIC_TABLES = [
+    SchemaObject("DYN_CUSTOMER_FEATURES", "DYNAMIC TABLE", ("DIM_CUSTOMERS", "DIM_ACCOUNTS", "FACT_TRANSACTION_LEDGER", "APP_ACTIVITY_LOGS", "SUPPORT_CASES"), (
+        """
         CREATE OR REPLACE DYNAMIC TABLE DYN_CUSTOMER_FEATURES
             TARGET_LAG = '5 minutes'
             WAREHOUSE  = BANK_WAREHOUSE
@@ -173,9 +252,10 @@ def create_dynamic_tables(cur):
             ON c.CUSTOMER_ID = s.CUSTOMER_ID
             AND s.OPEN_TIMESTAMP >= DATEADD('day', -30, CURRENT_TIMESTAMP())
         GROUP BY c.CUSTOMER_ID
-    """, "DYN_CUSTOMER_FEATURES")
-
-    run(cur, """
+        """,
+    )),
+    SchemaObject("DYN_CHURN_PREDICTIONS", "DYNAMIC TABLE", ("DYN_CUSTOMER_FEATURES", "DIM_CUSTOMERS"), (
+        """
         CREATE OR REPLACE DYNAMIC TABLE DYN_CHURN_PREDICTIONS
             TARGET_LAG = '5 minutes'
             WAREHOUSE  = BANK_WAREHOUSE
@@ -212,26 +292,30 @@ def create_dynamic_tables(cur):
             f.computed_at
         FROM DYN_CUSTOMER_FEATURES f
         JOIN DIM_CUSTOMERS c ON f.CUSTOMER_ID = c.CUSTOMER_ID
-    """, "DYN_CHURN_PREDICTIONS")
+        """,
+    )),
+]
 
 
 # ── Step 4: Stream ────────────────────────────────────────────────────────────
-def create_stream(cur):
-    print("\n[4/7] Creating stream on FACT_TRANSACTION_LEDGER...")
-    # NOTE: Snowflake streams on Dynamic Tables require INCREMENTAL refresh mode.
-    # We stream on the raw transactions table instead — new transactions are what
-    # drive churn score changes, so this is semantically equivalent.
-    run(cur, """
+# NOTE: Snowflake streams on Dynamic Tables require INCREMENTAL refresh mode.
+# We stream on the raw transactions table instead — new transactions are what
+# drive churn score changes, so this is semantically equivalent.
+STREAMS = [
+    SchemaObject("STREAM_NEW_TRANSACTIONS", "STREAM", ("FACT_TRANSACTION_LEDGER",), (
+        """
         CREATE OR REPLACE STREAM STREAM_NEW_TRANSACTIONS
             ON TABLE FACT_TRANSACTION_LEDGER
             APPEND_ONLY = TRUE
-    """, "STREAM_NEW_TRANSACTIONS")
+        """,
+    )),
+]
 
 
 # ── Step 5: Stored procedure ──────────────────────────────────────────────────
-def create_procedure(cur):
-    print("\n[5/7] Creating stored procedure PROC_GENERATE_RETENTION_EMAILS...")
-    run(cur, """
+PROCEDURES = [
+    SchemaObject("PROC_GENERATE_RETENTION_EMAILS", "PROCEDURE", ("DYN_CHURN_PREDICTIONS", "AGENT_INTERVENTION_LOG"), (
+        """
         CREATE OR REPLACE PROCEDURE PROC_GENERATE_RETENTION_EMAILS()
         RETURNS VARCHAR
         LANGUAGE SQL
@@ -272,208 +356,592 @@ def create_procedure(cur):
             RETURN 'Emails generated: ' || SQLROWCOUNT;
         END;
         $$
-    """, "PROC_GENERATE_RETENTION_EMAILS")
+        """,
+    )),
+]
 
 
 # ── Step 6: Task ──────────────────────────────────────────────────────────────
-def create_task(cur):
-    print("\n[6/7] Creating task TASK_GENERATE_EMAILS...")
-    run(cur, "ALTER TASK IF EXISTS TASK_GENERATE_EMAILS SUSPEND", "Suspend old task")
-    run(cur, """
+TASKS = [
+    SchemaObject("TASK_GENERATE_EMAILS", "TASK", ("PROC_GENERATE_RETENTION_EMAILS", "STREAM_NEW_TRANSACTIONS"), (
+        "ALTER TASK IF EXISTS TASK_GENERATE_EMAILS SUSPEND",
+        """
         CREATE OR REPLACE TASK TASK_GENERATE_EMAILS
             WAREHOUSE = BANK_WAREHOUSE
             SCHEDULE  = '5 MINUTES'
             WHEN SYSTEM$STREAM_HAS_DATA('CHURN_DEMO.PUBLIC.STREAM_NEW_TRANSACTIONS')
         AS
             CALL PROC_GENERATE_RETENTION_EMAILS()
-    """, "TASK_GENERATE_EMAILS")
-    run(cur, "ALTER TASK TASK_GENERATE_EMAILS RESUME", "Resume task")
+    """,
+        "ALTER TASK TASK_GENERATE_EMAILS RESUME",
+    )),
+]
+
+# ── Steps 2–6: deployment ─────────────────────────────────────────────────────
+# Full deploys (after DROP DATABASE) run every object. Incremental deploys
+# compare each object's DDL hash with DEPLOYED_OBJECTS and run only:
+#   - objects never deployed, or whose DDL changed
+#   - dynamic tables and streams whose dependencies were just redeployed
+#     (they are bound to the object they read, not to its name)
+# Tables are never replaced once they exist (CREATE OR REPLACE would drop
+# their rows). An existing table whose DDL is new to the registry or changed
+# is recorded only if its columns (INFORMATION_SCHEMA.COLUMNS: names, types,
+# text lengths) match the DDL; a seeded table must also have its rows in
+# SEED_MANIFEST, or a resumed seed would load them again under different
+# IDs. If any table fails either check the deploy stops before changing
+# anything — ALTER the table, or run --deploy full. Objects are only
+# recorded once every statement of theirs succeeded, so a failed one is
+# retried on the next run.
+SCHEMA_STEPS = [
+    ("[2/7] Creating raw tables...",                                      RAW_TABLES),
+    ("[3/7] Creating dynamic tables...",                                  DYNAMIC_TABLES),
+    ("[4/7] Creating stream on FACT_TRANSACTION_LEDGER...",               STREAMS),
+    ("[5/7] Creating stored procedure PROC_GENERATE_RETENTION_EMAILS...", PROCEDURES),
+    ("[6/7] Creating task TASK_GENERATE_EMAILS...",                       TASKS),
+]
+REBUILT_WITH_DEPENDENCIES = ("DYNAMIC TABLE", "STREAM")
+
+
+def ddl_hash(obj: SchemaObject) -> str:
+    return hashlib.sha256("\n".join(" ".join(sql.split()) for sql in obj.statements).encode()).hexdigest()
+
+
+def deployed_objects(cur) -> dict:
+    """{name: DDL hash} from DEPLOYED_OBJECTS."""
+    cur.execute(DEPLOYED_OBJECTS_DDL)
+    cur.execute(f"SELECT OBJECT_NAME, DDL_HASH FROM {DEPLOYED_OBJECTS}")
+    return dict(cur.fetchall())
+
+
+def existing_tables(cur) -> set:
+    cur.execute("SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES "
+                "WHERE TABLE_SCHEMA = 'PUBLIC' AND TABLE_TYPE = 'BASE TABLE'")
+    return {r[0] for r in cur.fetchall()}
+
+
+_COLUMN     = re.compile(r"^\s*([A-Z_][A-Z0-9_]*)\s+([A-Z_]+)(?:\((\d+)\))?", re.M)
+_NOT_COLUMN = {"PRIMARY", "UNIQUE", "FOREIGN", "CONSTRAINT"}
+TYPE_NAMES  = {"VARCHAR": "TEXT", "STRING": "TEXT", "CHAR": "TEXT", "DOUBLE": "FLOAT", "REAL": "FLOAT",
+               "INT": "NUMBER", "INTEGER": "NUMBER", "BIGINT": "NUMBER", "DECIMAL": "NUMBER",
+               "TIMESTAMP": "TIMESTAMP_NTZ"}   # as INFORMATION_SCHEMA.COLUMNS.DATA_TYPE reports them
+MAX_TEXT    = 16_777_216                      # length of a VARCHAR / TEXT declared without one
+
+
+def _column(name: str, kind: str, length) -> tuple:
+    kind = TYPE_NAMES.get(kind, kind)
+    return name, kind, (int(length) if length else MAX_TEXT) if kind == "TEXT" else None
+
+
+def declared_columns(obj: SchemaObject) -> list:
+    """[(column, type, text length)] of a table's CREATE TABLE statement."""
+    body = obj.statements[0]
+    return [_column(*m) for m in _COLUMN.findall(body[body.index("(") + 1:]) if m[0] not in _NOT_COLUMN]
+
+
+def table_columns(cur, table: str) -> list:
+    """[(column, type, text length)] of an existing table."""
+    cur.execute("SELECT COLUMN_NAME, DATA_TYPE, CHARACTER_MAXIMUM_LENGTH FROM INFORMATION_SCHEMA.COLUMNS "
+                "WHERE TABLE_SCHEMA = 'PUBLIC' AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION", (table,))
+    return [_column(*r) for r in cur.fetchall()]
+
+
+def unadoptable_tables(cur, deployed: dict, tables: set) -> list:
+    """[(table, reason)] for existing tables an incremental deploy must not record."""
+    seeded = set()
+    if SEED_MANIFEST in tables:
+        cur.execute(f"SELECT DISTINCT TABLE_NAME FROM {SEED_MANIFEST}")
+        seeded = {r[0] for r in cur.fetchall()}
+    blocked = []
+    for _, objects in SCHEMA_STEPS:
+        for obj in objects:
+            if obj.kind != "TABLE" or obj.name not in tables or deployed.get(obj.name) == ddl_hash(obj):
+                continue
+            have, want = table_columns(cur, obj.name), declared_columns(obj)
+            if have != want:
+                diff = [c[0] for c in want if c not in have] + [c[0] for c in have if c not in want]
+                blocked.append((obj.name, f"columns differ from its DDL ({', '.join(dict.fromkeys(diff))})"))
+                continue
+            if obj.name in SEED_TABLES and obj.name not in seeded:
+                cur.execute(f"SELECT COUNT(*) FROM {obj.name}")
+                rows = cur.fetchone()[0]
+                if rows:
+                    blocked.append((obj.name, f"holds {rows:,} rows not recorded in {SEED_MANIFEST}"))
+    return blocked
+
+
+def record_object(cur, obj: SchemaObject, digest: str):
+    cur.execute(f"DELETE FROM {DEPLOYED_OBJECTS} WHERE OBJECT_NAME = %s", (obj.name,))
+    cur.execute(f"INSERT INTO {DEPLOYED_OBJECTS} (OBJECT_NAME, OBJECT_KIND, DDL_HASH) VALUES (%s, %s, %s)",
+                (obj.name, obj.kind, digest))
+
+
+def apply_object(cur, obj: SchemaObject) -> bool:
+    ok = True
+    for sql in obj.statements:
+        label = obj.name if sql.lstrip().startswith("CREATE") else ""
+        ok = run(cur, sql, label) and ok
+    return ok
+
+
+def deploy_schema(cur, full: bool = True) -> list:
+    """Steps 2–6. Returns the names of the objects (re)deployed."""
+    deployed = deployed_objects(cur)
+    tables   = set() if full else existing_tables(cur)
+    applied  = []
+    blocked  = unadoptable_tables(cur, deployed, tables) if not full else []
+    for name, reason in blocked:
+        print(f"  ❌ {name}: {reason}")
+    if blocked:
+        raise SystemExit("Incremental deploy refused: ALTER or drop the tables above, or run --deploy full "
+                         "(drops CHURN_DEMO and seeds it again)")
+    for title, objects in SCHEMA_STEPS:
+        print(f"\n{title}")
+        for obj in objects:
+            digest  = ddl_hash(obj)
+            rebuild = obj.kind in REBUILT_WITH_DEPENDENCIES and any(d in applied for d in obj.depends)
+            if not full and deployed.get(obj.name) == digest and not rebuild:
+                print(f"  · {obj.name} unchanged")
+                continue
+            if not full and obj.kind == "TABLE" and obj.name in tables:   # columns checked above
+                record_object(cur, obj, digest)
+                if obj.name in deployed:
+                    print(f"  ⚠️  {obj.name} DDL changed, columns match — recorded (constraint and default "
+                          f"changes need ALTER TABLE)")
+                else:
+                    print(f"  ✅ {obj.name} exists with matching columns — adopted")
+                continue
+            if apply_object(cur, obj):
+                record_object(cur, obj, digest)
+                applied.append(obj.name)
+    if not full:
+        print(f"\n  {len(applied)} object(s) redeployed" + (f": {', '.join(applied)}" if applied else ""))
+    return applied
 
 
 # ── Step 7: Seed data ─────────────────────────────────────────────────────────
-def seed_data(conn):
-    print("\n[7/7] Seeding base data...")
+# Seeding is a DAG run by scripts/seed_scheduler.py on a process pool, each
+# worker with its own Snowflake connection:
+#   <TABLE>#<i>   — generate chunk i (BATCH rows, its own seed) and load it:
+#                   copy mode writes a gzip CSV file and PUTs it to SEED_STAGE,
+#                   insert mode INSERTs it directly
+#   <TABLE>:copy  — one COPY INTO for all of the table's staged chunks (copy
+#                   mode); falls back to INSERTing the chunk files if it fails
+#   <TABLE>:server — server mode only: one INSERT … SELECT FROM GENERATOR that
+#                   builds the whole table inside Snowflake (scripts/seed_server.py)
+#   <TABLE>:done  — insert mode: a no-op barrier after all of the table's
+#                   chunks, so child chunks depend on it instead of on every
+#                   parent chunk
+# Foreign keys are computed from parent row indexes (no parent IDs are read
+# back), but a table's chunks still wait for its parents to be complete, so
+# every committed row references rows that exist; transactions, app logs and
+# support cases run side by side once customers and accounts are in. The run
+# ends with per-table and critical-path timings.
+#
+# SEED_MANIFEST records every loaded chunk (rows, as_of) in the same
+# transaction as the chunk's rows, so a table is never half-recorded. A rerun
+# (setup.py --seed-only) loads only the chunks the manifest lacks, with the
+# table's recorded as_of, so an interrupted seed resumes and a larger one
+# extends the existing rows. A short last chunk grown by a larger size is
+# reloaded whole: its rows (whose IDs follow from their row indexes) are
+# deleted in the same transaction that loads the full-size chunk, because
+# the generators draw column by column and a longer chunk changes every
+# draw. Server mode draws per row index, so it just adds the missing rows.
+# Rows come from scripts/seed_generator.py (vectorized, seeded per chunk), or
+# from the same distributions in SQL in server mode.
+SEED_MODES   = ("copy", "insert", "server")
+SEED_STAGE   = "SEED_STAGE"
+SEED_WORKERS = min(8, os.cpu_count() or 1)
+
+CUSTOMER_COLUMNS = ["CUSTOMER_ID","FULL_NAME","EMAIL","SEGMENT","JOIN_DATE","RISK_PROFILE_SCORE"]
+ACCOUNT_COLUMNS  = ["ACCOUNT_ID","CUSTOMER_ID","PRODUCT_CODE","AVAILABLE_BALANCE","ACCOUNT_STATUS","OPENED_DATE"]
+TXN_COLUMNS      = ["TRANSACTION_REF","ACCOUNT_ID","POSTING_DATE","TRANSACTION_CODE","AMOUNT",
+                    "MERCHANT_DESCRIPTION","MERCHANT_CATEGORY_CODE","CHANNEL_ID"]
+LOG_COLUMNS      = ["LOG_ID","CUSTOMER_ID","EVENT_TYPE","EVENT_TIMESTAMP","DEVICE_OS","PAGE_URL","ERROR_CODE"]
+SUPPORT_COLUMNS  = ["CASE_ID","CUSTOMER_ID","OPEN_TIMESTAMP","CHANNEL","CATEGORY","SENTIMENT_SCORE","TRANSCRIPT_TEXT"]
+
+SeedTable = namedtuple("SeedTable", "table label rows columns source depends")
+
+# source: the scripts/seed_generator.py function that draws the table's rows
+# depends: tables the source draws foreign keys into (loaded first)
+SEED_PLAN = [
+    SeedTable("DIM_CUSTOMERS",           "customers",     N_CUSTOMERS,    CUSTOMER_COLUMNS, seed_generator.customers,     ()),
+    SeedTable("DIM_ACCOUNTS",            "accounts",      N_ACCOUNTS,     ACCOUNT_COLUMNS,  seed_generator.accounts,      ("DIM_CUSTOMERS",)),
+    SeedTable("FACT_TRANSACTION_LEDGER", "transactions",  N_TRANSACTIONS, TXN_COLUMNS,      seed_generator.transactions,  ("DIM_ACCOUNTS",)),
+    SeedTable("APP_ACTIVITY_LOGS",       "app logs",      N_LOGS,         LOG_COLUMNS,      seed_generator.app_logs,      ("DIM_CUSTOMERS",)),
+    SeedTable("SUPPORT_CASES",           "support cases", N_SUPPORT,      SUPPORT_COLUMNS,  seed_generator.support_cases, ("DIM_CUSTOMERS",)),
+]
+SEED_TABLES = {t.table: t for t in SEED_PLAN}
+
+
+def seed_plan(scale_factor: float = 1.0) -> list:
+    """SEED_PLAN with every table's row count multiplied by scale_factor.
+    Raises ValueError if a table outgrows its ID space."""
+    plan = [spec._replace(rows=max(1, round(spec.rows * scale_factor))) for spec in SEED_PLAN]
+    for spec in plan:
+        size = seed_generator.ID_SPACES[spec.table].size
+        if spec.rows > size:
+            raise ValueError(f"{spec.table}: {spec.rows:,} rows exceed its {size:,} IDs "
+                             f"(max scale factor {size / SEED_TABLES[spec.table].rows:g})")
+    return plan
+
+
+def chunk_rows(spec: SeedTable, index: int) -> int:
+    return min(BATCH, spec.rows - index * BATCH)
+
+
+def n_chunks(spec: SeedTable) -> int:
+    return -(-spec.rows // BATCH)
+
+
+# ── Worker side ──
+_worker_conn = None
+_seed_tables = SEED_TABLES   # sized for the run's scale factor
+
+
+def init_seed_worker(params: dict, scale_factor: float = 1.0):
+    global _worker_conn, _seed_tables
+    _worker_conn = snowflake.connector.connect(**params)
+    _seed_tables = {t.table: t for t in seed_plan(scale_factor)}
+
+
+def record_chunks(cur, table: str, chunks: list, as_of: date):
+    """Mark chunks [(index, rows)] of table as loaded (inside the load's transaction)."""
+    indexes = ", ".join(str(i) for i, _ in chunks)
+    cur.execute(f"DELETE FROM {SEED_MANIFEST} WHERE TABLE_NAME = %s AND CHUNK_INDEX IN ({indexes})", (table,))
+    cur.executemany(f"INSERT INTO {SEED_MANIFEST} (TABLE_NAME, CHUNK_INDEX, CHUNK_ROWS, AS_OF) VALUES (%s, %s, %s, %s)",
+                    [(table, i, rows, as_of.isoformat()) for i, rows in chunks])
+
+
+def delete_chunk(cur, table: str, index: int, rows: int):
+    """Delete the first rows rows of chunk index (a short chunk about to be reloaded whole)."""
+    column = SEED_TABLES[table].columns[0]
+    cur.execute(f"DELETE FROM {table} WHERE {column} IN ({seed_server.chunk_ids(table, rows, index * BATCH)})")
+
+
+def chunk_path(tmp_dir: str, table: str, index: int) -> str:
+    return os.path.join(tmp_dir, table.lower(), f"{table.lower()}_{index:05d}.csv.gz")
+
+
+def seed_chunk(table: str, index: int, skip: int, mode: str, tmp_dir: str, as_of: date) -> dict:
+    """Generate chunk index of table and INSERT it or stage it for COPY.
+    skip rows of a shorter version of the chunk are loaded already; they are
+    replaced by the full chunk (deleted in the loading transaction)."""
+    spec  = _seed_tables[table]
+    start = index * BATCH
+    n     = chunk_rows(spec, index)
+
+    t0   = time.perf_counter()
+    # the chunk's rows depend on (seed, table, index, as_of), not on which worker runs it
+    sizes = {t: s.rows for t, s in _seed_tables.items()}
+    rows = spec.source(n, start, seed_generator.chunk_rng(table, index), as_of, sizes)
+    timing = {"rows": len(rows), "generate": time.perf_counter() - t0, "upload": 0.0, "load": 0.0}
+    t0   = time.perf_counter()
+    if mode == "insert":
+        with transaction(_worker_conn) as cur:
+            if skip:
+                delete_chunk(cur, table, index, skip)
+            batch_insert(_worker_conn, table, spec.columns, rows, commit=False)
+            record_chunks(cur, table, [(index, n)], as_of)
+        timing["load"] = time.perf_counter() - t0
+        return timing
+
+    path = chunk_path(tmp_dir, table, index)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    bulk_load.write_csv_gz(path, rows)
+    timing["generate"] += time.perf_counter() - t0
+    t0 = time.perf_counter()
+    _worker_conn.cursor().execute(
+        f"PUT 'file://{path.replace(os.sep, '/')}' @{SEED_STAGE}/{table} "
+        f"AUTO_COMPRESS=FALSE SOURCE_COMPRESSION=GZIP OVERWRITE=TRUE")
+    timing["upload"] = time.perf_counter() - t0
+    return timing
+
+
+def read_chunk_files(paths: list[str]):
+    """Row chunks back from gzip CSV chunk files (the INSERT fallback)."""
+    for path in paths:
+        with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+            yield [tuple(None if v == bulk_load.NULL else v for v in row) for row in csv.reader(f)]
+
+
+def copy_table(table: str, pending: list, tmp_dir: str, as_of: date) -> dict:
+    """COPY INTO table from every chunk staged for it and record the chunks,
+    in one transaction (after deleting the rows of short chunks being
+    reloaded). Falls back to INSERTing the local chunk files, one transaction
+    per chunk, if COPY fails."""
+    spec   = _seed_tables[table]
+    chunks = [(i, chunk_rows(spec, i)) for i, _ in pending]
+    t0     = time.perf_counter()
+    try:
+        with transaction(_worker_conn) as cur:
+            for i, skip in pending:
+                if skip:
+                    delete_chunk(cur, table, i, skip)
+            cur.execute(f"""
+                COPY INTO {table} ({", ".join(spec.columns)})
+                FROM @{SEED_STAGE}/{table}
+                FILE_FORMAT = ({bulk_load.FILE_FORMAT})
+                ON_ERROR = ABORT_STATEMENT
+                PURGE = TRUE
+            """)
+            record_chunks(cur, table, chunks, as_of)
+        return {"load": time.perf_counter() - t0, "mode": "copy"}
+    except snowflake.connector.errors.Error as e:
+        print(f"  ⚠️  COPY into {table} failed ({e}) — falling back to INSERT")
+        paths = [chunk_path(tmp_dir, table, i) for i, _ in pending]
+        for (i, skip), chunk, rows in zip(pending, chunks, read_chunk_files(paths)):
+            with transaction(_worker_conn) as cur:
+                if skip:
+                    delete_chunk(cur, table, i, skip)
+                batch_insert(_worker_conn, table, spec.columns, rows, commit=False)
+                record_chunks(cur, table, [chunk], as_of)
+        return {"load": time.perf_counter() - t0, "mode": "insert"}
+
+
+def server_table(table: str, pending: list, as_of: date) -> dict:
+    """Generate the table's missing chunks [(index, skip)] in Snowflake, one
+    INSERT … SELECT per run of consecutive chunks (normally the whole table).
+    Rows depend only on their index, so a short chunk just gets its missing rows."""
+    spec  = _seed_tables[table]
+    sizes = {t: s.rows for t, s in _seed_tables.items()}
+    runs  = []
+    for index, skip in pending:
+        if runs and runs[-1][-1][0] == index - 1 and skip == 0:
+            runs[-1].append((index, skip))
+        else:
+            runs.append([(index, skip)])
+    t0, total = time.perf_counter(), 0
+    for chunks in runs:
+        start = chunks[0][0] * BATCH + chunks[0][1]
+        n     = sum(chunk_rows(spec, i) - skip for i, skip in chunks)
+        sql   = seed_server.STATEMENTS[table](n, start, as_of, sizes)
+        with transaction(_worker_conn) as tx:
+            tx.execute(sql)
+            record_chunks(tx, table, [(i, chunk_rows(spec, i)) for i, _ in chunks], as_of)
+        total += n
+    return {"rows": total, "load": time.perf_counter() - t0, "mode": "server"}
+
+
+# ── Parent side ──
+def seed_tasks(tables: list, pending: dict, mode: str, tmp_dir: str, as_of: dict) -> list:
+    """The task DAG for the missing chunks {table: [(index, skip)]}. A table
+    is complete when its :copy task (copy mode), its :server task (server
+    mode) or its :done barrier (insert mode) is done."""
+    tasks, complete = [], {}
+    todo = {t.table for t in tables}
+    for spec in tables:
+        deps    = [complete[parent] for parent in spec.depends if parent in todo]
+        missing = pending[spec.table]
+        if mode == "server":
+            rows = sum(chunk_rows(spec, i) - skip for i, skip in missing)
+            tasks.append(seed_scheduler.Task(f"{spec.table}:server", server_table,
+                                             (spec.table, missing, as_of[spec.table]), deps, cost=rows / 10))
+            complete[spec.table] = f"{spec.table}:server"
+            continue
+        rows   = sum(chunk_rows(spec, i) for i, _ in missing)   # short chunks are reloaded whole
+        chunks = [seed_scheduler.Task(f"{spec.table}#{i}", seed_chunk,
+                                      (spec.table, i, skip, mode, tmp_dir, as_of[spec.table]), deps,
+                                      cost=chunk_rows(spec, i))
+                  for i, skip in missing]
+        tasks += chunks
+        if mode == "copy":
+            tasks.append(seed_scheduler.Task(f"{spec.table}:copy", copy_table,
+                                             (spec.table, missing, tmp_dir, as_of[spec.table]),
+                                             [c.name for c in chunks], cost=rows / 10))
+            complete[spec.table] = f"{spec.table}:copy"
+        else:
+            tasks.append(seed_scheduler.Task(f"{spec.table}:done", None, deps=[c.name for c in chunks], cost=0.0))
+            complete[spec.table] = f"{spec.table}:done"
+    return tasks
+
+
+def table_timings(tables: list, results: dict, timings: dict) -> dict:
+    """Per table: summed chunk generate / upload / load seconds, and its
+    wall-clock span from first chunk start to completion."""
+    out = {}
+    for spec in tables:
+        names = [n for n in timings if n.split("#")[0].split(":")[0] == spec.table]
+        t = {"mode": "insert" if not any(n.endswith(":copy") for n in names) else "copy",
+             "rows": 0, "generate": 0.0, "upload": 0.0, "load": 0.0}
+        for n in names:
+            r = results[n] or {}   # :done barriers return None
+            t["rows"] += r.get("rows", 0)
+            for k in ("generate", "upload", "load"):
+                t[k] += r.get(k, 0.0)
+            t["mode"] = r.get("mode", t["mode"])
+        t["total"] = max(timings[n].end for n in names) - min(timings[n].start for n in names)
+        out[spec.table] = t
+    return out
+
+
+def print_timings(timings: dict, elapsed: float):
+    if not timings:
+        return
+    print(f"\n  {'table':<26}{'mode':<8}{'rows':>10}{'generate':>10}{'upload':>9}{'load':>9}{'span':>9}{'rows/s':>10}")
+    for table, t in timings.items():
+        print(f"  {table:<26}{t['mode']:<8}{t['rows']:>10,}{t['generate']:>9.1f}s{t['upload']:>8.1f}s"
+              f"{t['load']:>8.1f}s{t['total']:>8.1f}s{t['rows'] / max(t['total'], 1e-9):>10,.0f}")
+    rows = sum(t["rows"] for t in timings.values())
+    print(f"  {'total (wall clock)':<34}{rows:>10,}{'':>28}{elapsed:>8.1f}s{rows / max(elapsed, 1e-9):>10,.0f}")
+    print("  generate / upload / load are summed over chunks (worker seconds); span is wall clock")
+
+
+def print_critical_path(path: list, elapsed: float, busy: float, workers: int):
+    print(f"\n  Critical path ({len(path)} tasks, {elapsed:.1f}s wall clock, "
+          f"{busy / max(elapsed, 1e-9):.1f} of {workers} workers busy on average):")
+    # consecutive chunks of one table are folded into one line
+    groups = []
+    for step in path:
+        table = step.name.split("#")[0]
+        if groups and "#" in step.name and groups[-1][0] == table:
+            groups[-1][1].append(step)
+        else:
+            groups.append((table if "#" in step.name else step.name, [step]))
+    for label, steps in groups:
+        secs, queued = sum(s.secs for s in steps), sum(s.wait for s in steps)
+        what = f"{label} ×{len(steps)} chunks" if len(steps) > 1 else steps[0].name
+        print(f"    t={steps[0].start:>7.1f}s  {what:<40}{secs:>7.1f}s run{queued:>7.1f}s queued")
+
+
+def load_manifest(cur) -> dict:
+    """{table: {chunk index: (rows, as_of)}} from SEED_MANIFEST."""
+    cur.execute(SEED_MANIFEST_DDL)
+    cur.execute(f"SELECT TABLE_NAME, CHUNK_INDEX, CHUNK_ROWS, AS_OF FROM {SEED_MANIFEST}")
+    loaded = {}
+    for table, index, rows, as_of in cur.fetchall():
+        loaded.setdefault(table, {})[index] = (rows, as_of)
+    return loaded
+
+
+def pending_chunks(spec: SeedTable, loaded: dict) -> list:
+    """[(index, skip)] for chunks not loaded, or loaded short of their size."""
+    pending = []
+    for i in range(n_chunks(spec)):
+        have = loaded[i][0] if i in loaded else 0
+        if have < chunk_rows(spec, i):
+            pending.append((i, have))
+    return pending
+
+
+def seed_data(conn, mode: str = "copy", workers: int = SEED_WORKERS, scale_factor: float = 1.0):
+    print(f"\n[7/7] Seeding base data ({mode}, {workers} workers, scale factor {scale_factor:g})...")
     cur = conn.cursor()
-
-    # ── Customers ──
-    cur.execute("SELECT COUNT(*) FROM DIM_CUSTOMERS")
-    if cur.fetchone()[0] == 0:
-        print(f"  Seeding {N_CUSTOMERS:,} customers...")
-        segments = ["Young Professional", "Student", "Established", "High Net Worth"]
-        rows = []
-        for _ in range(N_CUSTOMERS):
-            cid = f"C{random.randint(10_000_000, 99_999_999)}"
-            rows.append((
-                cid,
-                fake.name(),
-                fake.unique.email(),
-                random.choice(segments),
-                fake.date_between(start_date="-5y", end_date="today"),
-                round(random.uniform(0, 1), 2),
-            ))
-            if len(rows) == BATCH:
-                batch_insert(conn, "DIM_CUSTOMERS",
-                    ["CUSTOMER_ID","FULL_NAME","EMAIL","SEGMENT","JOIN_DATE","RISK_PROFILE_SCORE"], rows)
-                rows = []
-        if rows:
-            batch_insert(conn, "DIM_CUSTOMERS",
-                ["CUSTOMER_ID","FULL_NAME","EMAIL","SEGMENT","JOIN_DATE","RISK_PROFILE_SCORE"], rows)
-        print("  ✅ Customers seeded")
-    else:
-        print("  ✅ Customers already exist — skipping")
-
-    # ── Accounts ──
-    cur.execute("SELECT COUNT(*) FROM DIM_ACCOUNTS")
-    if cur.fetchone()[0] == 0:
-        print(f"  Seeding {N_ACCOUNTS:,} accounts...")
-        cur.execute("SELECT CUSTOMER_ID FROM DIM_CUSTOMERS")
-        cids = [r[0] for r in cur.fetchall()]
-        products = ["CHK", "SAV", "MMA", "CC"]
-        rows = []
-        for _ in range(N_ACCOUNTS):
-            rows.append((
-                f"A{random.randint(10_000_000, 99_999_999)}",
-                random.choice(cids),
-                random.choice(products),
-                round(random.uniform(0, 50_000), 2),
-                "ACTIVE",
-                fake.date_between(start_date="-5y", end_date="today"),
-            ))
-            if len(rows) == BATCH:
-                batch_insert(conn, "DIM_ACCOUNTS",
-                    ["ACCOUNT_ID","CUSTOMER_ID","PRODUCT_CODE","AVAILABLE_BALANCE","ACCOUNT_STATUS","OPENED_DATE"], rows)
-                rows = []
-        if rows:
-            batch_insert(conn, "DIM_ACCOUNTS",
-                ["ACCOUNT_ID","CUSTOMER_ID","PRODUCT_CODE","AVAILABLE_BALANCE","ACCOUNT_STATUS","OPENED_DATE"], rows)
-        print("  ✅ Accounts seeded")
-    else:
-        print("  ✅ Accounts already exist — skipping")
-
-    # ── Transactions ──
-    cur.execute("SELECT COUNT(*) FROM FACT_TRANSACTION_LEDGER")
-    if cur.fetchone()[0] == 0:
-        print(f"  Seeding {N_TRANSACTIONS:,} transactions...")
-        cur.execute("SELECT ACCOUNT_ID FROM DIM_ACCOUNTS")
-        aids = [r[0] for r in cur.fetchall()]
-        tx_types = ["DEBIT_CARD_POS","ACH_CREDIT","ACH_DEBIT","WIRE_OUT","ATM_WITHDRAWAL","CHECK_DEPOSIT","FEE_OD","FEE_MONTHLY"]
-        channels = ["MOBILE_APP","WEB_BANKING","BRANCH","ATM","PHONE"]
-        rows = []
-        for _ in range(N_TRANSACTIONS):
-            tx = random.choice(tx_types)
-            amt = round(random.uniform(5, 500), 2)
-            if "WIRE" in tx: amt = round(random.uniform(1000, 20000), 2)
-            if "FEE"  in tx: amt = round(random.uniform(5, 35), 2)
-            rows.append((
-                f"TX{random.randint(100_000_000, 999_999_999)}",
-                random.choice(aids),
-                fake.date_time_between(start_date="-90d", end_date="now"),
-                tx, amt,
-                fake.company()[:100] if "DEBIT" in tx else None,
-                f"MCC{random.randint(1000,9999)}" if "DEBIT" in tx else None,
-                random.choice(channels),
-            ))
-            if len(rows) == BATCH:
-                batch_insert(conn, "FACT_TRANSACTION_LEDGER",
-                    ["TRANSACTION_REF","ACCOUNT_ID","POSTING_DATE","TRANSACTION_CODE","AMOUNT",
-                     "MERCHANT_DESCRIPTION","MERCHANT_CATEGORY_CODE","CHANNEL_ID"], rows)
-                rows = []
-                print(f"    {N_TRANSACTIONS - _:,} remaining...")
-        if rows:
-            batch_insert(conn, "FACT_TRANSACTION_LEDGER",
-                ["TRANSACTION_REF","ACCOUNT_ID","POSTING_DATE","TRANSACTION_CODE","AMOUNT",
-                 "MERCHANT_DESCRIPTION","MERCHANT_CATEGORY_CODE","CHANNEL_ID"], rows)
-        print("  ✅ Transactions seeded")
+    manifest = load_manifest(cur)
+    todo, pending, as_of = [], {}, {}
+    today = datetime.utcnow().date()
+    for spec in seed_plan(scale_factor):
+        loaded = manifest.get(spec.table, {})
+        if not loaded:
+            cur.execute(f"SELECT COUNT(*) FROM {spec.table}")
+            if cur.fetchone()[0] != 0:
+                print(f"  ✅ {spec.label.capitalize()} already exist (not in {SEED_MANIFEST}) — skipping")
+                continue
+        missing = pending_chunks(spec, loaded)
+        if not missing:
+            print(f"  ✅ {spec.label.capitalize()} complete ({len(loaded):,} chunks) — skipping")
+            continue
+        rows = sum(chunk_rows(spec, i) - skip for i, skip in missing)
+        if loaded:
+            print(f"  Resuming {spec.label}: {rows:,} rows in {len(missing):,} of {n_chunks(spec):,} chunks missing...")
+        else:
+            print(f"  Seeding {spec.rows:,} {spec.label}...")
+        todo.append(spec)
+        pending[spec.table] = missing
+        # resumed chunks use the date the table was first seeded with
+        as_of[spec.table] = min((a for _, a in loaded.values()), default=today)
+    if not todo:
+        return
+    if mode == "copy":
+        try:
+            # a named stage, not a temporary one: every worker session PUTs to it
+            cur.execute(f"CREATE STAGE IF NOT EXISTS {SEED_STAGE}")
+            # files left by an interrupted run are not in the manifest; COPY must not load them
+            cur.execute(f"REMOVE @{SEED_STAGE}")
+        except snowflake.connector.errors.Error as e:
+            print(f"  ⚠️  Could not create stage {SEED_STAGE} ({e}) — seeding with INSERT")
+            mode = "insert"
+
+    if mode == "server":
+        remaining = {spec.table: 1 for spec in todo}
     else:
-        print("  ✅ Transactions already exist — skipping")
-
-    # ── App Logs ──
-    cur.execute("SELECT COUNT(*) FROM APP_ACTIVITY_LOGS")
-    if cur.fetchone()[0] == 0:
-        print(f"  Seeding {N_LOGS:,} app logs...")
-        cur.execute("SELECT CUSTOMER_ID FROM DIM_CUSTOMERS SAMPLE(50000 ROWS)")
-        cids = [r[0] for r in cur.fetchall()]
-        events = ["LOGIN","VIEW_BALANCE","TRANSFER","ERROR","LOGOUT"]
-        oses   = ["iOS","Android","Web"]
-        rows = []
-        for _ in range(N_LOGS):
-            evt = random.choice(events)
-            rows.append((
-                f"LG{random.randint(10_000_000, 99_999_999)}",
-                random.choice(cids),
-                evt,
-                fake.date_time_between(start_date="-90d", end_date="now"),
-                random.choice(oses),
-                "/home",
-                "ERR_500" if evt == "ERROR" else None,
-            ))
-            if len(rows) == BATCH:
-                batch_insert(conn, "APP_ACTIVITY_LOGS",
-                    ["LOG_ID","CUSTOMER_ID","EVENT_TYPE","EVENT_TIMESTAMP","DEVICE_OS","PAGE_URL","ERROR_CODE"], rows)
-                rows = []
-        if rows:
-            batch_insert(conn, "APP_ACTIVITY_LOGS",
-                ["LOG_ID","CUSTOMER_ID","EVENT_TYPE","EVENT_TIMESTAMP","DEVICE_OS","PAGE_URL","ERROR_CODE"], rows)
-        print("  ✅ App logs seeded")
-    else:
-        print("  ✅ App logs already exist — skipping")
-
-    # ── Support Cases ──
-    cur.execute("SELECT COUNT(*) FROM SUPPORT_CASES")
-    if cur.fetchone()[0] == 0:
-        print(f"  Seeding {N_SUPPORT:,} support cases...")
-        cur.execute("SELECT CUSTOMER_ID FROM DIM_CUSTOMERS SAMPLE(20000 ROWS)")
-        cids = [r[0] for r in cur.fetchall()]
-        channels  = ["PHONE","EMAIL","CHAT"]
-        cats      = ["BILLING","TECHNICAL","FRAUD","GENERAL"]
-        rows = []
-        for _ in range(N_SUPPORT):
-            rows.append((
-                f"CS{random.randint(1_000_000, 9_999_999)}",
-                random.choice(cids),
-                fake.date_time_between(start_date="-90d", end_date="now"),
-                random.choice(channels),
-                random.choice(cats),
-                round(random.uniform(0, 1), 2),
-                "Customer contacted support regarding account issue.",
-            ))
-            if len(rows) == BATCH:
-                batch_insert(conn, "SUPPORT_CASES",
-                    ["CASE_ID","CUSTOMER_ID","OPEN_TIMESTAMP","CHANNEL","CATEGORY","SENTIMENT_SCORE","TRANSCRIPT_TEXT"], rows)
-                rows = []
-        if rows:
-            batch_insert(conn, "SUPPORT_CASES",
-                ["CASE_ID","CUSTOMER_ID","OPEN_TIMESTAMP","CHANNEL","CATEGORY","SENTIMENT_SCORE","TRANSCRIPT_TEXT"], rows)
-        print("  ✅ Support cases seeded")
-    else:
-        print("  ✅ Support cases already exist — skipping")
+        remaining = {spec.table: len(pending[spec.table]) + 1 for spec in todo}   # chunks + :copy / :done
+
+    def on_done(name, result, timing):
+        table = name.split("#")[0].split(":")[0]
+        remaining[table] -= 1
+        if remaining[table] == 0:
+            print(f"  ✅ {SEED_TABLES[table].label.capitalize()} seeded")
+
+    with tempfile.TemporaryDirectory(prefix="churn_seed_") as tmp:
+        tasks = seed_tasks(todo, pending, mode, tmp, as_of)
+        results, timings, started = seed_scheduler.run(
+            tasks, workers, init_seed_worker, (get_snowflake_connection_params(), scale_factor), on_done)
+    elapsed = max(t.end for t in timings.values()) - started
+    if mode == "copy":
+        cur.execute(f"DROP STAGE IF EXISTS {SEED_STAGE}")
+
+    print_timings(table_timings(todo, results, timings), elapsed)
+    busy = sum(t.end - t.start for t in timings.values())
+    print_critical_path(seed_scheduler.critical_path(tasks, timings, started), elapsed, busy, workers)
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 def main():
+    parser = argparse.ArgumentParser(description="Bootstrap CHURN_DEMO in Snowflake")
+    parser.add_argument("--deploy", choices=("incremental", "full"), default="full",
+                        help="full: DROP DATABASE and recreate everything; incremental: keep CHURN_DEMO and "
+                             "apply only objects whose DDL changed (refused if an existing table's columns "
+                             "differ, or it holds seed rows not in SEED_MANIFEST)")
+    parser.add_argument("--seed-mode", choices=SEED_MODES, default="copy",
+                        help="copy: staged gzip CSV + one COPY INTO per table; insert: batched INSERTs; "
+                             "server: generated inside Snowflake, one INSERT … SELECT FROM GENERATOR per table")
+    parser.add_argument("--seed-workers", type=int, default=SEED_WORKERS,
+                        help="Processes (each with its own Snowflake connection) generating and loading chunks")
+    parser.add_argument("--scale-factor", type=float, default=1.0,
+                        help="Multiply every seeded table's row count (1 = 100k customers … 500k transactions; "
+                             "10 and 100 for benchmarking)")
+    parser.add_argument("--seed-only", action="store_true",
+                        help="Keep the existing database and only load the seed chunks missing from SEED_MANIFEST "
+                             "(resumes an interrupted seed, or extends it)")
+    args = parser.parse_args()
+    if args.seed_workers < 1:
+        parser.error("--seed-workers must be >= 1")
+    if args.scale_factor <= 0:
+        parser.error("--scale-factor must be > 0")
+    try:
+        seed_plan(args.scale_factor)
+    except ValueError as e:
+        parser.error(str(e))
+
     print("=" * 60)
     print("🚀 CHURN INTELLIGENCE — SNOWFLAKE SETUP")
     print("=" * 60)
 
     params = get_snowflake_connection_params()
+    if args.seed_only:
+        conn = snowflake.connector.connect(**params)
+        seed_data(conn, args.seed_mode, args.seed_workers, args.scale_factor)
+        conn.close()
+        print("\n" + "=" * 60)
+        print("✅ SEED COMPLETE")
+        print("=" * 60)
+        return
+
+    full = args.deploy == "full"
     # Connect without database first (for DROP/CREATE)
     root_params = {k: v for k, v in params.items() if k not in ("database", "schema")}
     conn = snowflake.connector.connect(**root_params)
     cur  = conn.cursor()
 
-    create_database(cur)
+    create_database(cur, full)
 
     # Reconnect with database context
     conn.close()
     conn = snowflake.connector.connect(**params)
     cur  = conn.cursor()
 
-    create_raw_tables(cur)
-    create_dynamic_tables(cur)
-    create_stream(cur)
-    create_procedure(cur)
-    create_task(cur)
-    seed_data(conn)
+    deploy_schema(cur, full)
+    seed_data(conn, args.seed_mode, args.seed_workers, args.scale_factor)
 
     conn.close()
     print("\n" + "=" * 60)
@@ -0,0 +1,106 @@
+"""
+streaming/batching.py — Adaptive micro-batch sizing for the consumer.
+
+Instead of a fixed message count / interval, the controller keeps EWMAs of
+  • arrival rate   — rows/s parsed off Kafka
+  • flush latency  — seconds a writer spends on the Snowflake write + commit
+                     (queue wait and retry backoff excluded: they grow when
+                     writers fall behind, and answering that with smaller
+                     batches would only add commits to the backlog)
+and targets an end-to-end freshness budget: the oldest row in a batch waits
+at most max_wait in the buffer and then ~flush latency to land, so
+
+    max_wait   = headroom · freshness − flush_latency
+    batch_rows = arrival_rate · max_wait          (clamped to [min, max])
+
+Under a burst the batch grows to keep commits few and large; at low traffic
+max_wait caps how long a lone row sits in the buffer. Once flush latency
+alone uses up the budget (latency ≥ headroom · freshness) the target is out
+of reach: max_wait drops to its floor but batch_rows is held or grown, never
+shrunk, since smaller commits would make the writes slower still. An optional max_bytes
+flushes early when wide rows fill the buffer before the row target is reached.
+"""
+
+import threading
+import time
+
+ALPHA         = 0.3    # EWMA weight of the newest sample
+RATE_WINDOW   = 1.0    # seconds of arrivals folded into one rate sample
+HEADROOM      = 0.8    # fraction of the freshness budget the controller plans to use
+MIN_WAIT_SECS = 0.2
+
+
+def _ewma(prev, sample: float) -> float:
+    return sample if prev is None else prev + ALPHA * (sample - prev)
+
+
+class AdaptiveBatchController:
+    def __init__(self, freshness_secs: float, min_rows: int, max_rows: int, max_bytes: int = None):
+        if min_rows < 1 or max_rows < min_rows:
+            raise ValueError(f"Invalid batch bounds: min={min_rows} max={max_rows}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"Invalid batch byte bound: max_bytes={max_bytes}")
+        self.freshness_secs = freshness_secs
+        self.min_rows       = min_rows
+        self.max_rows       = max_rows
+        self.max_bytes      = max_bytes
+
+        self.arrival_rate   = None   # rows/s (EWMA)
+        self.flush_latency  = None   # seconds (EWMA)
+        self.batch_rows     = min_rows
+        self.max_wait       = max(MIN_WAIT_SECS, HEADROOM * freshness_secs)
+        self.flushes        = 0
+
+        self._lock          = threading.Lock()
+        self._window_start  = time.time()
+        self._window_rows   = 0
+
+    # ── Observations ──────────────────────────────────────────────────────────
+    def observe_arrivals(self, n: int, now: float = None):
+        """Record n rows read off Kafka. Called from the poll thread."""
+        now = time.time() if now is None else now
+        self._window_rows += n
+        elapsed = now - self._window_start
+        if elapsed >= RATE_WINDOW:
+            with self._lock:
+                self.arrival_rate = _ewma(self.arrival_rate, self._window_rows / elapsed)
+                self._resize()
+            self._window_start = now
+            self._window_rows  = 0
+
+    def observe_flush(self, rows: int, secs: float):
+        """Record a completed flush. Called from writer threads."""
+        with self._lock:
+            self.flush_latency = _ewma(self.flush_latency, secs)
+            self.flushes += 1
+            self._resize()
+
+    # ── Decisions ─────────────────────────────────────────────────────────────
+    def should_flush(self, buffered: int, age_secs: float, nbytes: int = 0) -> bool:
+        if buffered >= self.batch_rows:
+            return True
+        if self.max_bytes is not None and nbytes >= self.max_bytes:
+            return True
+        return buffered > 0 and age_secs >= self.max_wait
+
+    def _resize(self):
+        latency = self.flush_latency or 0.0
+        budget  = HEADROOM * self.freshness_secs
+        self.max_wait = max(MIN_WAIT_SECS, budget - latency)
+        if self.arrival_rate is not None:
+            target = min(self.max_rows, max(self.min_rows, int(self.arrival_rate * self.max_wait)))
+            if latency >= budget:
+                target = max(target, self.batch_rows)   # freshness out of reach: hold or grow
+            self.batch_rows = target
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "batch_rows":         self.batch_rows,
+                "max_wait_secs":      round(self.max_wait, 3),
+                "arrival_rate":       round(self.arrival_rate or 0.0, 1),
+                "flush_latency_secs": round(self.flush_latency or 0.0, 3),
+                "freshness_secs":     self.freshness_secs,
+                "max_bytes":          self.max_bytes or 0,
+                "flushes":            self.flushes,
+            }
@@ -0,0 +1,105 @@
+"""
+streaming/bulk_load.py — Stage-and-COPY loader for consumer micro-batches.
+
+Instead of one large executemany INSERT per table, each buffer is written to a
+gzip-compressed CSV file, PUT to a session-scoped internal stage, and loaded
+with a single COPY INTO. Snowflake compiles one small COPY statement per table
+regardless of batch size, so warehouse compile time stays flat as batches grow.
+
+Gzip CSV is used rather than Parquet so the loader needs nothing beyond the
+standard library.
+
+merge_rows() loads the same way into a session-scoped scratch table and then
+MERGEs on the table's business key (its first column), inserting only keys the
+target does not already hold. It is the replay-safe mode for keys that have
+aged out of the consumer's in-memory dedup index.
+"""
+
+import csv
+import gzip
+import io
+import os
+import tempfile
+import uuid
+
+STAGE   = "CONSUMER_INGEST_STAGE"
+NULL    = "\\N"   # matches NULL_IF below; keeps NULL distinct from ''
+
+FILE_FORMAT = (
+    "TYPE = CSV "
+    "COMPRESSION = GZIP "
+    "FIELD_OPTIONALLY_ENCLOSED_BY = '\"' "
+    "ESCAPE_UNENCLOSED_FIELD = NONE "
+    "EMPTY_FIELD_AS_NULL = FALSE "
+    "NULL_IF = ('\\\\N')"
+)
+
+
+def prepare(conn):
+    """Create the temporary ingest stage for this connection's session."""
+    conn.cursor().execute(f"CREATE TEMPORARY STAGE IF NOT EXISTS {STAGE}")
+
+
+def write_csv_gz(path: str, rows) -> int:
+    """Write rows to a gzip CSV file at path. Returns the number of rows written.
+    The gzip header's mtime is fixed, so the same rows always give the same bytes."""
+    n = 0
+    with io.TextIOWrapper(gzip.GzipFile(path, "wb", compresslevel=1, mtime=0),
+                          encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        for row in rows:
+            writer.writerow([NULL if v is None else v for v in row])
+            n += 1
+    return n
+
+
+def copy_rows(conn, table: str, columns: list[str], rows) -> int:
+    """PUT rows to the ingest stage as one file and COPY them into table."""
+    cur   = conn.cursor()
+    fname = f"{table.lower()}_{uuid.uuid4().hex}.csv.gz"
+    with tempfile.TemporaryDirectory(prefix="churn_ingest_") as tmp:
+        path = os.path.join(tmp, fname)
+        n = write_csv_gz(path, rows)
+        if n == 0:
+            return 0
+        put_path = path.replace("\\", "/")
+        cur.execute(
+            f"PUT 'file://{put_path}' @{STAGE}/{table} "
+            f"AUTO_COMPRESS=FALSE SOURCE_COMPRESSION=GZIP OVERWRITE=TRUE"
+        )
+    cur.execute(f"""
+        COPY INTO {table} ({", ".join(columns)})
+        FROM @{STAGE}/{table}
+        FILES = ('{fname}')
+        FILE_FORMAT = ({FILE_FORMAT})
+        ON_ERROR = ABORT_STATEMENT
+        PURGE = TRUE
+    """)
+    return n
+
+
+def merge_rows(conn, table: str, columns: list[str], rows) -> int:
+    """COPY rows into a scratch table, then MERGE new keys into table.
+
+    The first column is the business key. Returns the number of rows offered
+    (not the number actually inserted), matching the other flush writers.
+    """
+    cur     = conn.cursor()
+    key     = columns[0]
+    scratch = f"{table}__MERGE"
+    cur.execute(f"CREATE TEMPORARY TABLE IF NOT EXISTS {scratch} LIKE {table}")
+    cur.execute(f"TRUNCATE TABLE {scratch}")
+    n = copy_rows(conn, scratch, columns, rows)
+    if n == 0:
+        return 0
+    cur.execute(f"""
+        MERGE INTO {table} t
+        USING (
+            SELECT {", ".join(columns)} FROM {scratch}
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY {key}) = 1
+        ) s
+        ON t.{key} = s.{key}
+        WHEN NOT MATCHED THEN INSERT ({", ".join(columns)})
+            VALUES ({", ".join(f"s.{c}" for c in columns)})
+    """)
+    return n
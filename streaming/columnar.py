@@ -0,0 +1,216 @@
+"""
+streaming/columnar.py — Compact, byte-accounted row buffers for the consumer.
+
+A list of row tuples costs a tuple plus one boxed object per field, so a
+batch of 50k TXN rows holds ~400k small objects and its footprint depends on
+message contents the consumer cannot see coming. ColumnarBuffer keeps one
+append-only typed column per field instead:
+
+  str   — UTF-8 bytes concatenated into one bytearray plus an int64 end-offset
+          array (free-form values: ids, timestamps, names, descriptions)
+  cat   — low-cardinality strings interned to uint32 codes in a per-buffer
+          dictionary (transaction codes, channels, OS, segments, …)
+  float — array('d')
+
+Every column carries a one-byte-per-row null mask so None round-trips. The
+buffer tracks its own size in bytes, so the consumer can flush on bytes as
+well as on rows.
+
+A full buffer is handed to the writer thread as-is — nothing is copied into a
+new list. Iterating it rebuilds one row tuple at a time, which is how
+bulk_load streams rows into its CSV file.
+"""
+
+from array import array
+from itertools import accumulate
+
+KINDS = ("str", "cat", "float")
+
+
+class _StrColumn:
+    def __init__(self):
+        self.data    = bytearray()
+        self.ends    = array("q")
+        self.nulls   = bytearray()
+
+    def pack(self, value):
+        return None if value is None else (value if isinstance(value, str) else str(value)).encode("utf-8")
+
+    def append(self, packed):
+        if packed is None:
+            self.nulls.append(1)
+        else:
+            self.nulls.append(0)
+            self.data += packed
+        self.ends.append(len(self.data))
+
+    def extend(self, packed: list):
+        self.nulls += bytes(v is None for v in packed)
+        chunks = [b"" if v is None else v for v in packed]
+        base = len(self.data)
+        self.ends.extend(base + end for end in accumulate(len(c) for c in chunks))
+        self.data += b"".join(chunks)
+
+    def get(self, i: int):
+        if self.nulls[i]:
+            return None
+        start = self.ends[i - 1] if i else 0
+        return self.data[start:self.ends[i]].decode("utf-8")
+
+    def nbytes(self) -> int:
+        return len(self.data) + len(self.ends) * self.ends.itemsize + len(self.nulls)
+
+
+class _CatColumn:
+    def __init__(self):
+        self.codes   = array("I")
+        self.nulls   = bytearray()
+        self.lookup  = {}     # value → code
+        self.values  = []     # code → value
+        self.dict_bytes = 0
+
+    def pack(self, value):
+        return None if value is None else (value if isinstance(value, str) else str(value))
+
+    def append(self, packed):
+        if packed is None:
+            self.nulls.append(1)
+            self.codes.append(0)
+            return
+        code = self.lookup.get(packed)
+        if code is None:
+            code = self.lookup[packed] = len(self.values)
+            self.values.append(packed)
+            self.dict_bytes += len(packed)
+        self.nulls.append(0)
+        self.codes.append(code)
+
+    def extend(self, packed: list):
+        lookup, values = self.lookup, self.values
+        codes = []
+        for v in packed:
+            if v is None:
+                codes.append(0)
+                continue
+            code = lookup.get(v)
+            if code is None:
+                code = lookup[v] = len(values)
+                values.append(v)
+                self.dict_bytes += len(v)
+            codes.append(code)
+        self.nulls += bytes(v is None for v in packed)
+        self.codes.extend(codes)
+
+    def get(self, i: int):
+        return None if self.nulls[i] else self.values[self.codes[i]]
+
+    def nbytes(self) -> int:
+        # dictionary entries are counted once each, one byte per character
+        return len(self.codes) * self.codes.itemsize + len(self.nulls) + self.dict_bytes
+
+
+class _FloatColumn:
+    def __init__(self):
+        self.data    = array("d")
+        self.nulls   = bytearray()
+
+    def pack(self, value):
+        return None if value is None else float(value)
+
+    def append(self, packed):
+        self.nulls.append(packed is None)
+        self.data.append(0.0 if packed is None else packed)
+
+    def extend(self, packed: list):
+        self.nulls += bytes(v is None for v in packed)
+        self.data.extend(0.0 if v is None else v for v in packed)
+
+    def get(self, i: int):
+        return None if self.nulls[i] else self.data[i]
+
+    def nbytes(self) -> int:
+        return len(self.data) * self.data.itemsize + len(self.nulls)
+
+
+_COLUMN_TYPES = {"str": _StrColumn, "cat": _CatColumn, "float": _FloatColumn}
+
+
+class ColumnarBuffer:
+    """Append-only rows stored column by column. Iterates as row tuples."""
+
+    def __init__(self, kinds: tuple):
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            raise ValueError(f"Unknown column kind(s) {sorted(unknown)} — expected {KINDS}")
+        self.kinds   = tuple(kinds)
+        self.columns = [_COLUMN_TYPES[k]() for k in self.kinds]
+        self._len    = 0
+
+    def append(self, row):
+        """Append one row. Raises ValueError / TypeError, leaving the buffer
+        unchanged, if the row does not fit the column kinds."""
+        if len(row) != len(self.columns):
+            raise ValueError(f"Row has {len(row)} fields, buffer has {len(self.columns)} columns")
+        packed = [col.pack(v) for col, v in zip(self.columns, row)]
+        for col, v in zip(self.columns, packed):
+            col.append(v)
+        self._len += 1
+
+    def extend(self, rows) -> list:
+        """Append rows, returning [(row, error)] for any that did not fit.
+
+        Rows are packed a column at a time; if anything does not fit, the
+        whole call falls back to row by row so only the bad rows are rejected.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        if not rows:
+            return []
+        width = len(self.columns)
+        try:
+            if any(len(row) != width for row in rows):
+                raise ValueError("ragged rows")
+            packed = [[pack(v) for v in values]
+                      for pack, values in zip((col.pack for col in self.columns), zip(*rows))]
+        except (ValueError, TypeError):
+            packed = None
+        if packed is not None:
+            for col, values in zip(self.columns, packed):
+                col.extend(values)
+            self._len += len(rows)
+            return []
+
+        rejected = []
+        for row in rows:
+            try:
+                self.append(row)
+            except (ValueError, TypeError) as e:
+                rejected.append((row, e))
+        return rejected
+
+    def row(self, i: int) -> tuple:
+        return tuple(col.get(i) for col in self.columns)
+
+    def nbytes(self) -> int:
+        return sum(col.nbytes() for col in self.columns)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __iter__(self):
+        getters = [col.get for col in self.columns]
+        for i in range(self._len):
+            yield tuple(get(i) for get in getters)
+
+    def __getitem__(self, index):
+        """Rows by index or slice; slices come back as lists of tuples (the
+        retry path bisects failed buffers this way)."""
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("ColumnarBuffer index out of range")
+        return self.row(index)
@@ -6,7 +6,40 @@ Routing:
   LOG  → APP_ACTIVITY_LOGS
   USER → DIM_CUSTOMERS
 
-Micro-batching: flush every FLUSH_SIZE messages OR every FLUSH_SECS seconds.
+Topics (CONSUMER_TOPICS): comma-separated, default the multiplexed
+bank_transactions topic. With the producer's --topic-mode per-type, each
+event type has its own topic (bank_transactions.txn / .log / .user), so a
+consumer group (CONSUMER_GROUP) can be deployed per topic and scaled alone.
+
+Micro-batching: each table fills its own batch, sized by its own
+AdaptiveBatchController (streaming/batching.py) from the observed arrival rate
+and flush latency so rows land within CONSUMER_FRESHNESS_SECS, bounded by
+CONSUMER_BATCH_MIN / CONSUMER_BATCH_MAX, and flushed early once it holds
+CONSUMER_BATCH_MAX_BYTES. Any of these can be overridden per table, e.g.
+CONSUMER_TXN_BATCH_MAX or CONSUMER_USER_FRESHNESS_SECS. Batches are columnar
+(streaming/columnar.py): typed columns with interned low-cardinality strings,
+so a batch's memory is compact and known in bytes. Rows that do not fit their
+table's column types are dead-lettered as they are buffered.
+Flush mode (CONSUMER_FLUSH_MODE):
+  insert — executemany INSERT per table (default)
+  copy   — gzip CSV → PUT to internal stage → one COPY INTO per table
+  merge  — COPY into a scratch table, then MERGE only keys not yet in the target
+Dedup (CONSUMER_DEDUP): replayed TRANSACTION_REF / LOG_ID / CUSTOMER_ID keys
+already seen recently are dropped before buffering (streaming/dedup.py).
+Failures: transient Snowflake errors are retried with backoff; poison rows are
+isolated by bisection and dead-lettered to CONSUMER_DLQ_DIR instead of killing
+the process (streaming/deadletter.py, which also replays the spool).
+Metrics: per-stage timers, per-table row counters, buffer/queue depth and
+per-partition lag in Prometheus format at :CONSUMER_METRICS_PORT/metrics.
+Wire format: each message is decoded according to its content-type /
+schema-version headers (streaming/wire.py), so JSON and msgpack producers can
+share a topic; messages without headers are JSON.
+Decoding JSON (CONSUMER_DECODER):
+  fast — typed msgspec schemas decode a whole poll() straight into row tuples
+  json — json.loads + parse() (also the per-message fallback for the fast path)
+Pipelining: the poll loop never waits on Snowflake. Full buffers go onto a
+bounded queue (CONSUMER_QUEUE_DEPTH) drained by CONSUMER_WRITERS background
+threads; offsets are committed only after their batch is written.
 Retry loop: waits for Kafka to be ready before starting.
 """
 
@@ -16,31 +49,96 @@ import json
 import time
 
 import snowflake.connector
-from kafka import KafkaConsumer
-from kafka.errors import NoBrokersAvailable
+from kafka import KafkaConsumer, ConsumerRebalanceListener
+from kafka.errors import NoBrokersAvailable, CommitFailedError
+from kafka.structs import OffsetAndMetadata
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from src.core.config import get_snowflake_connection_params
+from streaming import bulk_load
+from streaming.pipeline import Batch, OffsetTracker, WriterPool
+from streaming.batching import AdaptiveBatchController
+from streaming.columnar import ColumnarBuffer
+from streaming import decode
+from streaming import wire
+from streaming.dedup import RecentKeyIndex
+from streaming import metrics
+from streaming.deadletter import DeadLetterSpool, RetryingSink, DLQ_DIR
 
 TOPIC       = "bank_transactions"
-FLUSH_SIZE  = 500    # flush after this many messages
-FLUSH_SECS  = 5      # or after this many seconds
+TOPICS      = [t.strip() for t in os.getenv("CONSUMER_TOPICS", TOPIC).split(",") if t.strip()]
+GROUP_ID    = os.getenv("CONSUMER_GROUP", "churn_consumer_group")
+FRESHNESS_SECS = float(os.getenv("CONSUMER_FRESHNESS_SECS", "10"))  # end-to-end target
+BATCH_MIN      = int(os.getenv("CONSUMER_BATCH_MIN", "100"))
+BATCH_MAX      = int(os.getenv("CONSUMER_BATCH_MAX", "50000"))
+BATCH_MAX_BYTES = int(os.getenv("CONSUMER_BATCH_MAX_BYTES", str(64 * 1024 * 1024)))   # per table batch
+FLUSH_MODE  = os.getenv("CONSUMER_FLUSH_MODE", "insert")   # insert | copy | merge
+DEDUP       = os.getenv("CONSUMER_DEDUP", "1") == "1"
+DEDUP_KEYS  = int(os.getenv("CONSUMER_DEDUP_CAPACITY", "2000000"))   # recent keys kept per table
+N_WRITERS   = int(os.getenv("CONSUMER_WRITERS", "1"))      # background Snowflake writers
+QUEUE_DEPTH = int(os.getenv("CONSUMER_QUEUE_DEPTH", "4"))  # batches buffered before backpressure
+MAX_RETRIES = int(os.getenv("CONSUMER_MAX_RETRIES", "5"))  # transient write errors, per table buffer
+RETRY_BASE_SECS = float(os.getenv("CONSUMER_RETRY_BASE_SECS", "0.5"))
+RETRY_MAX_SECS  = float(os.getenv("CONSUMER_RETRY_MAX_SECS", "30"))
+DECODER     = os.getenv("CONSUMER_DECODER", "fast" if decode.AVAILABLE else "json")   # fast | json
+POLL_MS     = 1000
+POLL_MAX_RECORDS = 2000
+STATS_SECS  = 60     # how often batch controller decisions are logged
+LAG_SECS    = 5      # how often per-partition lag is refreshed
+METRICS_PORT = int(os.getenv("CONSUMER_METRICS_PORT", "9108"))   # 0 disables the endpoint
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+REGISTRY      = metrics.REGISTRY
+POLL_SECONDS  = REGISTRY.histogram("consumer_poll_seconds", "Time blocked in KafkaConsumer.poll()")
+DECODE_SECONDS = REGISTRY.histogram("consumer_decode_seconds", "Time decoding one poll() result into rows",
+                                    labels=("decoder",))
+DEDUP_SECONDS = REGISTRY.histogram("consumer_dedup_seconds", "Time filtering one poll() result through dedup")
+MESSAGES      = REGISTRY.counter("consumer_messages_total", "Kafka messages consumed")
+PARSE_ERRORS  = REGISTRY.counter("consumer_parse_errors_total", "Messages that could not be decoded")
+FLUSH_SECONDS = REGISTRY.histogram("consumer_flush_seconds", "Snowflake write time per table per batch",
+                                   labels=("table",))
+BATCH_SECONDS = REGISTRY.histogram("consumer_batch_latency_seconds", "Batch submit → commit, incl. queue wait",
+                                   labels=("table",))
+ROWS          = REGISTRY.counter("consumer_rows_total", "Rows written to Snowflake", labels=("table",))
+BUFFER_ROWS   = REGISTRY.gauge("consumer_buffer_rows", "Rows in the batch currently being filled",
+                               labels=("table",))
+BUFFER_BYTES  = REGISTRY.gauge("consumer_buffer_bytes", "Bytes held by the batch currently being filled",
+                               labels=("table",))
+QUEUE_BATCHES = REGISTRY.gauge("consumer_queue_batches", "Batches waiting for a writer thread")
+IN_FLIGHT     = REGISTRY.gauge("consumer_inflight_batches", "Batches submitted but not yet committed")
+LAG           = REGISTRY.gauge("consumer_lag_messages", "High watermark minus committed offset",
+                               labels=("topic", "partition"))
+
+
+class RebalanceHandler(ConsumerRebalanceListener):
+    """Writes and commits everything buffered before partitions are taken away."""
+
+    def __init__(self):
+        self.on_revoke = None   # (revoked partitions) → None
+
+    def on_partitions_revoked(self, revoked):
+        if self.on_revoke is not None and revoked:
+            self.on_revoke(revoked)
+
+    def on_partitions_assigned(self, assigned):
+        pass
 
 
 # ── Kafka connection ──────────────────────────────────────────────────────────
-def connect_kafka(max_attempts: int = 30) -> KafkaConsumer:
+def connect_kafka(listener: ConsumerRebalanceListener = None, max_attempts: int = 30) -> KafkaConsumer:
     broker = os.getenv("KAFKA_BROKER", "localhost:9092")
     for attempt in range(1, max_attempts + 1):
         try:
             print(f"[consumer] Connecting to Kafka at {broker} (attempt {attempt}/{max_attempts})...")
             consumer = KafkaConsumer(
-                TOPIC,
                 bootstrap_servers=[broker],
                 auto_offset_reset="latest",
-                group_id="churn_consumer_group",
-                value_deserializer=lambda b: json.loads(b.decode("utf-8")),
-                consumer_timeout_ms=5000,   # don't block forever on empty topic
+                group_id=GROUP_ID,
+                # values stay raw bytes — decode_messages() decodes a whole poll at once
+                enable_auto_commit=False,   # offsets committed after Snowflake write
             )
+            consumer.subscribe(TOPICS, listener=listener)
             print("[consumer] ✅ Connected to Kafka")
             return consumer
         except (NoBrokersAvailable, Exception) as e:
@@ -50,38 +148,77 @@ def connect_kafka(max_attempts: int = 30) -> KafkaConsumer:
 
 
 # ── Snowflake flush ───────────────────────────────────────────────────────────
-def flush(conn, txn_buf: list, log_buf: list, user_buf: list) -> int:
-    cur = conn.cursor()
-    count = 0
-
-    if txn_buf:
-        cur.executemany("""
-            INSERT INTO FACT_TRANSACTION_LEDGER
-                (TRANSACTION_REF, ACCOUNT_ID, POSTING_DATE, TRANSACTION_CODE,
-                 AMOUNT, MERCHANT_DESCRIPTION, MERCHANT_CATEGORY_CODE, CHANNEL_ID)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """, txn_buf)
-        count += len(txn_buf)
-
-    if log_buf:
-        cur.executemany("""
-            INSERT INTO APP_ACTIVITY_LOGS
-                (LOG_ID, CUSTOMER_ID, EVENT_TYPE, EVENT_TIMESTAMP,
-                 DEVICE_OS, PAGE_URL, ERROR_CODE)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """, log_buf)
-        count += len(log_buf)
-
-    if user_buf:
-        cur.executemany("""
-            INSERT INTO DIM_CUSTOMERS
-                (CUSTOMER_ID, FULL_NAME, EMAIL, SEGMENT, JOIN_DATE, RISK_PROFILE_SCORE)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, user_buf)
-        count += len(user_buf)
-
-    conn.commit()
-    return count
+TXN_TABLE   = "FACT_TRANSACTION_LEDGER"
+TXN_COLUMNS = ["TRANSACTION_REF", "ACCOUNT_ID", "POSTING_DATE", "TRANSACTION_CODE",
+               "AMOUNT", "MERCHANT_DESCRIPTION", "MERCHANT_CATEGORY_CODE", "CHANNEL_ID"]
+LOG_TABLE   = "APP_ACTIVITY_LOGS"
+LOG_COLUMNS = ["LOG_ID", "CUSTOMER_ID", "EVENT_TYPE", "EVENT_TIMESTAMP",
+               "DEVICE_OS", "PAGE_URL", "ERROR_CODE"]
+USER_TABLE   = "DIM_CUSTOMERS"
+USER_COLUMNS = ["CUSTOMER_ID", "FULL_NAME", "EMAIL", "SEGMENT", "JOIN_DATE", "RISK_PROFILE_SCORE"]
+
+# Column storage in a batch buffer (streaming/columnar.py): cat = interned low-cardinality string
+COLUMN_KINDS = {
+    TXN_TABLE:  ("str", "str", "str", "cat", "float", "str", "cat", "cat"),
+    LOG_TABLE:  ("str", "str", "cat", "str", "cat", "cat", "cat"),
+    USER_TABLE: ("str", "str", "str", "cat", "cat", "float"),
+}
+
+# event_type → (table, columns)
+TABLES = {
+    "TXN":  (TXN_TABLE, TXN_COLUMNS),
+    "LOG":  (LOG_TABLE, LOG_COLUMNS),
+    "USER": (USER_TABLE, USER_COLUMNS),
+}
+COLUMNS = {table: columns for table, columns in TABLES.values()}
+
+
+def insert_rows(conn, table: str, columns: list[str], rows) -> int:
+    """Load rows with a single executemany INSERT (the default path)."""
+    if not isinstance(rows, list):
+        rows = list(rows)   # ColumnarBuffer → parameter rows
+    placeholders = ", ".join(["%s"] * len(columns))
+    conn.cursor().executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+    )
+    return len(rows)
+
+
+FLUSH_WRITERS = {
+    "insert": insert_rows,
+    "copy":   bulk_load.copy_rows,
+    "merge":  bulk_load.merge_rows,
+}
+
+
+def write_table(conn, table: str, columns: list[str], rows, mode: str = FLUSH_MODE) -> int:
+    start = time.perf_counter()
+    n = FLUSH_WRITERS[mode](conn, table, columns, rows)
+    FLUSH_SECONDS.observe(time.perf_counter() - start, table)
+    ROWS.inc(n, table)
+    return n
+
+
+def write_batch(sink: RetryingSink, batch: Batch) -> int:
+    """Write a table batch through the sink; failed rows are dead-lettered, never raised."""
+    if not batch.rows:
+        return 0   # offsets-only marker
+    sink.write_secs = 0.0
+    n = sink.write(batch.table, COLUMNS[batch.table], batch.rows)
+    batch.write_secs = sink.write_secs
+    return n
+
+
+def commit_offsets(consumer: KafkaConsumer, offsets: dict):
+    if not offsets:
+        return
+    # OffsetAndMetadata gained a leader_epoch field in kafka-python 2.1; -1 = unknown
+    extra = [-1] * (len(OffsetAndMetadata._fields) - 2)
+    try:
+        consumer.commit({tp: OffsetAndMetadata(off, "", *extra) for tp, off in offsets.items()})
+    except CommitFailedError as e:
+        # Group rebalanced underneath us — the new owner replays from the last commit
+        print(f"[consumer] ⚠️  Offset commit failed: {e}")
 
 
 # ── Message parsing ───────────────────────────────────────────────────────────
@@ -121,45 +258,254 @@ def parse(msg: dict, txn_buf, log_buf, user_buf):
         ))
 
 
+def parse_error(raw: bytes, e: Exception):
+    PARSE_ERRORS.inc()
+    print(f"[consumer] ⚠️  Parse error: {e}")
+
+
+def decode_messages(values: list, txn_buf, log_buf, user_buf, decoder: str = DECODER):
+    """Decode raw JSON Kafka message values into the row buffers."""
+    def slow(raw: bytes):
+        try:
+            parse(json.loads(raw), txn_buf, log_buf, user_buf)
+        except Exception as e:
+            parse_error(raw, e)
+
+    if decoder == "fast":
+        decode.decode_batch(values, txn_buf, log_buf, user_buf, fallback=slow)
+    else:
+        for raw in values:
+            slow(raw)
+
+
+def decode_records(messages: list, txn_buf, log_buf, user_buf, decoder: str = DECODER):
+    """Decode one partition's poll() result, routing each message by its wire-format headers."""
+    for (fmt, version), values in wire.group_by_format(messages).items():
+        if fmt == "json":
+            decode_messages(values, txn_buf, log_buf, user_buf, decoder)
+        elif fmt == "msgpack":
+            wire.decode_msgpack(values, version, txn_buf, log_buf, user_buf, on_error=parse_error)
+        else:
+            for raw in values:
+                parse_error(raw, ValueError(f"unknown content-type '{fmt}'"))
+
+
+def flush_policy(event_type: str) -> AdaptiveBatchController:
+    """Batch controller for one table. CONSUMER_<TYPE>_FRESHNESS_SECS,
+    _BATCH_MIN, _BATCH_MAX and _BATCH_MAX_BYTES override the global policy."""
+    prefix = f"CONSUMER_{event_type}_"
+    return AdaptiveBatchController(
+        float(os.getenv(prefix + "FRESHNESS_SECS", FRESHNESS_SECS)),
+        int(os.getenv(prefix + "BATCH_MIN", BATCH_MIN)),
+        int(os.getenv(prefix + "BATCH_MAX", BATCH_MAX)),
+        int(os.getenv(prefix + "BATCH_MAX_BYTES", BATCH_MAX_BYTES)),
+    )
+
+
+def new_batch(e_type: str) -> Batch:
+    table = TABLES[e_type][0]
+    return Batch(table, ColumnarBuffer(COLUMN_KINDS[table]))
+
+
+def register_snapshot_metrics(batching: dict, dedup: dict = None):
+    """Expose batch-controller and dedup snapshots, evaluated at scrape time."""
+    REGISTRY.callback_gauge(
+        "consumer_batch_controller", "Adaptive batch controller state per table",
+        lambda: {(TABLES[e_type][0], k): v for e_type, ctl in batching.items() for k, v in ctl.snapshot().items()},
+        labels=("table", "field"))
+    if dedup is not None:
+        REGISTRY.callback_gauge(
+            "consumer_dedup", "Recent-key dedup index state per table",
+            lambda: {(name, k): v for name, idx in dedup.items() for k, v in idx.stats().items()},
+            labels=("index", "field"))
+
+
+def update_lag(consumer: KafkaConsumer, committed: dict):
+    """Refresh per-partition lag from locally cached high watermarks (no broker round trip)."""
+    LAG.clear()   # drop partitions that were revoked
+    for tp in consumer.assignment():
+        highwater = consumer.highwater(tp)
+        if highwater is None:
+            continue
+        offset = committed.get(tp)
+        if offset is None:
+            offset = consumer.position(tp)
+        LAG.set(highwater - offset, tp.topic, tp.partition)
+
+
 # ── Main loop ─────────────────────────────────────────────────────────────────
-def main():
-    print("[consumer] Starting Churn Intelligence Kafka Consumer")
-    consumer = connect_kafka()
-    conn     = snowflake.connector.connect(**get_snowflake_connection_params())
+def run(stop_event=None, rows_counter=None):
+    """Consume until KeyboardInterrupt or until stop_event is set.
+
+    stop_event / rows_counter let streaming/runner.py drive several consumer
+    processes: the runner sets the event for a graceful shutdown and reads the
+    shared counter to report aggregate throughput.
+    """
+    if FLUSH_MODE not in FLUSH_WRITERS:
+        raise ValueError(f"Unknown CONSUMER_FLUSH_MODE '{FLUSH_MODE}' — expected one of {list(FLUSH_WRITERS)}")
+    if DECODER not in ("fast", "json"):
+        raise ValueError(f"Unknown CONSUMER_DECODER '{DECODER}' — expected 'fast' or 'json'")
+    if DECODER == "fast" and not decode.AVAILABLE:
+        raise ValueError("CONSUMER_DECODER=fast requires msgspec (pip install msgspec)")
+
+    params = get_snowflake_connection_params()
+    spool  = DeadLetterSpool(DLQ_DIR)
+
+    def connect_snowflake():
+        conn = snowflake.connector.connect(**params)
+        if FLUSH_MODE in ("copy", "merge"):
+            bulk_load.prepare(conn)
+        return conn
+
+    def open_sink():
+        return RetryingSink(connect_snowflake, write_table, spool,
+                            MAX_RETRIES, RETRY_BASE_SECS, RETRY_MAX_SECS)
+
+    batching = {e_type: flush_policy(e_type) for e_type in TABLES}
+    dedup    = {e_type: RecentKeyIndex(DEDUP_KEYS) for e_type in TABLES} if DEDUP else None
+    tracker  = OffsetTracker()
+    by_table = {table: e_type for e_type, (table, _) in TABLES.items()}
+
+    def on_flushed(batch: Batch, rows: int, secs: float):
+        # the controller sees only the Snowflake write: queue wait and retry
+        # backoff grow when writers fall behind, and shrinking batches then
+        # would only add commits to the backlog
+        batching[by_table[batch.table]].observe_flush(rows, batch.write_secs)
+        BATCH_SECONDS.observe(secs, batch.table)
+
+    writers  = WriterPool(N_WRITERS, QUEUE_DEPTH, open_sink, write_batch, tracker,
+                          on_flushed=on_flushed)
+    listener = RebalanceHandler()
+    consumer = connect_kafka(listener)
+    writers.start()
+    register_snapshot_metrics(batching, dedup)
+    if METRICS_PORT:
+        metrics.start_http_server(METRICS_PORT, REGISTRY)
+        print(f"[consumer] Metrics at http://0.0.0.0:{METRICS_PORT}/metrics")
+
+    # One open batch per table. A partition can feed several tables, so a
+    # table's batch may only commit up to the oldest offset still sitting in
+    # another table's open batch.
+    batches    = {e_type: new_batch(e_type) for e_type in TABLES}
+    polled     = {}   # TopicPartition → next offset after the last polled message
+    submitted  = {}   # TopicPartition → offsets carried by the last submitted batch
+    committed  = {}   # TopicPartition → last committed offset, for lag
+    next_seq   = 0
+    last_stats = time.time()
+    last_lag   = time.time()
+
+    def commit_ready():
+        offsets = tracker.take_committable()
+        commit_offsets(consumer, offsets)
+        committed.update(offsets)
 
-    txn_buf, log_buf, user_buf = [], [], []
-    last_flush  = time.time()
-    total       = 0
+    def safe_offsets() -> dict:
+        offsets = dict(polled)
+        for b in batches.values():
+            for tp, first in b.first_offsets.items():
+                offsets[tp] = min(offsets[tp], first)
+        return offsets
 
-    print(f"[consumer] Listening on topic '{TOPIC}' — flush every {FLUSH_SIZE} msgs or {FLUSH_SECS}s")
+    def submit(batch: Batch):
+        nonlocal next_seq
+        batch.seq, next_seq = next_seq, next_seq + 1
+        batch.offsets = safe_offsets()
+        submitted.update(batch.offsets)
+        writers.submit(batch, on_wait=commit_ready)
+
+    def submit_table(e_type: str):
+        batch = batches[e_type]
+        batches[e_type] = new_batch(e_type)
+        submit(batch)
+
+    def submit_offsets():
+        """Carry offsets with no rows behind them (deduped or unparseable
+        messages, or a topic whose rows all went out already) to the tracker."""
+        if polled and safe_offsets() != submitted:
+            submit(Batch(None))
+
+    def write_and_commit_all(revoked=()):
+        for e_type, batch in batches.items():
+            if batch.rows:
+                submit_table(e_type)
+        submit_offsets()
+        writers.drain()
+        commit_ready()
+        # Partitions handed to another member must never be committed from here again
+        for tp in revoked:
+            polled.pop(tp, None)
+            submitted.pop(tp, None)
+
+    listener.on_revoke = write_and_commit_all
+
+    print(f"[consumer] Listening on {', '.join(repr(t) for t in TOPICS)} (group '{GROUP_ID}') — "
+          f"mode: {FLUSH_MODE}, decoder: {DECODER}, writers: {N_WRITERS}, queue: {QUEUE_DEPTH}")
+    for e_type, ctl in batching.items():
+        print(f"[consumer]   {TABLES[e_type][0]}: freshness target {ctl.freshness_secs}s, "
+              f"batch {ctl.min_rows}–{ctl.max_rows} rows, ≤{ctl.max_bytes / 2**20:.0f} MiB")
 
     try:
-        while True:
-            for message in consumer:
-                try:
-                    parse(message.value, txn_buf, log_buf, user_buf)
-                except Exception as e:
-                    print(f"[consumer] ⚠️  Parse error: {e}")
-
-                buf_size = len(txn_buf) + len(log_buf) + len(user_buf)
-                elapsed  = time.time() - last_flush
-
-                if buf_size >= FLUSH_SIZE or (elapsed >= FLUSH_SECS and buf_size > 0):
-                    n = flush(conn, txn_buf, log_buf, user_buf)
-                    total += n
-                    print(f"[consumer] ✅ Flushed {n} rows (total: {total:,}) — "
-                          f"TXN:{len(txn_buf)} LOG:{len(log_buf)} USER:{len(user_buf)}")
-                    txn_buf.clear(); log_buf.clear(); user_buf.clear()
-                    last_flush = time.time()
-
-            # consumer_timeout_ms hit — flush any remaining
-            buf_size = len(txn_buf) + len(log_buf) + len(user_buf)
-            if buf_size > 0:
-                n = flush(conn, txn_buf, log_buf, user_buf)
-                total += n
-                print(f"[consumer] ✅ Timeout flush {n} rows (total: {total:,})")
-                txn_buf.clear(); log_buf.clear(); user_buf.clear()
-                last_flush = time.time()
+        while stop_event is None or not stop_event.is_set():
+            t0 = time.perf_counter()
+            records = consumer.poll(timeout_ms=POLL_MS, max_records=POLL_MAX_RECORDS)
+            t1 = time.perf_counter()
+            POLL_SECONDS.observe(t1 - t0)
+
+            now = time.time()
+            arrived = dict.fromkeys(TABLES, 0)
+            for tp, messages in records.items():
+                t1 = time.perf_counter()
+                rows = {e_type: [] for e_type in TABLES}
+                decode_records(messages, rows["TXN"], rows["LOG"], rows["USER"])
+                t2 = time.perf_counter()
+                DECODE_SECONDS.observe(t2 - t1, DECODER)
+                if dedup is not None:
+                    rows = {e_type: dedup[e_type].filter(r) for e_type, r in rows.items()}
+                    DEDUP_SECONDS.observe(time.perf_counter() - t2)
+                for e_type, r in rows.items():
+                    if not r:
+                        continue
+                    batch = batches[e_type]
+                    if not batch.rows:
+                        batch.opened_at = now
+                    rejected = batch.rows.extend(r)
+                    if rejected:
+                        spool.append(batch.table, COLUMNS[batch.table],
+                                     [row for row, _ in rejected], rejected[0][1])
+                    if batch.rows:
+                        batch.first_offsets.setdefault(tp, messages[0].offset)
+                    arrived[e_type] += len(r) - len(rejected)
+                polled[tp] = messages[-1].offset + 1
+                MESSAGES.inc(len(messages))
+
+            for e_type, ctl in batching.items():
+                ctl.observe_arrivals(arrived[e_type], now)
+                batch = batches[e_type]
+                if batch.rows and ctl.should_flush(len(batch), now - batch.opened_at, batch.rows.nbytes()):
+                    submit_table(e_type)
+                BUFFER_ROWS.set(len(batches[e_type]), batch.table)
+                BUFFER_BYTES.set(batches[e_type].rows.nbytes(), batch.table)
+            if not any(b.rows for b in batches.values()):
+                submit_offsets()
+
+            QUEUE_BATCHES.set(writers.queue.qsize())
+            IN_FLIGHT.set(tracker.in_flight())
+            if now - last_lag >= LAG_SECS:
+                update_lag(consumer, committed)
+                last_lag = now
+
+            if now - last_stats >= STATS_SECS:
+                for e_type, ctl in batching.items():
+                    print(f"[consumer] Batch controller {TABLES[e_type][0]}: {ctl.snapshot()}")
+                if dedup is not None:
+                    print("[consumer] Dedup: " + ", ".join(
+                        f"{e_type} {idx.stats()}" for e_type, idx in dedup.items()))
+                last_stats = now
+
+            writers.check()
+            commit_ready()
+            if rows_counter is not None:
+                rows_counter.value = writers.rows
 
     except KeyboardInterrupt:
         print("[consumer] Stopped by user")
@@ -167,13 +513,25 @@ def main():
         print(f"[consumer] ❌ Fatal error: {e}")
         raise
     finally:
-        # Final flush
-        buf_size = len(txn_buf) + len(log_buf) + len(user_buf)
-        if buf_size > 0:
-            flush(conn, txn_buf, log_buf, user_buf)
-        consumer.close()
-        conn.close()
-        print(f"[consumer] Closed. Total rows inserted: {total:,}")
+        # Final flush — write whatever is buffered, then commit its offsets
+        try:
+            if writers.error is None:
+                for e_type, batch in batches.items():
+                    if batch.rows:
+                        submit_table(e_type)
+                submit_offsets()
+            writers.stop()
+            commit_ready()
+        finally:
+            consumer.close()
+            if rows_counter is not None:
+                rows_counter.value = writers.rows
+            print(f"[consumer] Closed. Total rows inserted: {writers.rows:,}")
+
+
+def main():
+    print("[consumer] Starting Churn Intelligence Kafka Consumer")
+    run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,239 @@
+"""
+streaming/deadletter.py — Non-fatal Snowflake writes for the consumer.
+
+RetryingSink owns one writer thread's Snowflake connection and never lets a
+write error escape:
+  • transient errors (network, timeouts, expired sessions) are retried with
+    exponential backoff + full jitter on a fresh connection, up to max_retries
+  • data errors (conversion / constraint failures) bisect the failing buffer
+    until the poison rows are isolated, so the good rows around them still load
+  • rows that fail permanently (data errors on a single row, or any other
+    non-transient error for the whole buffer), or whose retries run out, are
+    appended to an on-disk JSONL spool (CONSUMER_DLQ_DIR/<TABLE>/*.jsonl)
+Offsets therefore keep advancing and the stream keeps flowing.
+
+Replay the spool later (default mode: merge, so rows that did land are not
+duplicated):
+  python streaming/deadletter.py --replay [--dir dead_letter] [--mode merge]
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import threading
+import argparse
+from datetime import datetime, timezone
+
+from snowflake.connector import errors as sf_errors
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from streaming import metrics
+
+DLQ_DIR = os.getenv("CONSUMER_DLQ_DIR", os.path.join(os.path.dirname(__file__), "..", "dead_letter"))
+
+# Snowflake error numbers worth retrying: expired / missing session, statement
+# queue timeouts, warehouse resuming
+TRANSIENT_ERRNOS = {390111, 390112, 390114, 604, 625, 630, 3001}
+
+RETRIES      = metrics.REGISTRY.counter("consumer_write_retries_total", "Transient write errors retried",
+                                        labels=("table",))
+DEAD_LETTERS = metrics.REGISTRY.counter("consumer_dead_letter_rows_total", "Rows written to the dead-letter spool",
+                                        labels=("table",))
+
+
+class RetriesExhausted(Exception):
+    pass
+
+
+def is_transient(e: Exception) -> bool:
+    if isinstance(e, (sf_errors.OperationalError, sf_errors.InterfaceError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(e, sf_errors.Error):
+        if getattr(e, "errno", None) in TRANSIENT_ERRNOS:
+            return True
+        if (getattr(e, "sqlstate", None) or "").startswith("08"):   # SQLSTATE class 08: connection exception
+            return True
+    return False
+
+
+def is_row_error(e: Exception) -> bool:
+    """True when the failure is caused by row contents, so bisecting can isolate it."""
+    if not isinstance(e, sf_errors.Error):
+        return False
+    sqlstate = getattr(e, "sqlstate", None) or ""
+    errno    = getattr(e, "errno", None) or 0
+    # SQLSTATE 22 = data exception, 23 = integrity; Snowflake 100xxx = data / conversion errors
+    return sqlstate[:2] in ("22", "23") or 100000 <= errno < 200000
+
+
+# ── Spool ─────────────────────────────────────────────────────────────────────
+class DeadLetterSpool:
+    """Append-only JSONL files, one directory per table, one file per process and day."""
+
+    def __init__(self, directory: str = DLQ_DIR):
+        self.directory = os.path.abspath(directory)
+        self._lock = threading.Lock()
+
+    def path_for(self, table: str) -> str:
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+        return os.path.join(self.directory, table, f"{day}-{os.getpid()}.jsonl")
+
+    def append(self, table: str, columns: list, rows: list, error: Exception):
+        failed_at = datetime.now(timezone.utc).isoformat()
+        reason    = f"{type(error).__name__}: {error}"
+        path      = self.path_for(table)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps({
+                        "table": table, "columns": columns, "row": list(row),
+                        "error": reason, "failed_at": failed_at,
+                    }, default=str) + "\n")
+        DEAD_LETTERS.inc(len(rows), table)
+        print(f"[consumer] ☠️  {len(rows)} {table} row(s) dead-lettered → {path} ({reason})")
+
+    def files(self, table: str = None) -> list:
+        tables = [table] if table else sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else []
+        found = []
+        for t in tables:
+            d = os.path.join(self.directory, t)
+            if os.path.isdir(d):
+                # .replaying files are left over from an interrupted replay
+                found += [os.path.join(d, f) for f in sorted(os.listdir(d))
+                          if f.endswith(".jsonl") or f.endswith(".jsonl.replaying")]
+        return found
+
+
+# ── Retrying sink ─────────────────────────────────────────────────────────────
+class RetryingSink:
+    """One Snowflake connection plus retry, bisection and dead-lettering around write()."""
+
+    def __init__(self, connect, write, spool: DeadLetterSpool,
+                 max_retries: int = 5, base_delay: float = 0.5, max_delay: float = 30.0):
+        self._connect    = connect
+        self._write      = write          # (conn, table, columns, rows) → int
+        self.spool       = spool
+        self.max_retries = max_retries
+        self.base_delay  = base_delay
+        self.max_delay   = max_delay
+        self.conn        = None           # opened lazily so connect errors are retried too
+        self.write_secs  = 0.0            # write + commit time of successful attempts (no backoff)
+
+    def write(self, table: str, columns: list, rows: list) -> int:
+        """Write rows, returning how many landed. Never raises for Snowflake errors."""
+        try:
+            return self._load(table, columns, rows)
+        except RetriesExhausted as e:
+            self.spool.append(table, columns, rows, e.__cause__ or e)
+            return 0
+        except Exception as e:
+            if len(rows) == 1 or not is_row_error(e):
+                self.spool.append(table, columns, rows, e)
+                return 0
+            mid = len(rows) // 2
+            print(f"[consumer] ⚠️  {table} write of {len(rows)} rows failed ({e}) — bisecting")
+            return self.write(table, columns, rows[:mid]) + self.write(table, columns, rows[mid:])
+
+    def _load(self, table: str, columns: list, rows: list) -> int:
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self.conn is None:
+                    self.conn = self._connect()
+                start = time.perf_counter()
+                n = self._write(self.conn, table, columns, rows)
+                self.conn.commit()
+                self.write_secs += time.perf_counter() - start
+                return n
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                if attempt == self.max_retries:
+                    raise RetriesExhausted(f"{self.max_retries} retries exhausted") from e
+                RETRIES.inc(1, table)
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                print(f"[consumer] ⚠️  Transient {table} write error ({e}) — "
+                      f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                self._drop_connection()
+                time.sleep(delay)
+
+    def _drop_connection(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+        self.conn = None
+
+    def close(self):
+        self._drop_connection()
+
+
+# ── Replay ────────────────────────────────────────────────────────────────────
+def replay(sink: RetryingSink, spool: DeadLetterSpool, table: str = None) -> tuple:
+    """Re-ingest every spooled file that exists now. Rows that fail again are
+    re-spooled into a new file by the sink; replayed files are deleted."""
+    files = spool.files(table)
+    loaded = failed = 0
+    for path in files:
+        if not path.endswith(".replaying"):
+            os.rename(path, path + ".replaying")   # the sink may re-spool to the same name
+            path += ".replaying"
+        groups = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    rec = json.loads(line)
+                    groups.setdefault((rec["table"], tuple(rec["columns"])), []).append(tuple(rec["row"]))
+        for (tbl, columns), rows in groups.items():
+            n = sink.write(tbl, list(columns), rows)
+            loaded += n
+            failed += len(rows) - n
+        os.remove(path)
+        print(f"[deadletter] Replayed {path[:-len('.replaying')]}")
+    return loaded, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay the consumer dead-letter spool")
+    parser.add_argument("--replay", action="store_true", help="Re-ingest spooled rows into Snowflake")
+    parser.add_argument("--dir",    default=DLQ_DIR)
+    parser.add_argument("--table",  default=None, help="Only this table (e.g. FACT_TRANSACTION_LEDGER)")
+    parser.add_argument("--mode",   default="merge", help="Flush mode used for replay (insert | copy | merge)")
+    args = parser.parse_args()
+
+    spool = DeadLetterSpool(args.dir)
+    files = spool.files(args.table)
+    if not args.replay:
+        for path in files:
+            with open(path, encoding="utf-8") as f:
+                print(f"{sum(1 for _ in f):>8,}  {path}")
+        print(f"[deadletter] {len(files)} spool file(s) in {spool.directory}")
+        return
+
+    import snowflake.connector
+    from functools import partial
+    from src.core.config import get_snowflake_connection_params
+    from streaming import bulk_load
+    from streaming.consumer import write_table
+
+    params = get_snowflake_connection_params()
+
+    def connect():
+        conn = snowflake.connector.connect(**params)
+        if args.mode in ("copy", "merge"):
+            bulk_load.prepare(conn)
+        return conn
+
+    sink = RetryingSink(connect, partial(write_table, mode=args.mode), spool)
+    try:
+        loaded, failed = replay(sink, spool, args.table)
+    finally:
+        sink.close()
+    print(f"[deadletter] Replay complete — {loaded:,} rows loaded, {failed:,} re-spooled")
+
+
+if __name__ == "__main__":
+    main()
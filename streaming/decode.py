@@ -0,0 +1,114 @@
+"""
+streaming/decode.py — Typed fast-path decoder for consumer messages.
+
+json.loads builds a nested dict per message and parse() then walks it with
+.get() calls. Here each payload type has a msgspec Struct schema whose field
+order matches the target table's columns, so a message decodes straight into
+a row tuple with no intermediate dicts. A whole poll() result is decoded in a
+single call by framing the raw values as one JSON array.
+
+msgspec is optional: without it the consumer uses json.loads + parse(). Any
+message that does not fit the schemas (unknown event_type, no "payload"
+envelope, unexpected field types) is handed to the caller's fallback, which
+is that same parser.
+"""
+
+from typing import Optional, Union
+
+try:
+    import msgspec
+except ImportError:   # fall back to json + parse()
+    msgspec = None
+
+AVAILABLE = msgspec is not None
+
+if AVAILABLE:
+    class TxnPayload(msgspec.Struct):
+        transaction_ref:        Optional[str] = None
+        account_id:             Optional[str] = None
+        posting_date:           Optional[str] = None
+        transaction_code:       Optional[str] = None
+        amount:                 Optional[float] = None
+        merchant_description:   Optional[str] = None
+        merchant_category_code: Optional[str] = None
+        channel_id:             Optional[str] = None
+
+    class LogPayload(msgspec.Struct):
+        log_id:          Optional[str] = None
+        customer_id:     Optional[str] = None
+        event_type:      Optional[str] = None
+        event_timestamp: Optional[str] = None
+        device_os:       Optional[str] = None
+        page_url:        Optional[str] = None
+        error_code:      Optional[str] = None
+
+    class UserPayload(msgspec.Struct):
+        customer_id:        Optional[str] = None
+        full_name:          Optional[str] = None
+        email:              Optional[str] = None
+        segment:            Optional[str] = None
+        join_date:          Optional[str] = None
+        risk_profile_score: Optional[float] = None
+
+    # event_type selects the payload schema, so one decode pass covers the
+    # envelope and its payload together (tagged union)
+    class TxnEvent(msgspec.Struct, tag_field="event_type", tag="TXN"):
+        payload: TxnPayload
+
+    class LogEvent(msgspec.Struct, tag_field="event_type", tag="LOG"):
+        payload: LogPayload
+
+    class UserEvent(msgspec.Struct, tag_field="event_type", tag="USER"):
+        payload: UserPayload
+
+    Event = Union[TxnEvent, LogEvent, UserEvent]
+
+    _decode_batch = msgspec.json.Decoder(list[Event]).decode
+    _decode_one   = msgspec.json.Decoder(Event).decode
+    _astuple      = msgspec.structs.astuple
+
+
+def _append(event, txn_buf, log_buf, user_buf):
+    p = event.payload
+    if type(event) is TxnEvent:
+        txn_buf.append((
+            p.transaction_ref,
+            p.account_id,
+            p.posting_date,
+            (p.transaction_code or "")[:50],
+            p.amount,
+            (p.merchant_description or "")[:255],
+            (p.merchant_category_code or "")[:10],
+            (p.channel_id or "")[:20],
+        ))
+    elif type(event) is LogEvent:
+        log_buf.append(_astuple(p))
+    else:
+        user_buf.append(_astuple(p))
+
+
+def decode_batch(values: list, txn_buf, log_buf, user_buf, fallback):
+    """Decode raw message values into the row buffers.
+
+    fallback(value) is called for every message the typed path rejects.
+    """
+    try:
+        events = _decode_batch(b"[" + b",".join(values) + b"]")
+    except (msgspec.DecodeError, msgspec.ValidationError):
+        events = None
+
+    # A value that is itself a comma-separated run of objects would shift the
+    # framing; the length check sends such batches down the per-message path
+    if events is not None and len(events) == len(values):
+        for event in events:
+            _append(event, txn_buf, log_buf, user_buf)
+        return
+
+    # Something in the batch does not fit the schemas — retry message by message
+    for raw in values:
+        try:
+            event = _decode_one(raw)
+        except (msgspec.DecodeError, msgspec.ValidationError):
+            fallback(raw)
+            continue
+        _append(event, txn_buf, log_buf, user_buf)
@@ -0,0 +1,86 @@
+"""
+streaming/dedup.py — Bounded recently-seen key index for replay-safe ingestion.
+
+After a rebalance or restart the consumer replays from the last committed
+offset, and Snowflake does not enforce the declared PRIMARY KEYs, so replayed
+TRANSACTION_REF / LOG_ID / CUSTOMER_ID rows would be inserted twice.
+
+RecentKeyIndex remembers the 64-bit hashes of the most recent `capacity` keys
+per table and drops rows whose key it has already seen before they reach the
+batch. New keys go into a small Python set; once that holds `segment` keys it
+is frozen into a sorted int64 NumPy array (8 bytes/key) and the oldest frozen
+segment is evicted when capacity is exceeded. Frozen segments are probed for a
+whole poll at once with searchsorted.
+
+Unlike a Bloom filter there are no false positives beyond 64-bit hash
+collisions, so a new row is never dropped. Keys that have been evicted are
+covered by CONSUMER_FLUSH_MODE=merge.
+"""
+
+import sys
+from collections import deque
+
+import numpy as np
+
+_INT_BYTES = 32   # CPython int object holding a 64-bit hash
+
+
+class RecentKeyIndex:
+    def __init__(self, capacity: int = 2_000_000, segment: int = 65_536):
+        self.segment      = segment
+        self.max_segments = max(1, capacity // segment)
+        self.checked      = 0
+        self.dropped      = 0
+        self._active      = set()
+        self._frozen      = deque()   # sorted int64 arrays, oldest first
+
+    def filter(self, rows: list, key_index: int = 0) -> list:
+        """Return rows whose key has not been seen recently, and remember them.
+        Rows with a None key cannot be told apart; they pass through unrecorded."""
+        if not rows:
+            return rows
+
+        # hash() is randomised per process, which is fine for an in-memory index
+        hashes = np.fromiter((hash(r[key_index]) for r in rows), dtype=np.int64, count=len(rows))
+        seen   = np.zeros(len(rows), dtype=bool)
+        for seg in self._frozen:
+            pos = np.searchsorted(seg, hashes)
+            pos[pos == len(seg)] = 0
+            seen |= seg[pos] == hashes
+
+        active = self._active
+        fresh  = []
+        for row, h, old in zip(rows, hashes.tolist(), seen.tolist()):
+            if row[key_index] is None:
+                fresh.append(row)
+                continue
+            if old or h in active:
+                continue
+            active.add(h)
+            fresh.append(row)
+
+        if len(active) >= self.segment:
+            self._rotate()
+
+        self.checked += len(rows)
+        self.dropped += len(rows) - len(fresh)
+        return fresh
+
+    def _rotate(self):
+        self._frozen.append(np.sort(np.fromiter(self._active, dtype=np.int64, count=len(self._active))))
+        self._active = set()
+        while len(self._frozen) > self.max_segments:
+            self._frozen.popleft()
+
+    def memory_bytes(self) -> int:
+        return (sys.getsizeof(self._active) + _INT_BYTES * len(self._active)
+                + sum(seg.nbytes for seg in self._frozen))
+
+    def stats(self) -> dict:
+        return {
+            "keys":         len(self._active) + sum(len(seg) for seg in self._frozen),
+            "checked":      self.checked,
+            "dropped":      self.dropped,
+            "dedup_rate":   round(self.dropped / self.checked, 6) if self.checked else 0.0,
+            "memory_bytes": self.memory_bytes(),
+        }
@@ -0,0 +1,134 @@
+"""
+streaming/delivery.py — Delivery tracking for Kafka producers (producer.py, eventlog.py replay).
+
+Every send() registers a callback and an errback on its future. DeliveryStats
+counts acks and failures (by exception type), tracks messages and bytes
+still in flight (sent but not yet acknowledged or failed) and records the
+send → ack latency of each message in a fixed set of log-spaced buckets:
+
+  LATENCY_BUCKETS — 0.1 ms to ~2 min, each 25% wider than the last, so a
+                    percentile read from the buckets is within 25% of the
+                    true value and memory stays constant at any rate
+
+The whole state is a flat list of integers (state()), so sharded workers can
+publish it into a shared array and the parent can add them up and diff two
+snapshots for per-interval ack rate and latency percentiles (summarize()).
+
+Callbacks run on kafka-python's sender thread, hence the lock.
+"""
+
+import bisect
+import threading
+import time
+from collections import Counter
+
+LATENCY_BUCKETS = tuple(0.0001 * 1.25 ** i for i in range(64))
+PERCENTILES     = (50, 95, 99)
+
+# layout of state(): counters first, then one count per latency bucket (+ overflow)
+ACKED, FAILED, IN_FLIGHT, IN_FLIGHT_BYTES = range(4)
+STATE_SIZE = 4 + len(LATENCY_BUCKETS) + 1
+
+
+class DeliveryStats:
+    """Per-message delivery callbacks: acks, failures, in-flight bytes, ack latency."""
+
+    def __init__(self, clock=time.perf_counter):
+        self._lock   = threading.Lock()
+        self._clock  = clock
+        self.acked   = 0
+        self.failed  = 0
+        self.errors  = Counter()   # exception type → count
+        self.in_flight       = 0
+        self.in_flight_bytes = 0
+        self.peak_in_flight_bytes = 0
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def track(self, future, nbytes: int):
+        """Register delivery callbacks on one send() future."""
+        sent_at = self._clock()
+        with self._lock:
+            self.in_flight       += 1
+            self.in_flight_bytes += nbytes
+            if self.in_flight_bytes > self.peak_in_flight_bytes:
+                self.peak_in_flight_bytes = self.in_flight_bytes
+        future.add_callback(self.on_success, sent_at, nbytes)
+        future.add_errback(self.on_error, sent_at, nbytes)
+        return future
+
+    def on_success(self, sent_at: float, nbytes: int, metadata):
+        i = bisect.bisect_left(LATENCY_BUCKETS, self._clock() - sent_at)
+        with self._lock:
+            self.acked           += 1
+            self.in_flight       -= 1
+            self.in_flight_bytes -= nbytes
+            self.latency[i]      += 1
+
+    def on_error(self, sent_at: float, nbytes: int, exc):
+        with self._lock:
+            self.failed          += 1
+            self.in_flight       -= 1
+            self.in_flight_bytes -= nbytes
+            self.errors[type(exc).__name__] += 1
+
+    def state(self) -> list:
+        """Counters and latency bucket counts as one flat list (see STATE_SIZE)."""
+        with self._lock:
+            return [self.acked, self.failed, self.in_flight, self.in_flight_bytes] + self.latency
+
+    def totals(self) -> dict:
+        """End-of-run summary; latency percentiles are over the whole run."""
+        state = self.state()
+        return {
+            "acked":   state[ACKED],
+            "errors":  dict(self.errors),
+            "latency": state[4:],
+            "peak_in_flight_bytes": self.peak_in_flight_bytes,
+        }
+
+
+def merge_states(states) -> list:
+    """Element-wise sum of several state() lists (one per shard)."""
+    return [sum(values) for values in zip(*states)] if states else [0] * STATE_SIZE
+
+
+def percentile(counts, q: float):
+    """Upper bound (seconds) of the bucket holding the q-th percentile, or None."""
+    total = sum(counts)
+    if total == 0:
+        return None
+    rank, seen = q / 100.0 * total, 0
+    for bound, c in zip(LATENCY_BUCKETS + (float("inf"),), counts):
+        seen += c
+        if seen >= rank:
+            return bound
+    return float("inf")
+
+
+def summarize(now: list, before: list, secs: float) -> dict:
+    """Ack rate, failures and latency percentiles between two state() snapshots."""
+    counts = [a - b for a, b in zip(now[4:], before[4:])]
+    summary = {
+        "acked_eps":       (now[ACKED] - before[ACKED]) / max(secs, 1e-9),
+        "failed":          now[FAILED] - before[FAILED],
+        "in_flight":       now[IN_FLIGHT],
+        "in_flight_bytes": now[IN_FLIGHT_BYTES],
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}"] = percentile(counts, q)
+    return summary
+
+
+def format_ms(secs) -> str:
+    if secs is None:
+        return "-"
+    if secs == float("inf"):
+        return f">{LATENCY_BUCKETS[-1]:,.0f}s"
+    return f"{secs * 1000:,.1f}ms"
+
+
+def format_summary(s: dict) -> str:
+    return (f"acked {s['acked_eps']:,.1f}/s  "
+            + "  ".join(f"p{q} ≤{format_ms(s[f'p{q}'])}" for q in PERCENTILES)
+            + f"  in flight {s['in_flight']:,} msgs / {s['in_flight_bytes'] / 1024:,.0f} KiB"
+            + f"  failed {s['failed']:,}")
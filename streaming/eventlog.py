@@ -0,0 +1,319 @@
+"""
+streaming/eventlog.py — Record Kafka traffic to local segment files and replay it.
+
+A log is a directory of segment files (segment-000000.log, …), each starting
+with an 8-byte magic and then length-prefixed records:
+
+    u32 length | i64 timestamp_ms | u16 topic | u16 key (0xFFFF = null)
+               | u16 header count | u8 flags (1 = null value, a tombstone)
+               | topic | key | headers | value
+
+with each header encoded as u16 name length | name | u32 value length
+(0xFFFFFFFF = null) | value. EVLOG001 segments, which have no flags byte,
+are still read. A log is written into an empty directory only, so two
+recordings are never interleaved.
+Segments roll over at --segment-mb so no single file grows without bound.
+Values are stored exactly as they went over the wire (any format), and replay
+reads segments through mmap so records are sliced out without parsing.
+
+Sources:
+  producer.py --record DIR   — every event the producer sends
+  eventlog.py record         — a live topic, read without joining a group
+
+Replay republishes at the recorded pace (--speed 1), N times faster
+(--speed N) or as fast as the broker accepts (--speed max). With
+--rewrite-timestamps, record timestamps and event timestamps (posting_date,
+event_timestamp, join_date) are set to the time of resend, so dynamic tables
+see the replay as fresh traffic.
+
+Usage:
+  python streaming/eventlog.py record --topics bank_transactions --out logs/peak --duration 600
+  python streaming/eventlog.py replay logs/peak --speed 10 --rewrite-timestamps
+  python streaming/eventlog.py info logs/peak
+"""
+
+import sys
+import os
+import json
+import mmap
+import time
+import heapq
+import struct
+import argparse
+from collections import Counter, namedtuple
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from streaming import wire
+from streaming import delivery
+
+MAGIC        = b"EVLOG002"
+SEGMENT_MB   = 256
+NULL_KEY     = 0xFFFF
+NULL_HEADER  = 0xFFFFFFFF
+NULL_VALUE   = 0x01                       # record flag
+_HEAD        = struct.Struct("<IqHHHB")   # length, timestamp_ms, topic, key, header count, flags
+_HNAME       = struct.Struct("<H")
+_HVALUE      = struct.Struct("<I")
+_HEADS       = {MAGIC: _HEAD, b"EVLOG001": struct.Struct("<IqHHH")}   # older segments: no flags
+
+# event timestamp field per event_type, rewritten on replay
+TIME_FIELDS = {"TXN": "posting_date", "LOG": "event_timestamp", "USER": "join_date"}
+
+Record = namedtuple("Record", "timestamp_ms topic key value headers")
+
+
+# ── Writing ───────────────────────────────────────────────────────────────────
+def is_empty(directory: str) -> bool:
+    """True if directory does not exist or holds nothing."""
+    return not os.path.isdir(directory) or not os.listdir(directory)
+
+
+class EventLogWriter:
+    def __init__(self, directory: str, segment_bytes: int = SEGMENT_MB * 1024 * 1024):
+        if not is_empty(directory):
+            raise FileExistsError(f"{directory} is not empty — record into a new directory")
+        self.directory     = directory
+        self.segment_bytes = segment_bytes
+        self.records       = 0
+        self._file         = None
+        self._size         = 0
+        self._segment      = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _roll(self):
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f"segment-{self._segment:06d}.log")
+        self._segment += 1
+        self._file = open(path, "wb", buffering=1024 * 1024)
+        self._file.write(MAGIC)
+        self._size = len(MAGIC)
+
+    def append(self, topic: str, key, value: bytes, headers=None, timestamp_ms: int = None):
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+        topic_b = topic.encode("utf-8")
+        parts = [topic_b, key or b""]
+        for name, hv in headers or ():
+            name_b = name.encode("utf-8")
+            parts += [_HNAME.pack(len(name_b)), name_b,
+                      _HVALUE.pack(NULL_HEADER if hv is None else len(hv)), hv or b""]
+        parts.append(value or b"")
+        body = sum(map(len, parts))
+        ts   = int(time.time() * 1000) if timestamp_ms is None else timestamp_ms
+        head = _HEAD.pack(_HEAD.size - 4 + body, ts, len(topic_b),
+                          NULL_KEY if key is None else len(key), len(headers or ()),
+                          NULL_VALUE if value is None else 0)
+
+        if self._file is None or self._size + _HEAD.size + body > self.segment_bytes:
+            self._roll()
+        self._file.write(head)
+        self._file.write(b"".join(parts))
+        self._size   += _HEAD.size + body
+        self.records += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ── Reading ───────────────────────────────────────────────────────────────────
+def _segments(directory: str) -> list:
+    return sorted(os.path.join(directory, f) for f in os.listdir(directory)
+                  if f.startswith("segment-") and f.endswith(".log"))
+
+
+def read_segment(path: str):
+    """Yield the records of one segment file, sliced out of an mmap."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= len(MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            head = _HEADS.get(mm[:len(MAGIC)])
+            if head is None:
+                raise ValueError(f"{path} is not an event log segment")
+            pos, end = len(MAGIC), len(mm)
+            while pos + head.size <= end:
+                length, ts, topic_len, key_len, n_headers, *flags = head.unpack_from(mm, pos)
+                stop = pos + 4 + length
+                if stop > end:
+                    break   # torn tail from an interrupted recording
+                p = pos + head.size
+                topic = mm[p:p + topic_len].decode("utf-8")
+                p += topic_len
+                if key_len == NULL_KEY:
+                    key = None
+                else:
+                    key = mm[p:p + key_len]
+                    p += key_len
+                headers = []
+                for _ in range(n_headers):
+                    (name_len,) = _HNAME.unpack_from(mm, p)
+                    p += _HNAME.size
+                    name = mm[p:p + name_len].decode("utf-8")
+                    p += name_len
+                    (value_len,) = _HVALUE.unpack_from(mm, p)
+                    p += _HVALUE.size
+                    if value_len == NULL_HEADER:
+                        headers.append((name, None))
+                        continue
+                    headers.append((name, mm[p:p + value_len]))
+                    p += value_len
+                value = None if flags and flags[0] & NULL_VALUE else mm[p:stop]
+                yield Record(ts, topic, key, value, headers)
+                pos = stop
+
+
+def read_log(directory: str):
+    """Yield every record of a log in order. Sub-directories (one per sharded
+    producer worker) are merged by timestamp."""
+    subdirs = sorted(os.path.join(directory, d) for d in os.listdir(directory)
+                     if os.path.isdir(os.path.join(directory, d)))
+    if subdirs:
+        yield from heapq.merge(*(read_log(d) for d in subdirs), key=lambda r: r.timestamp_ms)
+        return
+    for path in _segments(directory):
+        yield from read_segment(path)
+
+
+# ── Timestamp rewriting ───────────────────────────────────────────────────────
+def rewrite_timestamps(value: bytes, headers: list, now: datetime) -> bytes:
+    """Set the event's own timestamp field to now, in whichever wire format it uses."""
+    fmt, version = wire.message_format(headers)
+    if fmt == "json":
+        event = json.loads(value)
+        field = TIME_FIELDS.get(event.get("event_type"))
+        if field and field in event.get("payload", {}):
+            event["payload"][field] = now.date().isoformat() if field == "join_date" else now.isoformat()
+        return json.dumps(event).encode("utf-8")
+    if fmt == "msgpack":
+        e_type, values = wire.msgspec.msgpack.decode(value)
+        field  = TIME_FIELDS[e_type]
+        schema = wire.SCHEMAS.get(version, wire.SCHEMAS[wire.SCHEMA_VERSION])
+        values[schema[e_type].index(field)] = (
+            now.date().isoformat() if field == "join_date" else now.isoformat())
+        return wire.msgspec.msgpack.encode([e_type, values])
+    return value
+
+
+# ── Commands ──────────────────────────────────────────────────────────────────
+def replay(args):
+    from streaming.producer import connect_with_retry   # kafka-python producer setup
+
+    producer = connect_with_retry(args.kafka, None, args.compression)
+    speed    = None if args.speed == "max" else float(args.speed)
+    sent     = 0
+    first_ts = start = None
+    stats    = delivery.DeliveryStats()
+
+    print(f"[eventlog] Replaying {args.log} at {'max' if speed is None else f'{speed:g}x'} speed"
+          + (" with rewritten timestamps" if args.rewrite_timestamps else ""))
+    try:
+        for rec in read_log(args.log):
+            if first_ts is None:
+                first_ts, start = rec.timestamp_ms, time.monotonic()
+            if speed is not None:
+                due = start + (rec.timestamp_ms - first_ts) / 1000.0 / speed
+                delay = due - time.monotonic()
+                if delay > 0.001:
+                    time.sleep(delay)
+            headers, value, ts = rec.headers, rec.value, rec.timestamp_ms
+            if args.rewrite_timestamps:
+                if value is not None:   # tombstones carry no event
+                    value = rewrite_timestamps(value, headers, datetime.utcnow())
+                ts = None   # broker / producer assigns send time
+            stats.track(producer.send(args.topic or rec.topic, value=value, key=rec.key,
+                                      headers=headers, timestamp_ms=ts),
+                        len(value or b"") + len(rec.key or b""))
+            sent += 1
+            if sent % 100_000 == 0:
+                elapsed = time.monotonic() - start
+                print(f"[eventlog] Replayed {sent:,} records ({sent / elapsed:,.0f}/s)")
+    except KeyboardInterrupt:
+        print("[eventlog] Stopped by user")
+    finally:
+        producer.flush()
+        producer.close()
+    elapsed = time.monotonic() - start if start else 0.0
+    print(f"[eventlog] Replay complete — {sent:,} records in {elapsed:,.1f}s "
+          f"({sent / max(elapsed, 1e-9):,.0f}/s), delivery errors: {dict(stats.errors) or 0}, "
+          f"p99 ack {delivery.format_ms(delivery.percentile(stats.latency, 99))}")
+
+
+def record(args):
+    from kafka import KafkaConsumer
+
+    consumer = KafkaConsumer(*args.topics, bootstrap_servers=[args.kafka], group_id=None,
+                             auto_offset_reset="earliest" if args.from_beginning else "latest")
+    writer   = EventLogWriter(args.out, args.segment_mb * 1024 * 1024)
+    end_time = time.time() + args.duration
+    print(f"[eventlog] Recording {', '.join(args.topics)} → {args.out} for {args.duration}s")
+    try:
+        while time.time() < end_time:
+            for tp, messages in consumer.poll(timeout_ms=1000).items():
+                for m in messages:
+                    writer.append(m.topic, m.key, m.value, m.headers, m.timestamp)
+    except KeyboardInterrupt:
+        print("[eventlog] Stopped by user")
+    finally:
+        writer.close()
+        consumer.close()
+    print(f"[eventlog] Recorded {writer.records:,} records")
+
+
+def info(args):
+    n, size, topics = 0, 0, Counter()
+    first = last = None
+    for rec in read_log(args.log):
+        n += 1
+        size += len(rec.value or b"")
+        topics[rec.topic] += 1
+        first = rec.timestamp_ms if first is None else first
+        last  = rec.timestamp_ms
+    span = (last - first) / 1000.0 if n else 0.0
+    print(f"[eventlog] {args.log}: {n:,} records, {size / max(n, 1):,.1f} B/value, "
+          f"{span:,.1f}s recorded ({n / max(span, 1e-9):,.0f}/s)")
+    for topic, count in topics.most_common():
+        print(f"[eventlog]   {topic}: {count:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay Kafka traffic")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("record", help="Record a live topic")
+    p.add_argument("--kafka",      default=os.getenv("KAFKA_BROKER", "localhost:9092"))
+    p.add_argument("--topics",     nargs="+", default=["bank_transactions"])
+    p.add_argument("--out",        required=True, help="Log directory")
+    p.add_argument("--duration",   type=int, default=600)
+    p.add_argument("--segment-mb", type=int, default=SEGMENT_MB)
+    p.add_argument("--from-beginning", action="store_true", help="Start at the earliest retained offset")
+    p.set_defaults(fn=record)
+
+    p = sub.add_parser("replay", help="Republish a recorded log")
+    p.add_argument("log")
+    p.add_argument("--kafka",      default=os.getenv("KAFKA_BROKER", "localhost:9092"))
+    p.add_argument("--speed",      default="1", help="1 = recorded pace, N = N× faster, max = unthrottled")
+    p.add_argument("--rewrite-timestamps", action="store_true", help="Stamp records and events with send time")
+    p.add_argument("--topic",      default=None, help="Send everything to this topic instead of the recorded ones")
+    p.add_argument("--compression", choices=list(wire.CODECS), default="gzip")
+    p.set_defaults(fn=replay)
+
+    p = sub.add_parser("info", help="Summarise a recorded log")
+    p.add_argument("log")
+    p.set_defaults(fn=info)
+
+    args = parser.parse_args()
+    if args.command == "replay":
+        wire.check_codec(args.compression)
+    if getattr(args, "speed", "max") != "max" and float(args.speed) <= 0:
+        parser.error("--speed must be positive or 'max'")
+    if args.command == "record" and not is_empty(args.out):
+        parser.error(f"--out {args.out} is not empty")
+    args.fn(args)
+
+
+if __name__ == "__main__":
+    main()
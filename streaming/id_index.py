@@ -0,0 +1,224 @@
+"""
+streaming/id_index.py — Seeded customer / account IDs for the producer.
+
+Random IDs almost never match a row in DIM_CUSTOMERS or DIM_ACCOUNTS, so the
+joins behind DYN_CUSTOMER_FEATURES drop them and streamed events never move a
+churn score. With producer --ids seeded, TXN account_ids and LOG customer_ids
+are drawn from the IDs that are actually in Snowflake instead.
+
+IdIndex holds the IDs as fixed-width byte arrays (a few MB for the default
+100k customers / 200k accounts) plus each account's owner as an index into
+the customer array. It is loaded once, written to a local .npz cache and
+reloaded from the cache on the next start while it is younger than the
+refresh interval, so restarting a producer does not re-query Snowflake.
+
+IdSampler draws with Zipf skew: customers are ranked by a seeded hash of
+their ID and customer k is drawn with weight 1 / k**skew (skew 0 = uniform).
+A TXN picks its customer the same way and then one of that customer's
+accounts, so hot customers are hot in both the transaction and the activity
+stream. Ranking by hash keeps the hot set the same across refreshes and
+across sharded workers.
+"""
+
+import os
+import sys
+import time
+import zlib
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+CACHE_PATH   = os.getenv("PRODUCER_ID_CACHE", os.path.join(os.path.dirname(__file__), "..", ".cache", "seeded_ids.npz"))
+REFRESH_SECS = 600
+FETCH_ROWS   = 100_000
+
+
+class IdIndex:
+    """Customer IDs, account IDs and each account's owning customer, as NumPy arrays."""
+
+    def __init__(self, customers: np.ndarray, accounts: np.ndarray, owners: np.ndarray,
+                 loaded_at: float = None):
+        self.customers = customers     # |S, sorted
+        self.accounts  = accounts      # |S
+        self.owners    = owners        # int32 index into customers, per account
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+
+    @classmethod
+    def build(cls, customer_ids, account_rows, loaded_at: float = None) -> "IdIndex":
+        """From customer IDs and (account_id, customer_id) pairs. Accounts whose
+        customer is unknown (Snowflake does not enforce the foreign key) are dropped."""
+        customers = np.unique(np.array(list(customer_ids), dtype="S"))
+        pairs     = list(account_rows)
+        accounts  = np.array([a for a, _ in pairs], dtype="S") if pairs else np.array([], dtype="S1")
+        owner_ids = np.array([c for _, c in pairs], dtype="S") if pairs else np.array([], dtype="S1")
+        owners    = np.searchsorted(customers, owner_ids)
+        known     = owners < len(customers)
+        known[known] = customers[owners[known]] == owner_ids[known]
+        return cls(customers, accounts[known], owners[known].astype(np.int32), loaded_at)
+
+    def nbytes(self) -> int:
+        return self.customers.nbytes + self.accounts.nbytes + self.owners.nbytes
+
+    def describe(self) -> str:
+        return (f"{len(self.customers):,} customers, {len(self.accounts):,} accounts "
+                f"({self.nbytes() / 1024 / 1024:,.1f} MiB)")
+
+    # ── Cache file ──
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:   # np.savez would append .npz to a bare path
+            np.savez(f, customers=self.customers, accounts=self.accounts,
+                     owners=self.owners, loaded_at=np.float64(self.loaded_at))
+        os.replace(tmp, path)        # readers never see a half-written cache
+
+    @classmethod
+    def read(cls, path: str) -> "IdIndex":
+        with np.load(path) as data:
+            return cls(data["customers"], data["accounts"], data["owners"], float(data["loaded_at"]))
+
+
+def fetch(conn) -> IdIndex:
+    """Query the seeded IDs from Snowflake."""
+    cur = conn.cursor()
+
+    def rows(sql):
+        cur.execute(sql)
+        while True:
+            chunk = cur.fetchmany(FETCH_ROWS)
+            if not chunk:
+                return
+            yield from chunk
+
+    customers = [r[0] for r in rows("SELECT CUSTOMER_ID FROM DIM_CUSTOMERS")]
+    accounts  = list(rows("SELECT ACCOUNT_ID, CUSTOMER_ID FROM DIM_ACCOUNTS"))
+    return IdIndex.build(customers, accounts)
+
+
+def connect_snowflake():
+    import snowflake.connector
+    from src.core.config import get_snowflake_connection_params
+    return snowflake.connector.connect(**get_snowflake_connection_params())
+
+
+def load(path: str = CACHE_PATH, max_age: float = REFRESH_SECS, connect=connect_snowflake) -> IdIndex:
+    """The cached index if it is younger than max_age, otherwise a fresh one
+    from Snowflake (written back to the cache). A stale cache is still used
+    if Snowflake cannot be reached."""
+    cached = None
+    if os.path.exists(path):
+        try:
+            cached = IdIndex.read(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[producer] ⚠️  Ignoring unreadable ID cache {path} ({e})")
+        else:
+            if time.time() - cached.loaded_at < max_age:
+                return cached
+    try:
+        conn = connect()
+        try:
+            index = fetch(conn)
+        finally:
+            conn.close()
+    except Exception as e:
+        if cached is None:
+            raise
+        print(f"[producer] ⚠️  Could not refresh seeded IDs ({e}) — keeping cache from "
+              f"{time.time() - cached.loaded_at:,.0f}s ago")
+        return cached
+    if not len(index.customers) or not len(index.accounts):
+        raise ValueError("DIM_CUSTOMERS / DIM_ACCOUNTS are empty — run scripts/setup.py first")
+    index.save(path)
+    return index
+
+
+class CacheWatcher:
+    """Reload callable for sharded workers: the index from the cache file,
+    or None while the file is unchanged. The parent refreshes the file."""
+
+    def __init__(self, path: str):
+        self.path  = path
+        self.mtime = os.path.getmtime(path) if os.path.exists(path) else None
+
+    def __call__(self):
+        mtime = os.path.getmtime(self.path)
+        if mtime == self.mtime:
+            return None
+        self.mtime = mtime
+        return IdIndex.read(self.path)
+
+
+def refresh_in_background(reload, interval: float, on_index, stop_event, name: str = "producer",
+                          loaded_at: float = None):
+    """Call reload() every interval seconds and hand each new index to on_index
+    until stop_event is set. An index with the same loaded_at as the current
+    one (e.g. the stale cache after a failed query) is not handed on; errors
+    are logged and the current index is kept."""
+
+    def loop():
+        last = loaded_at
+        while not stop_event.wait(interval):
+            try:
+                index = reload()
+            except Exception as e:
+                print(f"[{name}] ⚠️  Seeded ID refresh failed ({e}) — keeping current IDs")
+                continue
+            if index is not None and index.loaded_at != last:
+                last = index.loaded_at
+                on_index(index)
+                print(f"[{name}] Refreshed seeded IDs: {index.describe()}")
+
+    thread = threading.Thread(target=loop, name=f"{name}-id-refresh", daemon=True)
+    thread.start()
+    return thread
+
+
+# ── Sampling ──────────────────────────────────────────────────────────────────
+def zipf_weights(n: int, skew: float) -> np.ndarray:
+    """Normalised weight of rank 1..n under Zipf(skew)."""
+    w = np.arange(1, n + 1, dtype=np.float64) ** -skew
+    return w / w.sum()
+
+
+class IdSampler:
+    """Draws customer and account IDs from an IdIndex with Zipf-skewed popularity."""
+
+    def __init__(self, index: IdIndex, skew: float = 1.0, seed: int = 0):
+        if skew < 0:
+            raise ValueError("ID skew must be >= 0")
+        self.index = index
+        self.skew  = skew
+        # popularity rank of each customer: a seeded hash of its ID, so the
+        # same customers stay hot when the index is refreshed or sharded
+        # (crc32 takes an unsigned 32-bit starting value)
+        seed    = seed & 0xFFFFFFFF
+        hashes  = np.fromiter((zlib.crc32(c, seed) for c in index.customers.tolist()),
+                              dtype=np.uint32, count=len(index.customers))
+        ranks   = np.empty(len(hashes), dtype=np.int64)
+        ranks[np.argsort(hashes, kind="stable")] = np.arange(len(hashes))
+        weights = zipf_weights(len(hashes), skew)[ranks]
+
+        self._customer_cdf = np.cumsum(weights)
+        # an account carries its owner's weight, split between the owner's
+        # accounts; customers without accounts drop out of the TXN stream
+        per_owner = np.bincount(index.owners, minlength=len(weights))
+        account_w = weights[index.owners] / per_owner[index.owners]
+        self._account_cdf = np.cumsum(account_w)
+
+    @staticmethod
+    def _draw(cdf: np.ndarray, n: int, rng) -> np.ndarray:
+        idx = np.searchsorted(cdf, rng.random(n) * cdf[-1], side="right")
+        return np.minimum(idx, len(cdf) - 1)
+
+    def customer_ids(self, n: int, rng) -> list:
+        return self.index.customers[self._draw(self._customer_cdf, n, rng)].astype(str).tolist()
+
+    def account_ids(self, n: int, rng) -> list:
+        return self.index.accounts[self._draw(self._account_cdf, n, rng)].astype(str).tolist()
+
+    def hot_share(self, top: float = 0.01) -> float:
+        """Share of draws that land on the hottest `top` fraction of customers."""
+        k = max(1, int(len(self._customer_cdf) * top))
+        return float(zipf_weights(len(self._customer_cdf), self.skew)[:k].sum())
@@ -0,0 +1,211 @@
+"""
+streaming/load_profile.py — Load profiles and a drift-correcting rate scheduler for the producer.
+
+A profile maps seconds since start → target events/s:
+  constant — rate
+  step     — start_rate, raised by step_rate every step_secs (capped at max_rate)
+  burst    — base_rate, with burst_rate for burst_secs out of every period_secs
+  diurnal  — cosine between min_rate and max_rate over period_secs, peaking at
+             peak_secs (a compressed day by default: period_secs = 86400)
+
+Profiles are small TOML files (examples in streaming/profiles/):
+
+    type       = "step"
+    start_rate = 100
+    step_rate  = 100
+    step_secs  = 60
+    max_rate   = 2000
+    duration   = 1200     # optional, overrides --duration
+
+RateScheduler is a token bucket fed by the profile. Tokens accrue from the
+wall clock since the last refill, not from how long the caller slept, so time
+spent generating and sending events is paid back on the next batch instead of
+lowering the achieved rate. The bucket holds at most BUCKET_SECS of tokens,
+so a stall (e.g. broker backpressure) is caught up briefly rather than with an
+unbounded burst — a producer that cannot keep up shows as achieved < target.
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+
+import toml
+
+TICK_SECS   = 0.05   # longest single sleep while waiting for tokens
+MIN_SLEEP   = 0.001  # shortest, so float rounding never turns the wait into a spin
+BUCKET_SECS = 1.0    # bucket capacity, in seconds of the current target rate
+
+
+class Profile(ABC):
+    kind = ""
+
+    def __init__(self, duration: float = None):
+        self.duration = duration
+
+    @abstractmethod
+    def rate(self, t: float) -> float:
+        """Target events/s at t seconds since start."""
+
+    def describe(self) -> str:
+        params = {k: v for k, v in vars(self).items() if k != "duration" and v is not None}
+        return f"{self.kind} " + " ".join(f"{k}={v:g}" for k, v in params.items())
+
+
+class Constant(Profile):
+    kind = "constant"
+
+    def __init__(self, rate: float, duration: float = None):
+        super().__init__(duration)
+        self.constant_rate = float(rate)
+
+    def rate(self, t: float) -> float:
+        return self.constant_rate
+
+    def describe(self) -> str:
+        return f"constant rate={self.constant_rate:g}"
+
+
+class Step(Profile):
+    kind = "step"
+
+    def __init__(self, start_rate: float, step_rate: float, step_secs: float,
+                 max_rate: float = None, duration: float = None):
+        super().__init__(duration)
+        if step_secs <= 0:
+            raise ValueError("step profile needs step_secs > 0")
+        self.start_rate = float(start_rate)
+        self.step_rate  = float(step_rate)
+        self.step_secs  = float(step_secs)
+        self.max_rate   = None if max_rate is None else float(max_rate)
+
+    def rate(self, t: float) -> float:
+        r = self.start_rate + self.step_rate * math.floor(t / self.step_secs)
+        return r if self.max_rate is None else min(self.max_rate, r)
+
+
+class Burst(Profile):
+    kind = "burst"
+
+    def __init__(self, base_rate: float, burst_rate: float, period_secs: float, burst_secs: float,
+                 duration: float = None):
+        super().__init__(duration)
+        if not 0 < burst_secs <= period_secs:
+            raise ValueError("burst profile needs 0 < burst_secs <= period_secs")
+        self.base_rate   = float(base_rate)
+        self.burst_rate  = float(burst_rate)
+        self.period_secs = float(period_secs)
+        self.burst_secs  = float(burst_secs)
+
+    def rate(self, t: float) -> float:
+        return self.burst_rate if t % self.period_secs < self.burst_secs else self.base_rate
+
+
+class Diurnal(Profile):
+    kind = "diurnal"
+
+    def __init__(self, min_rate: float, max_rate: float, period_secs: float = 86400,
+                 peak_secs: float = None, duration: float = None):
+        super().__init__(duration)
+        if period_secs <= 0 or max_rate < min_rate:
+            raise ValueError("diurnal profile needs period_secs > 0 and max_rate >= min_rate")
+        self.min_rate    = float(min_rate)
+        self.max_rate    = float(max_rate)
+        self.period_secs = float(period_secs)
+        self.peak_secs   = float(period_secs / 2 if peak_secs is None else peak_secs)
+
+    def rate(self, t: float) -> float:
+        phase = 2 * math.pi * (t - self.peak_secs) / self.period_secs
+        return self.min_rate + (self.max_rate - self.min_rate) * (1 + math.cos(phase)) / 2
+
+
+class Scaled(Profile):
+    """Another profile multiplied by factor — one shard's share of a sharded run."""
+    kind = "scaled"
+
+    def __init__(self, inner: Profile, factor: float):
+        super().__init__(inner.duration)
+        self.inner  = inner
+        self.factor = factor
+
+    def rate(self, t: float) -> float:
+        return self.inner.rate(t) * self.factor
+
+    def describe(self) -> str:
+        return f"{self.inner.describe()} ×{self.factor:g}"
+
+
+PROFILES = {cls.kind: cls for cls in (Constant, Step, Burst, Diurnal)}
+
+
+def load(path: str) -> Profile:
+    """Build a profile from a TOML file."""
+    spec = toml.load(path)
+    kind = spec.pop("type", None)
+    if kind not in PROFILES:
+        raise ValueError(f"{path}: unknown profile type '{kind}' — expected one of {list(PROFILES)}")
+    try:
+        return PROFILES[kind](**spec)
+    except TypeError as e:
+        raise ValueError(f"{path}: invalid {kind} profile ({e})") from None
+
+
+# ── Scheduler ─────────────────────────────────────────────────────────────────
+class RateScheduler:
+    """Token bucket that hands out batches of sends following a profile."""
+
+    def __init__(self, profile: Profile, max_batch: int, clock=time.monotonic, sleep=time.sleep):
+        self.profile   = profile
+        self.max_batch = max_batch
+        self._clock    = clock
+        self._sleep    = sleep
+        self.start     = clock()
+        self._last     = self.start
+        self._tokens   = 0.0
+        self.sent      = 0
+        self.target    = 0.0   # events the profile asked for so far
+        self._report   = (self.start, 0, 0.0)
+
+    def elapsed(self) -> float:
+        return self._clock() - self.start
+
+    def _refill(self) -> float:
+        now  = self._clock()
+        rate = self.profile.rate(now - self.start)
+        # midpoint rule: exact for constant segments, close enough for the curves
+        earned = self.profile.rate((self._last + now) / 2 - self.start) * (now - self._last)
+        self.target += earned
+        self._tokens = min(self._tokens + earned, max(1.0, rate * BUCKET_SECS))
+        self._last   = now
+        return rate
+
+    def acquire(self, deadline: float = None) -> int:
+        """Block until at least one event is due; return how many to send now.
+
+        Returns 0 if deadline (seconds since start) passes first.
+        """
+        while True:
+            rate = self._refill()
+            if deadline is not None and self._last - self.start >= deadline:
+                return 0
+            if self._tokens >= 1.0:
+                n = min(self.max_batch, int(self._tokens))
+                self._tokens -= n
+                self.sent    += n
+                return n
+            wait = TICK_SECS if rate <= 0 else min(TICK_SECS, (1.0 - self._tokens) / rate)
+            self._sleep(max(MIN_SLEEP, wait))
+
+    def report(self) -> dict:
+        """Achieved vs target rate since the previous report (and overall)."""
+        now = self._clock()
+        last_at, last_sent, last_target = self._report
+        self._report = (now, self.sent, self.target)
+        secs = max(now - last_at, 1e-9)
+        total = max(now - self.start, 1e-9)
+        return {
+            "elapsed_secs":  round(now - self.start, 1),
+            "target_eps":    round((self.target - last_target) / secs, 1),
+            "achieved_eps":  round((self.sent - last_sent) / secs, 1),
+            "overall_target_eps":   round(self.target / total, 1),
+            "overall_achieved_eps": round(self.sent / total, 1),
+        }
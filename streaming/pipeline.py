@@ -0,0 +1,159 @@
+"""
+streaming/pipeline.py — Decouples Kafka polling from Snowflake writes.
+
+The poll thread parses messages into buffers and hands each full buffer to a
+bounded queue as a Batch. Background writer threads (one Snowflake connection
+each) drain the queue. Every Batch carries the Kafka offsets it covers; the
+OffsetTracker only releases offsets once every batch up to and including them
+has been written, so commits never run ahead of durable data (at-least-once).
+
+When the queue is full the poll thread blocks on submit (backpressure) but
+keeps committing offsets as writers finish; kafka-python heartbeats from its
+own thread, so group membership survives short stalls.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+
+_STOP = object()
+
+
+@dataclass
+class Batch:
+    table:   str                                   # None for an offsets-only marker
+    rows:    list = field(default_factory=list)
+    seq:     int = -1                              # assigned on submit
+    offsets: dict = field(default_factory=dict)    # TopicPartition → next offset to commit
+    first_offsets: dict = field(default_factory=dict)   # TopicPartition → lowest offset buffered
+    opened_at:    float = 0.0
+    submitted_at: float = 0.0
+    write_secs:   float = 0.0                      # Snowflake write + commit only, set by the writer
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class OffsetTracker:
+    """Releases batch offsets in submission order, once each batch is written."""
+
+    def __init__(self):
+        self._lock     = threading.Lock()
+        self._pending  = {}      # seq → offsets, in submission order
+        self._done     = set()
+        self._ready    = {}      # offsets safe to commit, not yet handed out
+
+    def register(self, batch: Batch):
+        with self._lock:
+            self._pending[batch.seq] = batch.offsets
+
+    def mark_done(self, seq: int):
+        with self._lock:
+            self._done.add(seq)
+            # dicts keep insertion order, so the first key is the oldest batch
+            while self._pending:
+                oldest = next(iter(self._pending))
+                if oldest not in self._done:
+                    break
+                self._ready.update(self._pending.pop(oldest))
+                self._done.discard(oldest)
+
+    def take_committable(self) -> dict:
+        with self._lock:
+            ready, self._ready = self._ready, {}
+            return ready
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+class WriterPool:
+    """Background threads that drain Batches from a bounded queue into Snowflake."""
+
+    def __init__(self, n_writers: int, depth: int, connect, write, tracker: OffsetTracker,
+                 on_flushed=None):
+        self.queue    = queue.Queue(maxsize=depth)
+        self.tracker  = tracker
+        self.error    = None
+        self.rows     = 0
+        self._connect = connect
+        self._write   = write
+        self._on_flushed = on_flushed   # (batch, rows, secs since submit) → None
+        self._lock    = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"writer-{i}", daemon=True)
+            for i in range(n_writers)
+        ]
+
+    def start(self):
+        for t in self._threads:
+            t.start()
+
+    def submit(self, batch: Batch, on_wait=None, wait_secs: float = 0.5):
+        """Queue a batch, blocking while the queue is full (backpressure).
+
+        on_wait is called every wait_secs while blocked so the poll thread can
+        keep committing offsets for batches that finish in the meantime.
+        """
+        self.tracker.register(batch)
+        batch.submitted_at = time.time()
+        while True:
+            self.check()
+            try:
+                self.queue.put(batch, timeout=wait_secs)
+                return
+            except queue.Full:
+                if on_wait is not None:
+                    on_wait()
+
+    def check(self):
+        """Re-raise a writer failure on the poll thread."""
+        if self.error is not None:
+            raise RuntimeError(f"Writer thread failed: {self.error}") from self.error
+
+    def drain(self, poll_secs: float = 0.1):
+        """Block until every submitted batch has been written."""
+        while self.tracker.in_flight():
+            self.check()
+            time.sleep(poll_secs)
+
+    def stop(self):
+        """Let writers finish the queued batches, then join them."""
+        for t in self._threads:
+            while t.is_alive():
+                try:
+                    self.queue.put(_STOP, timeout=0.5)
+                    break
+                except queue.Full:
+                    pass
+        for t in self._threads:
+            t.join()
+
+    def _run(self):
+        conn = None
+        try:
+            conn = self._connect()
+            while True:
+                batch = self.queue.get()
+                if batch is _STOP:
+                    return
+                start = time.time()
+                n = self._write(conn, batch)
+                self.tracker.mark_done(batch.seq)
+                if not batch.rows:
+                    continue   # offsets-only marker
+                if self._on_flushed is not None:
+                    self._on_flushed(batch, n, time.time() - batch.submitted_at)
+                with self._lock:
+                    self.rows += n
+                    total = self.rows
+                print(f"[consumer] ✅ {threading.current_thread().name} flushed {n} {batch.table} rows "
+                      f"in {time.time() - start:.2f}s (total: {total:,})")
+        except Exception as e:
+            self.error = e
+            print(f"[consumer] ❌ {threading.current_thread().name} failed: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
@@ -6,25 +6,80 @@ Event types (weighted):
   LOG  (25%) — app activity log
   USER  (5%) — new customer registration
 
+Topic modes (--topic-mode):
+  single   — every event on bank_transactions (default)
+  per-type — bank_transactions.txn / .log / .user, so each event type can be
+             consumed and scaled independently
+Messages are keyed by account_id (TXN) or customer_id (LOG, USER), keeping one
+entity's events in order on a single partition.
+
+Events are generated in batches by EventBatchGenerator: choices, amounts and
+IDs are drawn with NumPy for thousands of events per call, and names, emails
+and companies come from pre-generated Faker pools. Weights and field
+distributions match make_*_event(), which stay as the reference
+implementation (see scripts/bench_producer.py).
+
+Pacing: a drift-correcting token bucket (streaming/load_profile.py) sends in
+batches at --rate, or follows a load profile file (--profile: constant, step,
+burst, diurnal) and logs achieved vs target rate every --report-secs.
+
+Sharding (--workers N): N processes, each with its own KafkaProducer, its own
+seed derived from --seed, and 1/N of the profile's rate. Workers start their
+schedules together and run for the same duration; the parent reports the
+aggregate rate and merges per-worker send / delivery-error counts at the end.
+
+Delivery: every send registers an ack callback and an errback
+(streaming/delivery.py). Each report line adds the ack rate, send → ack
+latency p50 / p95 / p99, messages and bytes in flight and failures in the
+interval. --acks, --batch-size, --linger-ms and --max-in-flight are passed
+to KafkaProducer, so the throughput / durability trade-off can be measured.
+
+Wire format (--format json | msgpack) and Kafka compression (--compression
+gzip | snappy | lz4 | zstd | none) are described in streaming/wire.py.
+
+Record / replay: --record DIR also writes every sent message to a segmented
+event log that streaming/eventlog.py can replay at 1x, Nx or max speed.
+
+Seeded IDs (--ids seeded): TXN account_ids and LOG customer_ids are drawn from
+the rows in DIM_ACCOUNTS / DIM_CUSTOMERS, with Zipf skew (--id-skew) so a few
+customers are hot, instead of made up at random. The IDs are cached locally
+(--id-cache) and refreshed every --id-refresh-secs; see streaming/id_index.py.
+USER events always get new customer IDs — they are registrations.
+
 Includes retry loop so it waits for Kafka to be ready (Docker startup race).
 """
 
-import json
 import time
 import random
 import argparse
 import uuid
+import os
+import sys
+import signal
+import threading
+import multiprocessing as mp
+from collections import Counter
 from datetime import datetime
 
+import numpy as np
 from kafka import KafkaProducer
 from kafka.errors import NoBrokersAvailable
 from faker import Faker
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from streaming import load_profile
+from streaming import wire
+from streaming import eventlog
+from streaming import id_index
+from streaming import delivery as delivery_stats
+
 fake = Faker()
 Faker.seed(0)
 random.seed(0)
 
 TOPIC = "bank_transactions"
+TOPIC_MODES = ("single", "per-type")
+KEY_FIELDS  = {"TXN": "account_id", "LOG": "customer_id", "USER": "customer_id"}
 
 TX_TYPES  = ["DEBIT_CARD_POS","ACH_CREDIT","ACH_DEBIT","WIRE_OUT","ATM_WITHDRAWAL","CHECK_DEPOSIT","FEE_OD"]
 CHANNELS  = ["MOBILE_APP","WEB_BANKING","BRANCH","ATM","PHONE"]
@@ -84,15 +139,182 @@ def make_user_event() -> dict:
     }
 
 
-def connect_with_retry(broker: str, max_attempts: int = 30) -> KafkaProducer:
+# ── Batch generation ──────────────────────────────────────────────────────────
+EVENT_WEIGHTS = {"TXN": 0.70, "LOG": 0.25, "USER": 0.05}
+POOL_SIZE     = 5_000    # pre-generated Faker values per pool
+MAX_CHUNK     = 5_000    # most events generated / sent per scheduler batch
+EMAIL_SUFFIXES = 10_000  # per-event number appended to a pooled name's email (first.last<n>@domain)
+NAME_AFFIXES  = {"PhD"}  # Faker name prefixes / suffixes dropped from emails (with Dr., MD, II, …)
+START_TIMEOUT_SECS = 180 # longest a sharded worker waits for the others (Kafka retries take ≤150s)
+DEBIT_TYPES   = np.array(["DEBIT" in t for t in TX_TYPES])
+AMOUNT_RANGES = np.array([(1000, 20000) if "WIRE" in t else (5, 35) if "FEE" in t else (5, 500)
+                          for t in TX_TYPES], dtype=float)
+
+
+def _email_local(name: str) -> str:
+    """first.last from a Faker name, without prefixes and suffixes (Dr., MD, III, …)."""
+    words = [w for w in name.split() if "." not in w and not w.isupper() and w not in NAME_AFFIXES] or [name]
+    return ".".join("".join(c for c in w.lower() if c.isalnum()) for w in (words[0], words[-1]))
+
+
+class EventBatchGenerator:
+    """Generates events a batch at a time, with the same distributions as make_*_event().
+
+    USER emails are the pooled name's first.last plus a per-event number and a
+    pooled domain, so they repeat about as rarely as Faker's email() does
+    even though names come from a POOL_SIZE pool.
+
+    ids (an id_index.IdSampler) supplies TXN account_ids and LOG customer_ids;
+    without it they are random. It may be swapped while generating.
+    """
+
+    def __init__(self, seed: int = 0, pool_size: int = POOL_SIZE, ids: id_index.IdSampler = None):
+        self.rng = np.random.default_rng(seed)
+        self.ids = ids
+        faker = Faker()
+        faker.seed_instance(seed)
+        self.companies = [faker.company()[:100] for _ in range(pool_size)]
+        self.names     = [faker.name() for _ in range(pool_size)]
+        self.locals    = [_email_local(n) for n in self.names]
+        self.domains   = sorted({faker.free_email_domain() for _ in range(100)})
+
+    def _pick(self, values: list, n: int) -> list:
+        idx = self.rng.integers(0, len(values), n)
+        return [values[i] for i in idx.tolist()]
+
+    def _ids(self, prefix: str, low: int, high: int, n: int) -> list:
+        return [f"{prefix}{v}" for v in self.rng.integers(low, high, n, endpoint=True).tolist()]
+
+    def _account_ids(self, n: int) -> list:
+        ids = self.ids
+        return ids.account_ids(n, self.rng) if ids is not None else self._ids("A", 10_000_000, 99_999_999, n)
+
+    def _customer_ids(self, n: int) -> list:
+        ids = self.ids
+        return ids.customer_ids(n, self.rng) if ids is not None else self._ids("C", 10_000_000, 99_999_999, n)
+
+    def txn_events(self, n: int, now: datetime = None) -> list:
+        rng     = self.rng
+        posted  = (now or datetime.utcnow()).isoformat()
+        tx_idx  = rng.integers(0, len(TX_TYPES), n)
+        lo, hi  = AMOUNT_RANGES[tx_idx].T
+        amounts = np.round(rng.uniform(lo, hi), 2).tolist()
+        debit   = DEBIT_TYPES[tx_idx].tolist()
+        mccs    = rng.integers(1000, 9999, n, endpoint=True).tolist()
+        return [
+            {
+                "event_type": "TXN",
+                "payload": {
+                    "transaction_ref":        ref,
+                    "account_id":             acct,
+                    "posting_date":           posted,
+                    "transaction_code":       TX_TYPES[tx],
+                    "amount":                 amt,
+                    "merchant_description":   company if is_debit else None,
+                    "merchant_category_code": f"MCC{mcc}" if is_debit else None,
+                    "channel_id":             channel,
+                }
+            }
+            for ref, acct, tx, amt, is_debit, company, mcc, channel in zip(
+                self._ids("TX", 100_000_000, 999_999_999, n),
+                self._account_ids(n),
+                tx_idx.tolist(), amounts, debit,
+                self._pick(self.companies, n), mccs,
+                self._pick(CHANNELS, n),
+            )
+        ]
+
+    def log_events(self, n: int, now: datetime = None) -> list:
+        ts = (now or datetime.utcnow()).isoformat()
+        return [
+            {
+                "event_type": "LOG",
+                "payload": {
+                    "log_id":          log_id,
+                    "customer_id":     cust,
+                    "event_type":      evt,
+                    "event_timestamp": ts,
+                    "device_os":       os_,
+                    "page_url":        "/home",
+                    "error_code":      "ERR_500" if evt == "ERROR" else None,
+                }
+            }
+            for log_id, cust, evt, os_ in zip(
+                self._ids("LG", 10_000_000, 99_999_999, n),
+                self._customer_ids(n),
+                self._pick(EVENTS, n),
+                self._pick(OSES, n),
+            )
+        ]
+
+    def user_events(self, n: int, now: datetime = None) -> list:
+        joined = (now or datetime.utcnow()).date().isoformat()
+        scores = np.round(self.rng.uniform(0, 1, n), 2).tolist()
+        people = self.rng.integers(0, len(self.names), n).tolist()
+        emails = [f"{self.locals[p]}{s}@{d}" for p, s, d in zip(
+            people, self.rng.integers(0, EMAIL_SUFFIXES, n).tolist(), self._pick(self.domains, n))]
+        return [
+            {
+                "event_type": "USER",
+                "payload": {
+                    "customer_id":        cust,
+                    "full_name":          name,
+                    "email":              email,
+                    "segment":            segment,
+                    "join_date":          joined,
+                    "risk_profile_score": score,
+                }
+            }
+            for cust, name, email, segment, score in zip(
+                self._ids("C", 10_000_000, 99_999_999, n),
+                [self.names[p] for p in people],
+                emails,
+                self._pick(SEGMENTS, n),
+                scores,
+            )
+        ]
+
+    def generate(self, n: int, now: datetime = None) -> list:
+        """n events in random order, TXN / LOG / USER drawn with EVENT_WEIGHTS.
+
+        Timestamps are taken once per call (now, default utcnow), so callers
+        pacing a stream should generate about one second of events at a time.
+        """
+        now    = now or datetime.utcnow()
+        counts = self.rng.multinomial(n, list(EVENT_WEIGHTS.values()))
+        events = (self.txn_events(int(counts[0]), now)
+                  + self.log_events(int(counts[1]), now)
+                  + self.user_events(int(counts[2]), now))
+        order  = self.rng.permutation(n).tolist()
+        return [events[i] for i in order]
+
+
+def topic_for(event_type: str, mode: str = "single") -> str:
+    return TOPIC if mode == "single" else f"{TOPIC}.{event_type.lower()}"
+
+
+def event_key(event: dict) -> str:
+    return event["payload"].get(KEY_FIELDS[event["event_type"]])
+
+
+def _key_bytes(key):
+    return key.encode("utf-8") if isinstance(key, str) else key
+
+
+def connect_with_retry(broker: str, encoder: wire.Encoder = None, compression: str = "gzip",
+                       max_attempts: int = 30, **config) -> KafkaProducer:
+    """encoder=None sends values as already-encoded bytes. Extra keyword
+    arguments (acks, batch_size, linger_ms, …) go to KafkaProducer as-is."""
+    config.setdefault("acks", "all")
     for attempt in range(1, max_attempts + 1):
         try:
             print(f"[producer] Connecting to Kafka at {broker} (attempt {attempt}/{max_attempts})...")
             producer = KafkaProducer(
                 bootstrap_servers=[broker],
-                value_serializer=lambda v: json.dumps(v).encode("utf-8"),
-                compression_type="gzip",
-                acks="all",
+                value_serializer=encoder.encode if encoder is not None else None,
+                key_serializer=_key_bytes,
+                compression_type=None if compression == "none" else compression,
+                **config,
             )
             print("[producer] ✅ Connected to Kafka")
             return producer
@@ -102,44 +324,287 @@ def connect_with_retry(broker: str, max_attempts: int = 30) -> KafkaProducer:
     raise RuntimeError(f"Could not connect to Kafka at {broker} after {max_attempts} attempts")
 
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--kafka",    default="localhost:9092")
-    parser.add_argument("--duration", type=int, default=3600, help="Run duration in seconds")
-    parser.add_argument("--rate",     type=int, default=200,  help="Events per minute")
-    args = parser.parse_args()
+def producer_config(args) -> dict:
+    """KafkaProducer batching / durability settings from the command line."""
+    return {
+        "acks":       int(args.acks) if args.acks in ("0", "1") else args.acks,
+        "batch_size": args.batch_size,
+        "linger_ms":  args.linger_ms,
+        "max_in_flight_requests_per_connection": args.max_in_flight,
+    }
 
-    producer = connect_with_retry(args.kafka)
-    interval = 60.0 / args.rate  # seconds between events
-    end_time = time.time() + args.duration
-    sent = 0
 
-    print(f"[producer] Streaming {args.rate} events/min for {args.duration}s → topic '{TOPIC}'")
+def id_sampler(args, index: id_index.IdIndex) -> id_index.IdSampler:
+    # hot customers are ranked with --seed itself, so every shard agrees on them
+    return id_index.IdSampler(index, args.id_skew, args.seed)
 
-    try:
-        while time.time() < end_time:
-            roll = random.random()
-            if roll < 0.70:
-                event = make_txn_event()
-            elif roll < 0.95:
-                event = make_log_event()
-            else:
-                event = make_user_event()
 
-            producer.send(TOPIC, value=event)
-            sent += 1
+def worker_seed(seed: int, index: int, workers: int) -> int:
+    """Independent, reproducible seed for one shard of a --workers run."""
+    return int(np.random.SeedSequence(seed).spawn(workers)[index].generate_state(1)[0])
+
 
-            if sent % 500 == 0:
-                print(f"[producer] Sent {sent:,} events")
+def run_stream(args, profile: load_profile.Profile, duration: float, seed: int,
+               stop_event=None, sent_counter=None, start_barrier=None, name: str = "producer",
+               record_dir: str = None, ids: id_index.IdIndex = None, ids_reload=None,
+               delivery_state=None) -> dict:
+    """Generate and send events following profile until duration or stop_event.
 
-            time.sleep(interval)
+    With record_dir, every message is also appended to an event log there.
+    With ids, TXN / LOG IDs are drawn from that index, replaced by whatever
+    ids_reload() returns every --id-refresh-secs. Sharded workers publish
+    sent_counter and delivery_state (DeliveryStats.state()) for the parent.
+    Returns {"sent", "acked", "errors", "latency", "peak_in_flight_bytes"}
+    once every send has been flushed.
+    """
+    encoder  = wire.Encoder(args.format)
+    producer = connect_with_retry(args.kafka, None, args.compression,   # values encoded here
+                                  **producer_config(args))
+    recorder = eventlog.EventLogWriter(record_dir) if record_dir else None
+    gen      = EventBatchGenerator(seed, ids=id_sampler(args, ids) if ids is not None else None)
+    delivery = delivery_stats.DeliveryStats()
+    sent = 0
 
+    stop_refresh = threading.Event()
+    if ids is not None and ids_reload is not None:
+        def swap(index):
+            gen.ids = id_sampler(args, index)
+        id_index.refresh_in_background(ids_reload, args.id_refresh_secs, swap, stop_refresh,
+                                       name, ids.loaded_at)
+
+    try:
+        if start_barrier is not None:   # sharded: every worker starts its schedule together
+            start_barrier.wait(START_TIMEOUT_SECS)
+        scheduler   = load_profile.RateScheduler(profile, MAX_CHUNK)
+        next_report = args.report_secs
+        last_state, last_at = delivery.state(), 0.0
+        while stop_event is None or not stop_event.is_set():
+            n = scheduler.acquire(deadline=duration)
+            if n == 0:
+                break
+            for event in gen.generate(n):
+                topic = topic_for(event["event_type"], args.topic_mode)
+                key   = event_key(event)
+                value = encoder.encode(event)
+                delivery.track(producer.send(topic, key=key, value=value, headers=encoder.headers),
+                               len(value) + len(_key_bytes(key) or b""))
+                if recorder is not None:
+                    recorder.append(topic, key, value, encoder.headers)
+            sent += n
+            if sent_counter is not None:
+                sent_counter.value = sent
+                delivery_state[:] = delivery.state()
+
+            if sent_counter is None and scheduler.elapsed() >= next_report:
+                r     = scheduler.report()
+                state = delivery.state()
+                secs  = r["elapsed_secs"] - last_at
+                print(f"[{name}] t={r['elapsed_secs']}s  target {r['target_eps']:,.1f}/s  "
+                      f"achieved {r['achieved_eps']:,.1f}/s  (overall {r['overall_achieved_eps']:,.1f}"
+                      f" of {r['overall_target_eps']:,.1f}/s, sent {sent:,})")
+                print(f"[{name}]   {delivery_stats.format_summary(delivery_stats.summarize(state, last_state, secs))}")
+                next_report += args.report_secs
+                last_state, last_at = state, r["elapsed_secs"]
+
+    except threading.BrokenBarrierError:   # the parent aborted the start, or another worker never arrived
+        print(f"[{name}] Start aborted — another worker failed, stop was requested or the start timed out")
     except KeyboardInterrupt:
-        print("[producer] Stopped by user")
+        print(f"[{name}] Stopped by user")
     finally:
+        stop_refresh.set()
         producer.flush()
         producer.close()
-        print(f"[producer] Total sent: {sent:,}")
+        if delivery_state is not None:
+            delivery_state[:] = delivery.state()
+        if recorder is not None:
+            recorder.close()
+            print(f"[{name}] Recorded {recorder.records:,} events → {record_dir}")
+    return dict(delivery.totals(), sent=sent)
+
+
+def _worker(index: int, args, stop_event, start_barrier, sent_counter, delivery_state, results):
+    # The parent owns Ctrl-C / SIGTERM and stops workers through stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    profile, duration = build_profile(args)
+    profile = load_profile.Scaled(profile, 1.0 / args.workers)
+    name  = f"producer-{index}"
+    ids = ids_reload = None
+    if args.ids == "seeded":   # the parent loaded the cache and keeps it fresh
+        ids, ids_reload = id_index.IdIndex.read(args.id_cache), id_index.CacheWatcher(args.id_cache)
+    stats = run_stream(args, profile, duration, worker_seed(args.seed, index, args.workers),
+                       stop_event, sent_counter, start_barrier, name=name,
+                       record_dir=os.path.join(args.record, name) if args.record else None,
+                       ids=ids, ids_reload=ids_reload, delivery_state=delivery_state)
+    results.put((index, stats))
+
+
+def run_sharded(args, ids: id_index.IdIndex = None):
+    profile, duration = build_profile(args)
+    ctx     = mp.get_context("spawn")
+    stop    = ctx.Event()
+    barrier = ctx.Barrier(args.workers)
+    results = ctx.Queue()
+    counters = [ctx.Value("q", 0, lock=False) for _ in range(args.workers)]
+    states   = [ctx.Array("q", delivery_stats.STATE_SIZE, lock=False) for _ in range(args.workers)]
+
+    def request_stop(signum, frame):
+        if not stop.is_set():
+            print(f"[producer] Received signal {signum} — stopping workers...")
+            stop.set()
+
+    signal.signal(signal.SIGINT,  request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    procs = [ctx.Process(target=_worker, args=(i, args, stop, barrier, counters[i], states[i], results),
+                         name=f"producer-{i}") for i in range(args.workers)]
+    for p in procs:
+        p.start()
+    if ids is not None:   # workers pick the refreshed cache file up themselves
+        id_index.refresh_in_background(lambda: id_index.load(args.id_cache, 0), args.id_refresh_secs,
+                                       lambda index: None, stop, "producer", ids.loaded_at)
+
+    started, last_report, last_sent = None, None, 0
+    last_state = delivery_stats.merge_states([])
+    stats = {}
+    while len(stats) < args.workers:
+        while not results.empty():
+            index, worker_stats = results.get()
+            stats[index] = worker_stats
+        if not any(p.is_alive() for p in procs) and results.empty():
+            break
+        stop.wait(1)
+        # Before the start, release the workers waiting at the barrier if stop
+        # is set or a worker exited (it would never arrive)
+        if started is None and not barrier.broken and (
+                stop.is_set() or any(p.exitcode is not None for p in procs)):
+            barrier.abort()
+
+        sent = sum(c.value for c in counters)
+        now  = time.time()
+        state = delivery_stats.merge_states([list(a) for a in states])
+        if started is None:
+            if sent:   # clock starts once the barrier has released
+                started, last_report, last_sent, last_state = now, now, sent, state
+            continue
+        if now - last_report >= args.report_secs and any(p.is_alive() for p in procs):
+            summary = delivery_stats.summarize(state, last_state, now - last_report)
+            print(f"[producer] t={now - started:,.0f}s  target {profile.rate(now - started):,.1f}/s  "
+                  f"achieved {(sent - last_sent) / (now - last_report):,.1f}/s  "
+                  f"(sent {sent:,} across {args.workers} workers)")
+            print(f"[producer]   {delivery_stats.format_summary(summary)}")
+            last_report, last_sent, last_state = now, sent, state
+
+    for p in procs:
+        p.join()
+    while len(stats) < args.workers:
+        try:
+            index, worker_stats = results.get(timeout=1)
+        except Exception:   # queue.Empty — a worker died without reporting
+            break
+        stats[index] = worker_stats
+
+    print(f"[producer] {'worker':<12}{'sent':>12}{'acked':>12}{'p99 ack':>12}  delivery errors")
+    total_errors = Counter()
+    for i in range(args.workers):
+        s = stats.get(i)
+        if s is None:
+            print(f"[producer] producer-{i:<3} exited with code {procs[i].exitcode} — no stats")
+            continue
+        total_errors.update(s["errors"])
+        p99 = delivery_stats.format_ms(delivery_stats.percentile(s["latency"], 99))
+        print(f"[producer] producer-{i:<3}{s['sent']:>12,}{s['acked']:>12,}{p99:>12}  {s['errors'] or '-'}")
+    sent  = sum(s["sent"] for s in stats.values())
+    acked = sum(s["acked"] for s in stats.values())
+    latency = delivery_stats.merge_states([s["latency"] for s in stats.values()])
+    p99   = delivery_stats.format_ms(delivery_stats.percentile(latency, 99))
+    elapsed = time.time() - started if started else 0.0
+    print(f"[producer] {'total':<12}{sent:>12,}{acked:>12,}{p99:>12}  {dict(total_errors) or '-'}")
+    print(f"[producer] Total sent: {sent:,} in {elapsed:,.0f}s ({sent / max(elapsed, 1e-9):,.0f} events/s), "
+          f"ack latency {format_latency(latency)}")
+
+
+def format_latency(counts) -> str:
+    return " ".join(f"p{q} ≤{delivery_stats.format_ms(delivery_stats.percentile(counts, q))}"
+                    for q in delivery_stats.PERCENTILES)
+
+
+def build_profile(args):
+    """(profile, duration) from --profile or --rate."""
+    if args.profile:
+        profile = load_profile.load(args.profile)
+    else:
+        profile = load_profile.Constant(args.rate / 60.0)
+    return profile, profile.duration or args.duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kafka",    default="localhost:9092")
+    parser.add_argument("--duration", type=int, default=3600, help="Run duration in seconds")
+    parser.add_argument("--rate",     type=int, default=200,  help="Events per minute (constant profile)")
+    parser.add_argument("--profile",  default=None,
+                        help="Load profile TOML file (overrides --rate), e.g. streaming/profiles/step.toml")
+    parser.add_argument("--report-secs", type=float, default=10, help="Achieved vs target rate log interval")
+    parser.add_argument("--topic-mode", choices=TOPIC_MODES, default="single",
+                        help="single: one multiplexed topic; per-type: one topic per event type")
+    parser.add_argument("--seed",     type=int, default=0, help="Event generator seed")
+    parser.add_argument("--workers",  type=int, default=1,
+                        help="Producer processes, each sending 1/N of the rate with its own seed")
+    parser.add_argument("--format",   choices=wire.FORMATS, default="json",
+                        help="Message encoding (see streaming/wire.py)")
+    parser.add_argument("--compression", choices=list(wire.CODECS), default="gzip",
+                        help="Kafka batch compression codec")
+    parser.add_argument("--record",   default=None,
+                        help="Also write every sent message to this event log directory (see streaming/eventlog.py)")
+    parser.add_argument("--acks",     choices=("0", "1", "all"), default="all",
+                        help="Broker acknowledgements per send (0 = none, 1 = leader, all = in-sync replicas)")
+    parser.add_argument("--batch-size", type=int, default=16384,
+                        help="KafkaProducer batch.size: max bytes per partition batch")
+    parser.add_argument("--linger-ms", type=int, default=0,
+                        help="KafkaProducer linger.ms: wait this long for a batch to fill")
+    parser.add_argument("--max-in-flight", type=int, default=5,
+                        help="Unacknowledged requests per broker connection")
+    parser.add_argument("--ids",      choices=("random", "seeded"), default="random",
+                        help="TXN / LOG IDs: random, or drawn from DIM_ACCOUNTS / DIM_CUSTOMERS")
+    parser.add_argument("--id-skew",  type=float, default=1.0,
+                        help="Zipf exponent for seeded IDs (0 = uniform, higher = fewer hot customers)")
+    parser.add_argument("--id-cache", default=id_index.CACHE_PATH, help="Local cache file for seeded IDs")
+    parser.add_argument("--id-refresh-secs", type=float, default=id_index.REFRESH_SECS,
+                        help="Reload seeded IDs from Snowflake this often (and treat an older cache as stale)")
+    args = parser.parse_args()
+    wire.check_codec(args.compression)
+    wire.Encoder(args.format)   # fail fast if the format is unavailable
+    if not 0 <= args.seed < 2 ** 32:
+        parser.error("--seed must be between 0 and 2**32 - 1")
+    if args.id_skew < 0 or args.id_refresh_secs <= 0:
+        parser.error("--id-skew must be >= 0 and --id-refresh-secs > 0")
+    if args.batch_size <= 0 or args.linger_ms < 0 or args.max_in_flight < 1:
+        parser.error("--batch-size must be > 0, --linger-ms >= 0 and --max-in-flight >= 1")
+    if args.record and not eventlog.is_empty(args.record):
+        parser.error(f"--record {args.record} is not empty")
+
+    ids = None
+    if args.ids == "seeded":
+        ids = id_index.load(args.id_cache, args.id_refresh_secs)
+        print(f"[producer] Seeded IDs: {ids.describe()}, skew {args.id_skew:g} — hottest 1% of "
+              f"customers get {id_sampler(args, ids).hot_share():.0%} of TXN / LOG events")
+
+    profile, duration = build_profile(args)
+    topics = sorted({topic_for(t, args.topic_mode) for t in KEY_FIELDS})
+    print(f"[producer] Streaming {profile.describe()} events/s for {duration}s → {', '.join(topics)} "
+          f"({args.format}, {args.compression}, acks={args.acks}, batch {args.batch_size:,} B, "
+          f"linger {args.linger_ms} ms, {args.max_in_flight} in flight)"
+          + (f" with {args.workers} workers" if args.workers > 1 else ""))
+
+    if args.workers > 1:
+        run_sharded(args, ids)
+        return
+    stats = run_stream(args, profile, duration, args.seed, record_dir=args.record,
+                       ids=ids, ids_reload=lambda: id_index.load(args.id_cache, 0))
+    print(f"[producer] Total sent: {stats['sent']:,} (acked {stats['acked']:,}, "
+          f"delivery errors {stats['errors'] or 0}), ack latency {format_latency(stats['latency'])}, "
+          f"peak in flight {stats['peak_in_flight_bytes'] / 1024:,.0f} KiB")
 
 
 if __name__ == "__main__":
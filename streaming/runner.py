@@ -0,0 +1,143 @@
+"""
+streaming/runner.py — Runs N consumer processes in the same Kafka consumer group.
+
+Each worker process is a full streaming/consumer.py pipeline with its own
+Kafka consumer, Snowflake connection(s) and buffers, so JSON parsing and row
+building scale with cores and topic partitions (workers beyond the partition
+count sit idle as group standbys).
+
+Shutdown: SIGINT / SIGTERM set a shared stop event; every worker leaves its
+poll loop, writes its buffered rows, commits offsets and exits. Workers that
+crash are restarted after an exponential backoff (RESTART_BASE_SECS, doubling
+per recent crash, capped at RESTART_MAX_SECS). A worker that crashes
+MAX_RESTARTS times within RESTART_WINDOW_SECS (bad config, Snowflake auth)
+stops the runner, which exits non-zero. Aggregate rows/s is reported every
+--report-secs.
+
+Usage:
+  python streaming/runner.py --workers 4
+"""
+
+import sys
+import os
+import time
+import signal
+import argparse
+import multiprocessing as mp
+from collections import deque
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SHUTDOWN_GRACE_SECS = 60
+RESTART_BASE_SECS   = 1.0
+RESTART_MAX_SECS    = 60.0
+MAX_RESTARTS        = 5     # crashes of one worker within RESTART_WINDOW_SECS before giving up
+RESTART_WINDOW_SECS = 300
+
+
+def _worker(index, stop_event, rows_counter):
+    # Ctrl-C reaches the whole process group; let the runner's stop event
+    # drive shutdown so workers never abort in the middle of a flush.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    # One metrics endpoint per worker: base port + worker index
+    base_port = int(os.getenv("CONSUMER_METRICS_PORT", "9108"))
+    if base_port:
+        os.environ["CONSUMER_METRICS_PORT"] = str(base_port + index)
+    from streaming.consumer import run
+    run(stop_event=stop_event, rows_counter=rows_counter)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers",     type=int, default=int(os.getenv("CONSUMER_PROCESSES", os.cpu_count() or 1)))
+    parser.add_argument("--report-secs", type=int, default=30, help="Aggregate throughput report interval")
+    args = parser.parse_args()
+
+    ctx  = mp.get_context("spawn")
+    stop = ctx.Event()
+
+    def request_stop(signum, frame):
+        if not stop.is_set():
+            print(f"[runner] Received signal {signum} — stopping workers...")
+            stop.set()
+
+    signal.signal(signal.SIGINT,  request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    counters   = [ctx.Value("q", 0, lock=False) for _ in range(args.workers)]
+    finished   = [0] * args.workers   # rows from previous incarnations of a restarted worker
+    procs      = [None] * args.workers
+    crashes    = [deque() for _ in range(args.workers)]   # recent crash times per worker
+    restart_at = [None] * args.workers                    # when a crashed worker is restarted
+    failed     = False
+
+    def start(i: int):
+        p = ctx.Process(target=_worker, args=(i, stop, counters[i]), name=f"consumer-{i}")
+        p.start()
+        procs[i] = p
+
+    def total_rows() -> int:
+        return sum(finished) + sum(c.value for c in counters)
+
+    print(f"[runner] Starting {args.workers} consumer processes")
+    for i in range(args.workers):
+        start(i)
+
+    started     = time.time()
+    last_report = started
+    last_rows   = 0
+
+    while not stop.is_set():
+        stop.wait(1)
+
+        now = time.time()
+        for i, p in enumerate(procs):
+            if stop.is_set():
+                break
+            if restart_at[i] is not None:
+                if now >= restart_at[i]:
+                    restart_at[i] = None
+                    start(i)
+                continue
+            if p.is_alive():
+                continue
+            finished[i] += counters[i].value
+            counters[i].value = 0
+            recent = crashes[i]
+            recent.append(now)
+            while recent[0] < now - RESTART_WINDOW_SECS:
+                recent.popleft()
+            if len(recent) > MAX_RESTARTS:
+                print(f"[runner] ❌ {p.name} exited with code {p.exitcode}, {len(recent)} times in "
+                      f"{RESTART_WINDOW_SECS}s — giving up, stopping all workers")
+                failed = True
+                stop.set()
+                break
+            delay = min(RESTART_MAX_SECS, RESTART_BASE_SECS * 2 ** (len(recent) - 1))
+            print(f"[runner] ⚠️  {p.name} exited with code {p.exitcode} — restarting in {delay:g}s")
+            restart_at[i] = now + delay
+
+        if now - last_report >= args.report_secs:
+            rows = total_rows()
+            print(f"[runner] {rows:,} rows total — {(rows - last_rows) / (now - last_report):,.0f} rows/s "
+                  f"(avg {rows / (now - started):,.0f} rows/s across {args.workers} workers)")
+            last_report, last_rows = now, rows
+
+    deadline = time.time() + SHUTDOWN_GRACE_SECS
+    for p in procs:
+        p.join(max(0.0, deadline - time.time()))
+        if p.is_alive():
+            print(f"[runner] ⚠️  {p.name} did not finish its final flush in time — killing")
+            p.kill()
+            p.join()
+
+    elapsed = time.time() - started
+    rows    = total_rows()
+    print(f"[runner] Closed. {rows:,} rows in {elapsed:,.0f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
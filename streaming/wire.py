@@ -0,0 +1,178 @@
+"""
+streaming/wire.py — Message serialization shared by producer.py and consumer.py.
+
+Formats (producer --format):
+  json    — {"event_type": ..., "payload": {...}} as UTF-8 JSON (default; what
+            every message without headers is assumed to be)
+  msgpack — schema-based binary: [event_type, [field values in schema order]].
+            Field names live in SCHEMAS, not in the message, so they are not
+            repeated per event; the consumer decodes straight to row tuples.
+
+Every message carries a content-type header and, for msgpack, a
+schema-version header. The consumer routes each message by its headers, so a
+topic may mix formats (e.g. during a rolling producer upgrade). A new schema
+version must only ever append fields: a consumer that does not know the
+version yet decodes it with its newest schema and ignores the extra fields.
+
+Compression (producer --compression) is applied by Kafka per record batch:
+gzip, snappy, lz4, zstd or none. All but gzip need an optional package
+(python-snappy, lz4, zstandard) on both producer and consumer.
+"""
+
+import json
+
+from kafka import codec
+
+try:
+    import msgspec
+except ImportError:   # msgpack format unavailable; json still works
+    msgspec = None
+
+if msgspec is not None:
+    # decoding into tuples (rather than lists) is faster and is already a row
+    _decode_batch = msgspec.msgpack.Decoder(list[tuple[str, tuple]]).decode
+    _decode_one   = msgspec.msgpack.Decoder(tuple[str, tuple]).decode
+
+FORMATS        = ("json", "msgpack")
+SCHEMA_VERSION = 1
+CONTENT_TYPE   = "content-type"
+SCHEMA_HEADER  = "schema-version"
+
+# payload field order per schema version; positions must never change
+SCHEMAS = {
+    1: {
+        "TXN":  ("transaction_ref", "account_id", "posting_date", "transaction_code", "amount",
+                 "merchant_description", "merchant_category_code", "channel_id"),
+        "LOG":  ("log_id", "customer_id", "event_type", "event_timestamp", "device_os",
+                 "page_url", "error_code"),
+        "USER": ("customer_id", "full_name", "email", "segment", "join_date", "risk_profile_score"),
+    },
+}
+
+CODECS = {
+    "none":   lambda: True,
+    "gzip":   codec.has_gzip,
+    "snappy": codec.has_snappy,
+    "lz4":    codec.has_lz4,
+    "zstd":   codec.has_zstd,
+}
+CODEC_PACKAGES = {"snappy": "python-snappy", "lz4": "lz4", "zstd": "zstandard"}
+
+
+def check_codec(name: str):
+    if name not in CODECS:
+        raise ValueError(f"Unknown compression '{name}' — expected one of {list(CODECS)}")
+    if not CODECS[name]():
+        raise ValueError(f"Compression '{name}' needs the {CODEC_PACKAGES[name]} package")
+
+
+# ── Encoding (producer) ───────────────────────────────────────────────────────
+class Encoder:
+    """value_serializer plus the headers to send with every message."""
+
+    def __init__(self, fmt: str = "json", version: int = SCHEMA_VERSION):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}' — expected one of {FORMATS}")
+        if fmt == "msgpack" and msgspec is None:
+            raise ValueError("--format msgpack requires msgspec (pip install msgspec)")
+        self.format  = fmt
+        self.version = version
+        self.headers = [(CONTENT_TYPE, fmt.encode())]
+        if fmt == "msgpack":
+            self.headers.append((SCHEMA_HEADER, str(version).encode()))
+            self._fields = SCHEMAS[version]
+            self._pack   = msgspec.msgpack.Encoder().encode
+
+    def encode(self, event: dict) -> bytes:
+        if self.format == "json":
+            return json.dumps(event).encode("utf-8")
+        e_type  = event["event_type"]
+        payload = event["payload"]
+        return self._pack([e_type, [payload.get(f) for f in self._fields[e_type]]])
+
+
+# ── Decoding (consumer) ───────────────────────────────────────────────────────
+def message_format(headers) -> tuple:
+    """(format, schema version) from Kafka record headers; no headers → json."""
+    fmt, version = "json", SCHEMA_VERSION
+    for key, value in headers or ():
+        try:
+            if key == CONTENT_TYPE:
+                fmt = value.decode()
+            elif key == SCHEMA_HEADER:
+                version = int(value)
+        except (ValueError, AttributeError):
+            return "invalid", 0
+    return fmt, version
+
+
+def group_by_format(messages) -> dict:
+    """{(format, version): [raw values]} for one partition's poll() result."""
+    groups = {}
+    for m in messages:
+        key = message_format(m.headers) if m.headers else ("json", SCHEMA_VERSION)
+        groups.setdefault(key, []).append(m.value)
+    return groups
+
+
+def _array_header(n: int) -> bytes:
+    # msgpack array32: lets a whole poll of encoded events decode in one call
+    return b"\xdd" + n.to_bytes(4, "big")
+
+
+def _append(event, schema: dict, txn_buf, log_buf, user_buf):
+    e_type, values = event
+    n = len(schema[e_type])
+    if len(values) < n:
+        raise ValueError(f"{e_type} has {len(values)} fields, schema expects {n}")
+    if len(values) > n:
+        values = values[:n]   # fields appended by a newer schema version
+    if e_type == "TXN":
+        ref, acct, posted, code, amount, desc, mcc, channel = values
+        txn_buf.append((ref, acct, posted, (code or "")[:50], amount,
+                        (desc or "")[:255], (mcc or "")[:10], (channel or "")[:20]))
+    elif e_type == "LOG":
+        log_buf.append(values)
+    else:
+        user_buf.append(values)
+
+
+def decode_msgpack(values: list, version: int, txn_buf, log_buf, user_buf, on_error):
+    """Decode msgpack-format values into the row buffers.
+
+    on_error(raw, exc) is called for every message that cannot be decoded.
+    """
+    schema = SCHEMAS.get(version)
+    if schema is None and version > SCHEMA_VERSION:
+        schema = SCHEMAS[SCHEMA_VERSION]
+    if schema is None:
+        for raw in values:
+            on_error(raw, ValueError(f"unknown schema version {version}"))
+        return
+    if msgspec is None:
+        for raw in values:
+            on_error(raw, ValueError("msgpack message but msgspec is not installed"))
+        return
+
+    try:
+        events = _decode_batch(_array_header(len(values)) + b"".join(values))
+    except (msgspec.DecodeError, msgspec.ValidationError):
+        events = None
+    if events is not None and len(events) == len(values):
+        txn, log, user = [], [], []
+        try:
+            for event in events:
+                _append(event, schema, txn, log, user)
+        except (ValueError, TypeError, KeyError):
+            pass   # something does not fit the schema — redo message by message
+        else:
+            txn_buf.extend(txn)
+            log_buf.extend(log)
+            user_buf.extend(user)
+            return
+
+    for raw in values:
+        try:
+            _append(_decode_one(raw), schema, txn_buf, log_buf, user_buf)
+        except (msgspec.DecodeError, msgspec.ValidationError, ValueError, TypeError, KeyError) as e:
+            on_error(raw, e)